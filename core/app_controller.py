@@ -1,47 +1,62 @@
 import os
 import sys
 import time
-import threading
 from typing import List, Dict, Any, Callable, Optional
 
-from PyQt5.QtCore import QObject, pyqtSignal, QThread
+from PyQt5.QtCore import QObject, pyqtSignal
 
 from platform.platform_detector import PlatformDetector
 from core.file_cleanup import FileCleanup
 from core.process_manager import ProcessManager
 from core.battery_monitor import BatteryMonitor
+from core.task_scheduler import TaskScheduler, ScheduledTask
+from core.single_flight import SingleFlight
+from core.energy_attribution import EnergyAttribution
 
-class TaskWorker(QObject):
-    taskCompleted = pyqtSignal(object)
-    taskFailed = pyqtSignal(str)
+class MainThreadDispatcher(QObject):
+    invoke = pyqtSignal(object)
     
-    def __init__(self, func, **kwargs):
+    def __init__(self):
         super().__init__()
-        self.func = func
-        self.kwargs = kwargs
-    
-    def run(self):
-        try:
-            result = self.func(**self.kwargs)
-            self.taskCompleted.emit(result)
-        except Exception as e:
-            self.taskFailed.emit(str(e))
+        self.invoke.connect(self._run)
+    
+    def _run(self, func):
+        func()
 
 class AppController:
+    FRESHNESS = {
+        'battery_status': 2.0,
+        'battery_health': 60.0,
+        'battery_recommendations': 5.0,
+        'capacity_trend': 300.0,
+        'energy_consumers': 1.0,
+        'power_usage': 0.0,
+        'processes': 1.0,
+        'high_resource_processes': 1.0,
+        'top_io_processes': 1.0,
+        'process_tree': 1.0,
+        'process_groups': 1.0,
+        'startup_items': 30.0
+    }
     
     def __init__(self):
         self.platform_detector = PlatformDetector()
         self.file_cleanup = FileCleanup()
         self.process_manager = ProcessManager()
         self.battery_monitor = BatteryMonitor()
+        self.energy_attribution = EnergyAttribution()
+        self.process_manager.add_snapshot_listener(
+            lambda snapshot: self.energy_attribution.update(snapshot, self.battery_monitor.get_system_watts())
+        )
         
         self.platform = self.platform_detector.get_platform()
         self.is_admin = self.platform_detector.is_admin()
         
-        self.tasks = {}
         self.task_results = {}
-        self._stop_events = {}
-        self.threads = {}
+        self.single_flight = SingleFlight()
+        self.dispatcher = MainThreadDispatcher()
+        self.scheduler = TaskScheduler(self.dispatcher.invoke.emit, max_workers=min(4, os.cpu_count() or 2))
+        self.battery_monitor.start_history_recording()
         
     def get_temp_files(self):
         return self.file_cleanup.get_temp_files()
@@ -49,8 +64,40 @@ class AppController:
     def get_trash_items(self):
         return self.file_cleanup.get_trash_items()
     
-    def find_large_unused_files(self, search_paths: List[str], min_size_mb: float = 100, days_unused: int = 30):
-        return self.file_cleanup.find_large_unused_files(search_paths, min_size_mb, days_unused)
+    def find_large_unused_files(self, search_paths: List[str], min_size_mb: float = 100, days_unused: int = 30,
+                                stop_event=None, max_results: int = 1000, group_by: Optional[str] = None,
+                                group_limit: int = 10):
+        return self.file_cleanup.find_large_unused_files(search_paths, min_size_mb, days_unused, stop_event,
+                                                         max_results, group_by, group_limit)
+    
+    def find_large_unused_files_incremental(self, search_paths: List[str], min_size_mb: float = 100,
+                                            days_unused: int = 30, stop_event=None):
+        return self.file_cleanup.find_large_unused_files_incremental(search_paths, min_size_mb, days_unused, stop_event)
+    
+    def iter_large_unused_files(self, search_paths: List[str], min_size_mb: float = 100, days_unused: int = 30,
+                                stop_event=None):
+        return self.file_cleanup.iter_large_unused_files(search_paths, min_size_mb, days_unused, stop_event)
+    
+    def query_large_unused_files(self, search_paths: List[str], min_size_mb: float = 100, days_unused: int = 30):
+        return self.file_cleanup.query_large_unused_files(search_paths, min_size_mb, days_unused)
+    
+    def find_duplicate_files(self, search_paths: List[str], min_size_mb: float = 1, stop_event=None,
+                             on_group: Optional[Callable[[Dict], None]] = None):
+        return self.file_cleanup.find_duplicate_files(search_paths, min_size_mb, stop_event, on_group)
+    
+    def build_directory_tree(self, search_path: str, stop_event=None):
+        return self.file_cleanup.build_directory_tree(search_path, stop_event)
+    
+    def watch_file_results(self, category: str, results: List[Dict], search_paths: Optional[List[str]] = None,
+                           min_size_mb: float = 100, days_unused: int = 30):
+        return self.file_cleanup.watch_results(category, results, search_paths, min_size_mb, days_unused)
+    
+    def get_watched_file_results(self, category: str, search_paths: Optional[List[str]] = None,
+                                 min_size_mb: float = 100, days_unused: int = 30):
+        return self.file_cleanup.get_watched_results(category, search_paths, min_size_mb, days_unused)
+    
+    def set_file_watch_listener(self, callback: Optional[Callable[[str], None]]):
+        self.file_cleanup.file_watcher.on_change = callback
     
     def delete_files(self, file_paths: List[str], simulate: bool = False):
         return self.file_cleanup.delete_files(file_paths, simulate)
@@ -59,59 +106,129 @@ class AppController:
         return self.file_cleanup.empty_trash(simulate)
     
     def get_running_processes(self):
-        return self.process_manager.get_running_processes()
+        return self._shared(('processes',), self.process_manager.get_running_processes)
     
-    def get_high_resource_processes(self, cpu_threshold: float = 5.0, memory_threshold_mb: float = 500):
-        return self.process_manager.get_high_resource_processes(cpu_threshold, memory_threshold_mb)
+    def get_process_details(self, pids: List[int]):
+        return self.process_manager.get_process_details(pids)
+    
+    def get_process_history(self, pid: int):
+        return self.process_manager.get_process_history(pid)
+    
+    def get_own_cpu_usage(self):
+        return self.process_manager.get_own_cpu_usage()
+    
+    def get_high_resource_processes(self, cpu_threshold: float = 5.0, memory_threshold_mb: float = 500,
+                                    memory_metric: str = 'rss', io_threshold_kb_s: float = 0):
+        return self._shared(
+            ('high_resource_processes', cpu_threshold, memory_threshold_mb, memory_metric, io_threshold_kb_s),
+            lambda: self.process_manager.get_high_resource_processes(cpu_threshold, memory_threshold_mb,
+                                                                     memory_metric, io_threshold_kb_s)
+        )
+    
+    def get_top_io_processes(self, limit: int = 20):
+        return self._shared(('top_io_processes', limit), lambda: self.process_manager.get_top_io_processes(limit))
+    
+    def set_memory_accounting(self, enabled: bool):
+        self.process_manager.set_memory_accounting(enabled)
+    
+    def get_memory_usage(self, pids: List[int]):
+        return self.process_manager.get_memory_usage(pids)
     
     def terminate_process(self, pid: int, force: bool = False):
-        return self.process_manager.terminate_process(pid, force)
+        result = self.process_manager.terminate_process(pid, force)
+        self.invalidate_cache('processes', 'high_resource_processes', 'top_io_processes', 'process_tree', 'process_groups')
+        return result
+    
+    def terminate_process_tree(self, pid: int, force: bool = False):
+        result = self.process_manager.terminate_process_tree(pid, force)
+        self.invalidate_cache('processes', 'high_resource_processes', 'top_io_processes', 'process_tree', 'process_groups')
+        return result
+    
+    def build_process_tree(self):
+        return self._shared(('process_tree',), self.process_manager.build_process_tree)
+    
+    def get_process_groups(self, by: str = 'name'):
+        return self._shared(('process_groups', by), lambda: self.process_manager.get_process_groups(by))
     
     def get_startup_items(self):
-        return self.process_manager.get_startup_items()
+        return self._shared(('startup_items',), self.process_manager.get_startup_items)
     
     def disable_startup_item(self, item_name: str, item_location: str):
-        return self.process_manager.disable_startup_item(item_name, item_location)
+        result = self.process_manager.disable_startup_item(item_name, item_location)
+        self.invalidate_cache('startup_items')
+        return result
     
     def get_battery_status(self):
-        return self.battery_monitor.get_battery_status()
+        return self._shared(('battery_status',), self.battery_monitor.get_battery_status)
     
     def get_battery_health(self):
-        return self.battery_monitor.get_battery_health()
+        return self._shared(('battery_health',), self.battery_monitor.get_battery_health)
     
-    def get_power_usage_stats(self, duration_seconds: int = 60):
-        return self.battery_monitor.get_power_usage_stats(duration_seconds)
+    def get_power_usage_stats(self, duration_seconds: int = 60, since: Optional[float] = None):
+        return self._shared(('power_usage', duration_seconds, since),
+                            lambda: self.battery_monitor.get_power_usage_stats(duration_seconds, since))
     
-    def get_battery_optimization_recommendations(self):
-        return self.battery_monitor.get_optimization_recommendations()
+    def start_power_measurement(self):
+        return self.battery_monitor.start_power_measurement()
     
-    def run_task_in_background(self, task_id: str, func: Callable, callback: Optional[Callable] = None, **kwargs):
-        self.stop_background_task(task_id)
-        
-        thread = QThread()
-        self.threads[task_id] = thread
-        
-        if 'stop_event' in func.__code__.co_varnames:
-            stop_event = threading.Event()
-            self._stop_events[task_id] = stop_event
-            kwargs['stop_event'] = stop_event
-        
-        worker = TaskWorker(func, **kwargs)
-        worker.moveToThread(thread)
-        
-        thread.started.connect(worker.run)
-        worker.taskCompleted.connect(lambda result: self._on_task_completed(task_id, result, callback))
-        worker.taskFailed.connect(lambda error: self._on_task_failed(task_id, error, callback))
-        worker.taskCompleted.connect(thread.quit)
-        worker.taskFailed.connect(thread.quit)
-        thread.finished.connect(worker.deleteLater)
-        thread.finished.connect(lambda: self._cleanup_thread(task_id))
-        
-        self.tasks[task_id] = worker
+    def keep_power_measurement(self, active: bool):
+        self.battery_monitor.keep_power_measurement(active)
+    
+    def start_power_supply_listener(self, callback: Callable[[Dict], None]):
+        def on_change(change):
+            self.invalidate_cache('battery_status', 'battery_recommendations', 'power_usage')
+            self.dispatcher.invoke.emit(lambda: callback(change))
         
-        thread.start()
+        return self.battery_monitor.start_power_supply_listener(on_change)
+    
+    def get_battery_history(self, start: float, end: Optional[float] = None, max_points: int = 500):
+        return self.battery_monitor.get_battery_history(start, end, max_points)
+    
+    def get_capacity_trend(self, days: int = 365):
+        return self._shared(('capacity_trend', days), lambda: self.battery_monitor.get_capacity_trend(days))
+    
+    def get_energy_consumers(self, window: float = 60.0, limit: int = 15):
+        def report():
+            self.process_manager.get_snapshot()
+            result = self.energy_attribution.report(window, limit)
+            result['measurable'] = (self.platform == PlatformDetector.LINUX and
+                                    bool(self.battery_monitor.sysfs.batteries()))
+            return result
         
-        return True
+        return self._shared(('energy_consumers', window, limit), report)
+    
+    def get_battery_optimization_recommendations(self):
+        return self._shared(
+            ('battery_recommendations',),
+            lambda: self.battery_monitor.get_optimization_recommendations(
+                self.get_battery_status(), self.energy_attribution.report(limit=3)['consumers'])
+        )
+    
+    def invalidate_cache(self, *names: str):
+        self.single_flight.invalidate(lambda key: not names or key[0] in names)
+    
+    def _shared(self, key: tuple, func: Callable):
+        return self.single_flight.do(key, func, self.FRESHNESS.get(key[0], 0.0))
+    
+    def run_task_in_background(self, task_id: str, func: Callable, callback: Optional[Callable] = None,
+                               priority: int = TaskScheduler.INTERACTIVE, **kwargs):
+        return self._submit_task(task_id, func, callback, None, priority, False, kwargs)
+    
+    def run_streaming_task_in_background(self, task_id: str, func: Callable, on_chunk: Callable,
+                                         callback: Optional[Callable] = None,
+                                         priority: int = TaskScheduler.BULK, **kwargs):
+        return self._submit_task(task_id, func, callback, on_chunk, priority, True, kwargs)
+    
+    def _submit_task(self, task_id: str, func: Callable, callback: Optional[Callable],
+                     on_chunk: Optional[Callable], priority: int, streaming: bool, kwargs: Dict):
+        task = ScheduledTask(
+            task_id, func, kwargs, priority,
+            callback=lambda result: self._on_task_completed(task_id, result, callback),
+            on_chunk=on_chunk,
+            on_error=lambda error: self._on_task_failed(task_id, error, callback),
+            streaming=streaming
+        )
+        return self.scheduler.submit(task)
     
     def _on_task_completed(self, task_id: str, result, callback: Optional[Callable]):
         self.task_results[task_id] = {'success': True, 'result': result}
@@ -123,31 +240,21 @@ class AppController:
         if callback:
             callback(None)
     
-    def _cleanup_thread(self, task_id: str):
-        if task_id in self.threads:
-            del self.threads[task_id]
-        if task_id in self.tasks:
-            del self.tasks[task_id]
-    
     def stop_background_task(self, task_id: str):
-        if task_id in self._stop_events:
-            self._stop_events[task_id].set()
-        
-        if task_id in self.threads:
-            thread = self.threads[task_id]
-            if thread.isRunning():
-                thread.quit()
-                thread.wait(1000)
-                if thread.isRunning():
-                    thread.terminate()
-            return True
-        return False
+        return self.scheduler.cancel(task_id)
+    
+    def shutdown(self):
+        self.scheduler.shutdown()
+        self.process_manager.sampler.stop()
+        self.battery_monitor.discharge_meter.stop()
+        self.battery_monitor.stop_power_supply_listener()
+        self.battery_monitor.stop_history_recording()
     
     def get_task_result(self, task_id: str):
         return self.task_results.get(task_id)
     
     def is_task_running(self, task_id: str):
-        return task_id in self.threads and self.threads[task_id].isRunning()
+        return self.scheduler.is_active(task_id)
     
     def scan_for_large_files_in_background(self, search_paths: List[str], min_size_mb: float = 100, 
                                          days_unused: int = 30, callback: Optional[Callable] = None):
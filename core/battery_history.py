@@ -0,0 +1,301 @@
+import os
+import time
+import sqlite3
+import threading
+from typing import List, Dict, Optional, Iterable
+from platform.platform_detector import PlatformDetector
+from core.discharge_meter import theil_sen
+
+YEAR_SECONDS = 365.25 * 86400
+
+class HistoryBucket:
+    AVERAGED = ('percent', 'watts', 'plugged', 'full_capacity', 'design_capacity')
+    
+    def __init__(self, start: int):
+        self.start = start
+        self.samples = 0
+        self.sums = dict.fromkeys(self.AVERAGED, 0.0)
+        self.weights = dict.fromkeys(self.AVERAGED, 0)
+        self.percent_min = None
+        self.percent_max = None
+        self.cycle_count = None
+    
+    def add(self, row: Dict[str, any]):
+        samples = row.get('samples', 1)
+        self.samples += samples
+        
+        for field in self.AVERAGED:
+            value = row.get(field)
+            if value is not None:
+                self.sums[field] += value * samples
+                self.weights[field] += samples
+        
+        low = row.get('percent_min', row.get('percent'))
+        high = row.get('percent_max', row.get('percent'))
+        if low is not None:
+            self.percent_min = low if self.percent_min is None else min(self.percent_min, low)
+        if high is not None:
+            self.percent_max = high if self.percent_max is None else max(self.percent_max, high)
+        if row.get('cycle_count') is not None:
+            self.cycle_count = max(self.cycle_count or 0, row['cycle_count'])
+    
+    def row(self) -> Dict[str, any]:
+        row = {'timestamp': self.start, 'samples': self.samples}
+        for field in self.AVERAGED:
+            row[field] = self.sums[field] / self.weights[field] if self.weights[field] else None
+        row['percent_min'] = self.percent_min
+        row['percent_max'] = self.percent_max
+        row['cycle_count'] = self.cycle_count
+        return row
+
+class BatteryHistory:
+    
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS battery_samples (
+        resolution INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        samples INTEGER NOT NULL,
+        percent REAL,
+        percent_min REAL,
+        percent_max REAL,
+        watts REAL,
+        plugged REAL,
+        full_capacity REAL,
+        design_capacity REAL,
+        cycle_count INTEGER,
+        PRIMARY KEY (resolution, bucket)
+    ) WITHOUT ROWID;
+    """
+    
+    COLUMNS = ('samples', 'percent', 'percent_min', 'percent_max', 'watts', 'plugged',
+               'full_capacity', 'design_capacity', 'cycle_count')
+    RESOLUTIONS = (0, 60, 3600, 86400)
+    RETENTION = {0: 86400, 60: 7 * 86400, 3600: 2 * 365 * 86400, 86400: None}
+    
+    def __init__(self, db_path: Optional[str] = None, flush_interval: float = 300.0):
+        if db_path is None:
+            db_path = os.path.join(PlatformDetector.get_data_directory(), "battery_history.db")
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        
+        self._pending = []
+        self._open = {}
+        self._lock = threading.Lock()
+        self._initialized = False
+        self._loaded = False
+        self._last_flush = time.time()
+        self._last_prune = 0.0
+    
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        
+        if not self._initialized:
+            conn.executescript(self.SCHEMA)
+            self._initialized = True
+        
+        return conn
+    
+    def append(self, percent: Optional[float], watts: Optional[float] = None, plugged: Optional[bool] = None,
+               full_capacity: Optional[float] = None, design_capacity: Optional[float] = None,
+               cycle_count: Optional[int] = None, timestamp: Optional[float] = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        sample = {
+            'samples': 1,
+            'percent': percent,
+            'watts': watts,
+            'plugged': None if plugged is None else float(plugged),
+            'full_capacity': full_capacity,
+            'design_capacity': design_capacity,
+            'cycle_count': cycle_count
+        }
+        
+        with self._lock:
+            self._load()
+            
+            raw = HistoryBucket(int(timestamp))
+            raw.add(sample)
+            self._pending.append((0, raw.row()))
+            
+            for resolution in self.RESOLUTIONS[1:]:
+                start = int(timestamp) - int(timestamp) % resolution
+                bucket = self._open.get(resolution)
+                if bucket is not None and bucket.start != start:
+                    self._pending.append((resolution, bucket.row()))
+                    bucket = None
+                if bucket is None:
+                    bucket = self._open[resolution] = HistoryBucket(start)
+                bucket.add(sample)
+            
+            if time.time() - self._last_flush >= self.flush_interval:
+                self._flush()
+    
+    def flush(self):
+        with self._lock:
+            self._flush()
+    
+    def close(self):
+        self.flush()
+    
+    def query(self, start: float, end: Optional[float] = None, resolution: Optional[int] = None,
+              max_points: int = 500) -> List[Dict[str, any]]:
+        end = time.time() if end is None else end
+        if resolution is None:
+            resolution = self.resolution_for(start, end, max_points)
+        
+        with self._lock:
+            self._load()
+            rows = self._stored_rows(resolution, start, end)
+            rows.extend(row for row in self._memory_rows(resolution) if start <= row['timestamp'] <= end)
+        
+        rows.sort(key=lambda row: row['timestamp'])
+        return rows
+    
+    def resolution_for(self, start: float, end: Optional[float] = None, max_points: int = 500) -> int:
+        now = time.time()
+        end = now if end is None else end
+        
+        for resolution in self.RESOLUTIONS[1:]:
+            retention = self.RETENTION[resolution]
+            if (retention is None or now - start <= retention) and (end - start) / resolution <= max_points:
+                return resolution
+        return self.RESOLUTIONS[-1]
+    
+    def capacity_trend(self, days: int = 365, threshold_percent: float = 80.0) -> Dict[str, any]:
+        now = time.time()
+        rows = self.query(now - days * 86400, now, resolution=86400)
+        if len(rows) < 3:
+            rows = self.query(now - days * 86400, now, resolution=3600)
+        
+        points = [(row['timestamp'], row['full_capacity'] / row['design_capacity'] * 100, row['cycle_count'])
+                  for row in rows if row['full_capacity'] and row['design_capacity']]
+        
+        trend = {'available': False, 'points': len(points)}
+        if len(points) < 3:
+            return trend
+        
+        fit = theil_sen([point[0] for point in points], [point[1] for point in points])
+        if not fit:
+            return trend
+        
+        slope, low, high = fit
+        health = points[-1][1]
+        trend.update({
+            'available': True,
+            'days': round((points[-1][0] - points[0][0]) / 86400, 1),
+            'health_percent': round(health, 2),
+            'fade_percent_per_year': round(-slope * YEAR_SECONDS, 2),
+            'fade_low': round(-high * YEAR_SECONDS, 2),
+            'fade_high': round(-low * YEAR_SECONDS, 2)
+        })
+        
+        if slope < 0 and health > threshold_percent:
+            seconds = (threshold_percent - health) / slope
+            trend['threshold_percent'] = threshold_percent
+            trend['days_to_threshold'] = round(seconds / 86400, 1)
+            trend['threshold_date'] = points[-1][0] + seconds
+        
+        cycles = [(point[2], point[1]) for point in points if point[2] is not None]
+        if len(cycles) >= 3 and cycles[-1][0] > cycles[0][0]:
+            cycle_fit = theil_sen([point[0] for point in cycles], [point[1] for point in cycles])
+            if cycle_fit:
+                trend['fade_percent_per_100_cycles'] = round(-cycle_fit[0] * 100, 2)
+            trend['cycle_count'] = cycles[-1][0]
+        
+        return trend
+    
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        
+        try:
+            conn = self._connect()
+            try:
+                for finer, resolution in zip(self.RESOLUTIONS, self.RESOLUTIONS[1:]):
+                    last = conn.execute("SELECT MAX(bucket) FROM battery_samples WHERE resolution = ?",
+                                        (resolution,)).fetchone()[0]
+                    next_start = 0 if last is None else last + resolution
+                    rows = self._fetch(conn, finer, next_start, None)
+                    rows.extend(row for row in self._memory_rows(finer) if row['timestamp'] >= next_start)
+                    self._rebuild(resolution, sorted(rows, key=lambda row: row['timestamp']))
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Error loading battery history: {e}")
+    
+    def _rebuild(self, resolution: int, rows: Iterable[Dict[str, any]]):
+        bucket = None
+        for row in rows:
+            start = int(row['timestamp']) - int(row['timestamp']) % resolution
+            if bucket is not None and bucket.start != start:
+                self._pending.append((resolution, bucket.row()))
+                bucket = None
+            if bucket is None:
+                bucket = HistoryBucket(start)
+            bucket.add(row)
+        
+        if bucket is not None:
+            self._open[resolution] = bucket
+    
+    def _flush(self):
+        self._last_flush = time.time()
+        if not self._pending:
+            return
+        
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        f"INSERT OR REPLACE INTO battery_samples (resolution, bucket, {', '.join(self.COLUMNS)}) "
+                        f"VALUES ({', '.join('?' * (len(self.COLUMNS) + 2))})",
+                        [(resolution, row['timestamp']) + tuple(row[column] for column in self.COLUMNS)
+                         for resolution, row in self._pending]
+                    )
+                    if self._last_flush - self._last_prune >= 3600:
+                        self._prune(conn, self._last_flush)
+                self._pending = []
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Error saving battery history: {e}")
+    
+    def _prune(self, conn: sqlite3.Connection, now: float):
+        self._last_prune = now
+        for resolution, retention in self.RETENTION.items():
+            if retention is not None:
+                conn.execute("DELETE FROM battery_samples WHERE resolution = ? AND bucket < ?",
+                             (resolution, int(now - retention)))
+    
+    def _stored_rows(self, resolution: int, start: float, end: float) -> List[Dict[str, any]]:
+        try:
+            conn = self._connect()
+            try:
+                return self._fetch(conn, resolution, start, end)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Error reading battery history: {e}")
+            return []
+    
+    def _fetch(self, conn: sqlite3.Connection, resolution: int, start: float,
+               end: Optional[float]) -> List[Dict[str, any]]:
+        rows = conn.execute(
+            f"SELECT bucket, {', '.join(self.COLUMNS)} FROM battery_samples "
+            "WHERE resolution = ? AND bucket >= ? AND bucket <= ? ORDER BY bucket",
+            (resolution, int(start), int(end) if end is not None else 2 ** 62)
+        )
+        return [dict(zip(('timestamp',) + self.COLUMNS, row)) for row in rows]
+    
+    def _memory_rows(self, resolution: int) -> List[Dict[str, any]]:
+        rows = [row for row_resolution, row in self._pending if row_resolution == resolution]
+        if resolution in self._open:
+            rows.append(self._open[resolution].row())
+        return rows
\ No newline at end of file
@@ -1,20 +1,39 @@
 import os
 import re
+import math
 import time
+import threading
 import subprocess
-from typing import Dict, Optional, Tuple, List
+from collections import namedtuple
+from typing import Dict, Optional, Tuple, List, Callable
 import psutil
 from platform.platform_detector import PlatformDetector
+from core.discharge_meter import DischargeMeter
+from core.sysfs_battery import SysfsBatteryReader
+from core.power_supply_events import PowerSupplyListener
+from core.battery_history import BatteryHistory
+
+BatteryReading = namedtuple('BatteryReading', ['percent', 'secsleft', 'power_plugged'])
 
 class BatteryMonitor:
+    HISTORY_HEALTH_INTERVAL = 900
+    HISTORY_INTERVAL = 60
     
     def __init__(self):
         self.platform = PlatformDetector.get_platform()
+        self.sysfs = SysfsBatteryReader()
+        self.discharge_meter = DischargeMeter(self.sysfs)
+        self.power_supply_listener = PowerSupplyListener(self.sysfs)
+        self.history = BatteryHistory()
+        self._history_health = {}
+        self._history_health_at = 0.0
+        self._history_thread = None
+        self._history_stop = threading.Event()
         
     def get_battery_status(self) -> Dict[str, any]:
         battery_info = {'available': False}
         
-        battery = psutil.sensors_battery()
+        battery = self._sensors_battery()
         if battery:
             battery_info.update({
                 'available': True,
@@ -40,6 +59,56 @@ class BatteryMonitor:
         
         return battery_info
     
+    def _sensors_battery(self):
+        if self.platform != PlatformDetector.LINUX or not self.sysfs.batteries():
+            return psutil.sensors_battery()
+        
+        energy_now = energy_full = power_now = 0
+        percents = []
+        discharging = False
+        
+        for battery_dir in self.sysfs.batteries():
+            values = self.sysfs.read_many(battery_dir, [
+                "capacity", "status", "energy_now", "energy_full", "power_now",
+                "charge_now", "charge_full", "current_now", "voltage_now"])
+            
+            discharging = discharging or values["status"] == "Discharging"
+            voltage = values["voltage_now"] if isinstance(values["voltage_now"], int) else None
+            
+            if isinstance(values["energy_now"], int) and isinstance(values["energy_full"], int):
+                energy_now += values["energy_now"]
+                energy_full += values["energy_full"]
+            elif isinstance(values["charge_now"], int) and isinstance(values["charge_full"], int) and voltage:
+                energy_now += values["charge_now"] * voltage / 1e6
+                energy_full += values["charge_full"] * voltage / 1e6
+            
+            if isinstance(values["power_now"], int):
+                power_now += abs(values["power_now"])
+            elif isinstance(values["current_now"], int) and voltage:
+                power_now += abs(values["current_now"]) * voltage / 1e6
+            
+            if isinstance(values["capacity"], int):
+                percents.append(values["capacity"])
+        
+        online = [self.sysfs.read_int(supply, "online") for supply in self.sysfs.supplies("Mains")]
+        power_plugged = any(online) if online else not discharging
+        
+        if energy_full > 0:
+            percent = min(100.0, energy_now / energy_full * 100)
+        elif percents:
+            percent = sum(percents) / len(percents)
+        else:
+            return psutil.sensors_battery()
+        
+        if power_plugged:
+            secsleft = psutil.POWER_TIME_UNLIMITED
+        elif power_now > 0 and energy_full > 0:
+            secsleft = int(energy_now / power_now * 3600)
+        else:
+            secsleft = psutil.POWER_TIME_UNKNOWN
+        
+        return BatteryReading(percent, secsleft, power_plugged)
+    
     def get_battery_health(self) -> Dict[str, any]:
         health_info = {}
         
@@ -120,39 +189,115 @@ class BatteryMonitor:
         
         return health_info
     
-    def get_power_usage_stats(self, duration_seconds: int = 60) -> Dict[str, float]:
+    def get_power_usage_stats(self, duration_seconds: int = 60, since: Optional[float] = None) -> Dict[str, float]:
         power_stats = {'available': False}
         
         try:
-            battery = psutil.sensors_battery()
+            battery = self._sensors_battery()
             if not battery or battery.power_plugged:
+                self.discharge_meter.stop()
                 return power_stats
             
-            if battery.secsleft > 0 and battery.secsleft != psutil.POWER_TIME_UNLIMITED:
-                hours_remaining = battery.secsleft / 3600
-                discharge_rate = battery.percent / hours_remaining if hours_remaining > 0 else 0
-                
-                power_stats = {
-                    'available': True,
-                    'discharge_rate_percent_per_hour': round(discharge_rate, 2),
-                    'estimated_hours_remaining': round(hours_remaining, 2),
-                    'current_percent': battery.percent
-                }
-            else:
-                power_stats = {
-                    'available': True,
-                    'discharge_rate_percent_per_hour': 10.0,
-                    'estimated_hours_remaining': battery.percent / 10.0,
-                    'current_percent': battery.percent
-                }
+            self.discharge_meter.start()
+            power_stats = self.discharge_meter.stats(duration_seconds, since)
+            power_stats['available'] = True
+            power_stats.setdefault('current_percent', battery.percent)
         except Exception as e:
             print(f"Error monitoring power usage: {e}")
         
         return power_stats
     
-    def get_optimization_recommendations(self) -> List[Dict[str, str]]:
+    def start_power_measurement(self) -> float:
+        return self.discharge_meter.measure()
+    
+    def keep_power_measurement(self, active: bool):
+        self.discharge_meter.hold(active)
+    
+    def start_power_supply_listener(self, on_change: Callable[[Dict[str, any]], None]) -> bool:
+        if self.platform != PlatformDetector.LINUX or not (self.sysfs.batteries() or self.sysfs.supplies("Mains")):
+            return False
+        
+        self.power_supply_listener.on_change = on_change
+        return self.power_supply_listener.start()
+    
+    def stop_power_supply_listener(self):
+        self.power_supply_listener.stop()
+    
+    def record_history_sample(self) -> bool:
+        try:
+            battery = self._sensors_battery()
+            if not battery:
+                return False
+            
+            now = time.time()
+            if now - self._history_health_at >= self.HISTORY_HEALTH_INTERVAL:
+                self._history_health = self.get_battery_health()
+                self._history_health_at = now
+            
+            watts = None
+            if self.platform == PlatformDetector.LINUX:
+                sample = self.discharge_meter.read_sample()
+                if sample is not None and not math.isnan(sample[0]):
+                    watts = sample[0]
+            
+            self.history.append(
+                battery.percent, watts, battery.power_plugged,
+                self._history_health.get('current_capacity'),
+                self._history_health.get('design_capacity'),
+                self._history_health.get('cycle_count'),
+                now
+            )
+            return True
+        except Exception as e:
+            print(f"Error recording battery history: {e}")
+            return False
+    
+    def start_history_recording(self):
+        if self._history_thread is not None and self._history_thread.is_alive():
+            return
+        
+        self._history_stop.clear()
+        self._history_thread = threading.Thread(target=self._record_history, name="BatteryHistory", daemon=True)
+        self._history_thread.start()
+    
+    def stop_history_recording(self):
+        self._history_stop.set()
+        if self._history_thread is not None:
+            self._history_thread.join(2)
+            self._history_thread = None
+        self.history.close()
+    
+    def _record_history(self):
+        while not self._history_stop.is_set():
+            self.record_history_sample()
+            self._history_stop.wait(self.HISTORY_INTERVAL)
+    
+    def get_system_watts(self) -> Optional[float]:
+        if self.platform != PlatformDetector.LINUX:
+            return None
+        
+        try:
+            sample = self.discharge_meter.read_sample()
+        except Exception as e:
+            print(f"Error reading battery power draw: {e}")
+            return None
+        
+        if sample is None or not sample[3] or math.isnan(sample[0]):
+            return None
+        return sample[0]
+    
+    def get_battery_history(self, start: float, end: Optional[float] = None,
+                            max_points: int = 500) -> List[Dict[str, any]]:
+        return self.history.query(start, end, max_points=max_points)
+    
+    def get_capacity_trend(self, days: int = 365) -> Dict[str, any]:
+        return self.history.capacity_trend(days)
+    
+    def get_optimization_recommendations(self, battery_status: Optional[Dict[str, any]] = None,
+                                         energy_consumers: Optional[List[Dict[str, any]]] = None) -> List[Dict[str, str]]:
         recommendations = []
-        battery_status = self.get_battery_status()
+        if battery_status is None:
+            battery_status = self.get_battery_status()
         
         if not battery_status.get('available') or battery_status.get('power_plugged', True):
             recommendations.append({
@@ -178,10 +323,7 @@ class BatteryMonitor:
                 'title': "Enable Battery Saver Mode",
                 'description': "Use your operating system's battery saver mode to extend battery life."
             },
-            {
-                'title': "Close High Power Applications",
-                'description': "Applications that use 3D graphics or perform intensive calculations consume more power."
-            },
+            self._high_power_recommendation(energy_consumers),
             {
                 'title': "Disable Unused Connections",
                 'description': "Turn off Wi-Fi, Bluetooth and other connections when not in use."
@@ -205,6 +347,21 @@ class BatteryMonitor:
         
         return recommendations
     
+    def _high_power_recommendation(self, energy_consumers: Optional[List[Dict[str, any]]]) -> Dict[str, str]:
+        consumers = [consumer for consumer in energy_consumers or [] if consumer['share_percent'] >= 5]
+        if not consumers:
+            return {
+                'title': "Close High Power Applications",
+                'description': "Applications that use 3D graphics or perform intensive calculations consume more power."
+            }
+        
+        return {
+            'title': "Close High Power Applications",
+            'description': "Highest estimated power use: " + ", ".join(
+                f"{consumer['name']} ({consumer['share_percent']:.0f}%)" for consumer in consumers[:3]
+            ) + ". Close or pause them if they are not needed."
+        }
+    
     def _get_windows_battery_info(self) -> Dict[str, any]:
         windows_info = {}
         
@@ -276,33 +433,7 @@ class BatteryMonitor:
         return linux_info
     
     def _find_linux_battery_dirs(self) -> List[str]:
-        battery_dirs = []
-        
-        base_path = "/sys/class/power_supply"
-        
-        if os.path.exists(base_path):
-            for item in os.listdir(base_path):
-                item_path = os.path.join(base_path, item)
-                type_path = os.path.join(item_path, "type")
-                
-                if os.path.exists(type_path):
-                    with open(type_path, 'r') as f:
-                        if f.read().strip() == "Battery":
-                            battery_dirs.append(item_path)
-        
-        return battery_dirs
+        return self.sysfs.batteries()
     
     def _read_linux_battery_file(self, path: str) -> Optional[int]:
-        if not os.path.exists(path):
-            return None
-            
-        try:
-            with open(path, 'r') as f:
-                content = f.read().strip()
-                
-            try:
-                return int(content)
-            except ValueError:
-                return content
-        except:
-            return None
\ No newline at end of file
+        return self.sysfs.read_value(os.path.dirname(path), os.path.basename(path))
\ No newline at end of file
@@ -0,0 +1,135 @@
+import os
+import threading
+from array import array
+from typing import List, Dict, Optional
+
+class DirectoryTree:
+    
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.names = []
+        self.parent = array('q')
+        self.direct_bytes = array('q')
+        self.direct_files = array('q')
+        self.total_bytes = array('q')
+        self.total_files = array('q')
+        self.oldest_atime = array('d')
+        self.child_start = array('q')
+        self.child_index = array('q')
+        self._nodes = {}
+        self._lock = threading.Lock()
+    
+    def build(self, scan_engine, should_descend=None, stop_event=None) -> 'DirectoryTree':
+        self._add_node(self.root)
+        
+        def on_directory(path, files, subdirs):
+            total = 0
+            oldest = float('inf')
+            for _, file_stats in files:
+                total += file_stats.st_size
+                if file_stats.st_atime < oldest:
+                    oldest = file_stats.st_atime
+            
+            with self._lock:
+                node = self._add_node(path)
+                for subdir in subdirs:
+                    self._add_node(subdir, node)
+                self.direct_bytes[node] = total
+                self.direct_files[node] = len(files)
+                self.oldest_atime[node] = oldest
+        
+        scan_engine.scan([self.root], on_directory, should_descend, stop_event)
+        
+        self._aggregate()
+        self._index_children()
+        self._nodes = None
+        return self
+    
+    def __len__(self) -> int:
+        return len(self.parent)
+    
+    def children(self, node: int) -> List[int]:
+        return list(self.child_index[self.child_start[node]:self.child_start[node + 1]])
+    
+    def path(self, node: int) -> str:
+        parts = []
+        while self.parent[node] >= 0:
+            parts.append(self.names[node])
+            node = self.parent[node]
+        return os.path.join(self.root, *reversed(parts)) if parts else self.root
+    
+    def find(self, path: str) -> Optional[int]:
+        relative = os.path.relpath(os.path.abspath(path), self.root)
+        if relative == os.curdir:
+            return 0
+        if relative.startswith(os.pardir):
+            return None
+        
+        node = 0
+        for part in relative.split(os.sep):
+            node = next((child for child in self.children(node) if self.names[child] == part), None)
+            if node is None:
+                return None
+        return node
+    
+    def node_info(self, node: int) -> Dict[str, any]:
+        oldest = self.oldest_atime[node]
+        return {
+            'path': self.path(node),
+            'name': self.names[node],
+            'size': self.total_bytes[node],
+            'files': self.total_files[node],
+            'direct_size': self.direct_bytes[node],
+            'oldest_access': oldest if oldest != float('inf') else None,
+            'has_children': self.child_start[node + 1] > self.child_start[node]
+        }
+    
+    def _add_node(self, path: str, parent: Optional[int] = None) -> int:
+        node = self._nodes.get(path)
+        if node is not None:
+            return node
+        
+        if parent is None and path != self.root:
+            parent = self._add_node(os.path.dirname(path))
+        
+        node = len(self.parent)
+        self._nodes[path] = node
+        self.names.append(os.path.basename(path) or path)
+        self.parent.append(-1 if parent is None else parent)
+        self.direct_bytes.append(0)
+        self.direct_files.append(0)
+        self.oldest_atime.append(float('inf'))
+        return node
+    
+    def _aggregate(self):
+        count = len(self.parent)
+        self.total_bytes = array('q', self.direct_bytes)
+        self.total_files = array('q', self.direct_files)
+        
+        depth = array('q', bytes(8 * count))
+        for node in range(1, count):
+            depth[node] = depth[self.parent[node]] + 1
+        
+        for node in sorted(range(1, count), key=depth.__getitem__, reverse=True):
+            parent = self.parent[node]
+            self.total_bytes[parent] += self.total_bytes[node]
+            self.total_files[parent] += self.total_files[node]
+            if self.oldest_atime[node] < self.oldest_atime[parent]:
+                self.oldest_atime[parent] = self.oldest_atime[node]
+    
+    def _index_children(self):
+        count = len(self.parent)
+        counts = array('q', bytes(8 * (count + 1)))
+        for node in range(1, count):
+            counts[self.parent[node] + 1] += 1
+        
+        for node in range(count):
+            counts[node + 1] += counts[node]
+        
+        self.child_start = array('q', counts)
+        self.child_index = array('q', bytes(8 * (count - 1 if count else 0)))
+        fill = array('q', counts)
+        for node in sorted(range(1, count), key=self.total_bytes.__getitem__, reverse=True):
+            parent = self.parent[node]
+            self.child_index[fill[parent]] = node
+            fill[parent] += 1
\ No newline at end of file
@@ -0,0 +1,236 @@
+import math
+import time
+import threading
+from array import array
+from typing import List, Dict, Optional, Tuple
+import psutil
+
+from core.sysfs_battery import SysfsBatteryReader
+
+def theil_sen(xs: List[float], ys: List[float], z: float = 1.96,
+              max_points: int = 200) -> Optional[Tuple[float, float, float]]:
+    n = len(xs)
+    if n > max_points:
+        indices = [round(i * (n - 1) / (max_points - 1)) for i in range(max_points)]
+        xs = [xs[i] for i in indices]
+        ys = [ys[i] for i in indices]
+        n = max_points
+    
+    slopes = sorted((ys[j] - ys[i]) / (xs[j] - xs[i])
+                    for i in range(n) for j in range(i + 1, n) if xs[j] != xs[i])
+    count = len(slopes)
+    if count == 0:
+        return None
+    
+    middle = count // 2
+    slope = slopes[middle] if count % 2 else (slopes[middle - 1] + slopes[middle]) / 2
+    spread = z * math.sqrt(n * (n - 1) * (2 * n + 5) / 18)
+    low = slopes[max(0, int((count - spread) / 2))]
+    high = slopes[min(count - 1, int((count + spread) / 2))]
+    return slope, low, high
+
+def median_interval(values: List[float]) -> Tuple[float, float, float]:
+    values = sorted(values)
+    n = len(values)
+    middle = n // 2
+    median = values[middle] if n % 2 else (values[middle - 1] + values[middle]) / 2
+    spread = 1.57 * (values[(3 * n) // 4] - values[n // 4]) / math.sqrt(n)
+    return median, median - spread, median + spread
+
+class DischargeMeter:
+    
+    def __init__(self, reader: Optional[SysfsBatteryReader] = None, interval: float = 1.0,
+                 capacity: int = 3600, idle_after: float = 300.0):
+        self.reader = reader if reader is not None else SysfsBatteryReader()
+        self.interval = interval
+        self.capacity = max(2, capacity)
+        self.idle_after = idle_after
+        self.full_energy_wh = None
+        
+        self._times = array('d', bytes(8 * self.capacity))
+        self._watts = array('d', bytes(8 * self.capacity))
+        self._energy = array('d', bytes(8 * self.capacity))
+        self._percent = array('d', bytes(8 * self.capacity))
+        self._discharging = bytearray(self.capacity)
+        self._count = 0
+        
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._last_request = time.monotonic()
+        self.held = False
+    
+    def hold(self, held: bool):
+        self.held = held
+        self._last_request = time.monotonic()
+        if held:
+            self.start()
+    
+    def start(self):
+        self._last_request = time.monotonic()
+        
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="DischargeMeter", daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(2)
+            self._thread = None
+    
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def measure(self) -> float:
+        self.start()
+        return time.monotonic()
+    
+    def record(self, timestamp: Optional[float] = None) -> bool:
+        sample = self.read_sample()
+        if sample is None:
+            return False
+        
+        watts, energy_wh, percent, discharging = sample
+        with self._lock:
+            slot = self._count % self.capacity
+            self._times[slot] = time.monotonic() if timestamp is None else timestamp
+            self._watts[slot] = watts
+            self._energy[slot] = energy_wh
+            self._percent[slot] = percent
+            self._discharging[slot] = 1 if discharging else 0
+            self._count += 1
+        return True
+    
+    def read_sample(self) -> Optional[Tuple[float, float, float, bool]]:
+        battery_dirs = [battery_dir for battery_dir in self.reader.batteries()
+                        if self.reader.read_value(battery_dir, "present") != 0]
+        
+        if not battery_dirs:
+            battery = psutil.sensors_battery()
+            if not battery:
+                return None
+            return math.nan, math.nan, float(battery.percent), not battery.power_plugged
+        
+        watts = energy = full = 0.0
+        has_watts = has_energy = has_full = False
+        percents = []
+        discharging = False
+        
+        for battery_dir in battery_dirs:
+            values = self.reader.read_many(battery_dir, [
+                "power_now", "current_now", "voltage_now", "energy_now", "energy_full",
+                "charge_now", "charge_full", "capacity", "status"])
+            discharging = discharging or values["status"] == "Discharging"
+            values = {name: value if isinstance(value, int) else None for name, value in values.items()}
+            voltage = values["voltage_now"]
+            
+            if values["power_now"] is not None:
+                watts += abs(values["power_now"]) / 1e6
+                has_watts = True
+            elif values["current_now"] is not None and voltage is not None:
+                watts += abs(values["current_now"]) * voltage / 1e12
+                has_watts = True
+            
+            if values["energy_now"] is not None:
+                energy += values["energy_now"] / 1e6
+                has_energy = True
+                if values["energy_full"] is not None:
+                    full += values["energy_full"] / 1e6
+                    has_full = True
+            elif values["charge_now"] is not None and voltage is not None:
+                energy += values["charge_now"] * voltage / 1e12
+                has_energy = True
+                if values["charge_full"] is not None:
+                    full += values["charge_full"] * voltage / 1e12
+                    has_full = True
+            
+            if values["capacity"] is not None:
+                percents.append(values["capacity"])
+        
+        if has_full and full > 0:
+            self.full_energy_wh = full
+        
+        percent = sum(percents) / len(percents) if percents else math.nan
+        if has_energy and has_full and full > 0:
+            percent = energy / full * 100
+        
+        return (watts if has_watts else math.nan, energy if has_energy else math.nan, percent, discharging)
+    
+    def stats(self, window: Optional[float] = None, since: Optional[float] = None) -> Dict[str, any]:
+        self._last_request = time.monotonic()
+        now = time.monotonic()
+        start = since if since is not None else now - (window or 0)
+        
+        with self._lock:
+            count = min(self._count, self.capacity)
+            slots = [(self._count - count + index) % self.capacity for index in range(count)]
+            slots = [slot for slot in slots if self._times[slot] >= start]
+            last_charging = max((position for position, slot in enumerate(slots) if not self._discharging[slot]),
+                                default=-1)
+            slots = slots[last_charging + 1:]
+            times = [self._times[slot] for slot in slots]
+            watts = [self._watts[slot] for slot in slots if not math.isnan(self._watts[slot])]
+            energy = [(self._times[slot], self._energy[slot]) for slot in slots if not math.isnan(self._energy[slot])]
+            percent = [(self._times[slot], self._percent[slot]) for slot in slots if not math.isnan(self._percent[slot])]
+        
+        stats = {
+            'available': True,
+            'samples': len(times),
+            'window_seconds': round(times[-1] - times[0], 1) if len(times) > 1 else 0.0,
+            'complete': window is None or (len(times) > 1 and times[-1] - times[0] >= window * 0.9)
+        }
+        
+        if not times:
+            stats['available'] = False
+            return stats
+        
+        if percent:
+            stats['current_percent'] = round(percent[-1][1], 1)
+        
+        rate = None
+        if len(watts) >= 3:
+            rate = median_interval(watts)
+        elif len(energy) >= 3:
+            fit = theil_sen([point[0] for point in energy], [point[1] for point in energy])
+            if fit:
+                rate = (-fit[0] * 3600, -fit[2] * 3600, -fit[1] * 3600)
+        
+        percent_rate = None
+        if rate and self.full_energy_wh:
+            percent_rate = tuple(value / self.full_energy_wh * 100 for value in rate)
+        elif len(percent) >= 3:
+            fit = theil_sen([point[0] for point in percent], [point[1] for point in percent])
+            if fit:
+                percent_rate = (-fit[0] * 3600, -fit[2] * 3600, -fit[1] * 3600)
+        
+        if rate:
+            stats['watts'] = round(rate[0], 2)
+            stats['watts_low'] = round(rate[1], 2)
+            stats['watts_high'] = round(rate[2], 2)
+        
+        if percent_rate:
+            value, low, high = percent_rate
+            stats['discharge_rate_percent_per_hour'] = round(value, 2)
+            stats['discharge_rate_low'] = round(low, 2)
+            stats['discharge_rate_high'] = round(high, 2)
+            stats['confidence'] = round(max(0.0, 1 - (high - low) / (2 * max(abs(value), 1e-6))), 2)
+            if value > 0 and percent:
+                stats['estimated_hours_remaining'] = round(percent[-1][1] / value, 2)
+        
+        return stats
+    
+    def _run(self):
+        while not self._stop_event.is_set():
+            if not self.held and time.monotonic() - self._last_request > self.idle_after:
+                break
+            
+            try:
+                self.record()
+            except Exception as e:
+                print(f"Error sampling battery discharge: {e}")
+            
+            self._stop_event.wait(self.interval)
\ No newline at end of file
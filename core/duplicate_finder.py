@@ -0,0 +1,182 @@
+import os
+import mmap
+import hashlib
+import threading
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from typing import List, Dict, Tuple, Optional, Callable
+
+PARTIAL_HASH_BYTES = 4096
+O_NOATIME = getattr(os, 'O_NOATIME', 0)
+
+def _open_noatime(path: str):
+    if O_NOATIME:
+        try:
+            return os.fdopen(os.open(path, os.O_RDONLY | O_NOATIME), 'rb'), None
+        except PermissionError:
+            pass
+    
+    stats = os.stat(path)
+    return open(path, 'rb'), stats
+
+def _restore_atime(path: str, stats: Optional[os.stat_result]):
+    if stats is None:
+        return
+    try:
+        os.utime(path, ns=(stats.st_atime_ns, stats.st_mtime_ns))
+    except OSError:
+        pass
+
+def _hash_partial(path: str, size: int) -> Tuple[str, bool]:
+    digest = hashlib.blake2b(digest_size=16)
+    
+    f, stats = _open_noatime(path)
+    try:
+        if size <= 2 * PARTIAL_HASH_BYTES:
+            digest.update(f.read())
+            return digest.hexdigest(), True
+        
+        digest.update(f.read(PARTIAL_HASH_BYTES))
+        f.seek(size - PARTIAL_HASH_BYTES)
+        digest.update(f.read(PARTIAL_HASH_BYTES))
+    finally:
+        f.close()
+        _restore_atime(path, stats)
+    
+    return digest.hexdigest(), False
+
+def _hash_full(path: str) -> Tuple[str, Optional[str]]:
+    digest = hashlib.blake2b()
+    
+    try:
+        f, stats = _open_noatime(path)
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        finally:
+            f.close()
+            _restore_atime(path, stats)
+    except (PermissionError, FileNotFoundError, OSError, ValueError):
+        return path, None
+    
+    return path, digest.hexdigest()
+
+class DuplicateFinder:
+    
+    def __init__(self, scan_engine, max_processes: Optional[int] = None):
+        self.scan_engine = scan_engine
+        self.max_processes = max_processes or max(1, min(4, os.cpu_count() or 1))
+    
+    def find(self, roots: List[str], min_size_bytes: int = 1, should_descend=None, stop_event=None,
+             on_group: Optional[Callable[[Dict[str, any]], None]] = None,
+             make_group: Optional[Callable[[str, int, List[Tuple[str, os.stat_result]]], Dict[str, any]]] = None) -> List[Dict[str, any]]:
+        groups = []
+        
+        def confirm(digest, size, members):
+            group = make_group(digest, size, members) if make_group else {
+                'hash': digest, 'size': size, 'paths': [path for path, _ in members]
+            }
+            groups.append(group)
+            if on_group:
+                on_group(group)
+        
+        by_size = self._group_by_size(roots, max(1, min_size_bytes), should_descend, stop_event)
+        if self._stopped(stop_event):
+            return groups
+        
+        full_hash_groups = []
+        for (size, partial, complete), members in self._group_by_partial_hash(by_size, stop_event):
+            if complete:
+                confirm(partial, size, members)
+            else:
+                full_hash_groups.append((size, members))
+        
+        if full_hash_groups and not self._stopped(stop_event):
+            self._confirm_full_hashes(full_hash_groups, confirm, stop_event)
+        
+        groups.sort(key=lambda group: group['size'] * (len(group['paths']) - 1), reverse=True)
+        return groups
+    
+    def _group_by_size(self, roots, min_size_bytes, should_descend, stop_event) -> Dict[int, List[Tuple[str, os.stat_result]]]:
+        by_size = defaultdict(list)
+        seen_inodes = set()
+        lock = threading.Lock()
+        
+        def on_directory(path, files, subdirs):
+            with lock:
+                for file_path, file_stats in files:
+                    if file_stats.st_size < min_size_bytes:
+                        continue
+                    inode = (file_stats.st_dev, file_stats.st_ino)
+                    if file_stats.st_ino and inode in seen_inodes:
+                        continue
+                    seen_inodes.add(inode)
+                    by_size[file_stats.st_size].append((file_path, file_stats))
+        
+        self.scan_engine.scan(roots, on_directory, should_descend, stop_event)
+        
+        return {size: members for size, members in by_size.items() if len(members) > 1}
+    
+    def _group_by_partial_hash(self, by_size, stop_event):
+        candidates = [(size, member) for size, members in by_size.items() for member in members]
+        by_partial = defaultdict(list)
+        
+        def hash_member(candidate):
+            size, member = candidate
+            if self._stopped(stop_event):
+                return None
+            try:
+                return size, member, _hash_partial(member[0], size)
+            except (PermissionError, FileNotFoundError, OSError):
+                return None
+        
+        with ThreadPoolExecutor(max_workers=self.scan_engine.max_workers) as executor:
+            for hashed in executor.map(hash_member, candidates):
+                if hashed is not None:
+                    size, member, (partial, complete) = hashed
+                    by_partial[(size, partial, complete)].append(member)
+        
+        groups = [(key, members) for key, members in by_partial.items() if len(members) > 1]
+        groups.sort(key=lambda group: group[0][0] * (len(group[1]) - 1), reverse=True)
+        return groups
+    
+    def _confirm_full_hashes(self, full_hash_groups, confirm, stop_event):
+        context = multiprocessing.get_context('spawn')
+        
+        with ProcessPoolExecutor(max_workers=self.max_processes, mp_context=context) as executor:
+            futures = {}
+            remaining = {}
+            hashes = defaultdict(dict)
+            
+            for group_index, (size, members) in enumerate(full_hash_groups):
+                remaining[group_index] = len(members)
+                for member in members:
+                    futures[executor.submit(_hash_full, member[0])] = (group_index, member)
+            
+            for future in as_completed(futures):
+                if self._stopped(stop_event):
+                    for pending in futures:
+                        pending.cancel()
+                    return
+                
+                group_index, member = futures[future]
+                _, digest = future.result()
+                if digest is not None:
+                    hashes[group_index][member[0]] = (digest, member)
+                
+                remaining[group_index] -= 1
+                if remaining[group_index] > 0:
+                    continue
+                
+                size = full_hash_groups[group_index][0]
+                by_digest = defaultdict(list)
+                for digest, hashed_member in hashes.pop(group_index).values():
+                    by_digest[digest].append(hashed_member)
+                
+                for digest, members in by_digest.items():
+                    if len(members) > 1:
+                        confirm(digest, size, members)
+    
+    def _stopped(self, stop_event) -> bool:
+        return stop_event is not None and stop_event.is_set()
\ No newline at end of file
@@ -0,0 +1,163 @@
+import heapq
+import math
+import threading
+from collections import deque, defaultdict
+from typing import List, Dict, Optional, Tuple
+
+class EnergyAttribution:
+    
+    def __init__(self, cpu_watts: float = 8.0, io_joules_per_mb: float = 0.05, wakeup_joules: float = 0.0005,
+                 windows: Tuple[float, ...] = (60.0, 600.0), max_gap: float = 30.0):
+        self.cpu_watts = cpu_watts
+        self.io_joules_per_mb = io_joules_per_mb
+        self.wakeup_joules = wakeup_joules
+        self.windows = tuple(sorted(windows))
+        self.max_gap = max_gap
+        
+        self._ticks = {window: deque() for window in self.windows}
+        self._totals = {window: defaultdict(float) for window in self.windows}
+        self._system = {window: [0.0] * 5 for window in self.windows}
+        self._names = {}
+        self._latest = {}
+        self._residuals = deque()
+        self._last_timestamp = None
+        self._lock = threading.Lock()
+    
+    def update(self, snapshot, system_watts: Optional[float] = None) -> bool:
+        if system_watts is not None and (math.isnan(system_watts) or system_watts <= 0):
+            system_watts = None
+        
+        with self._lock:
+            previous, self._last_timestamp = self._last_timestamp, snapshot.timestamp
+            if previous is None or not snapshot.has_cpu_baseline:
+                return False
+            
+            elapsed = snapshot.timestamp - previous
+            if elapsed <= 0 or elapsed > self.max_gap:
+                return False
+            
+            costs = {}
+            latest = {}
+            for row in range(len(snapshot)):
+                cost = (snapshot.cpu_percent[row] / 100 * self.cpu_watts +
+                        snapshot.io_rate[row] / (1024 * 1024) * self.io_joules_per_mb +
+                        snapshot.wakeup_rate[row] * self.wakeup_joules)
+                if cost <= 0:
+                    continue
+                
+                key = (snapshot.pids[row], snapshot.create_times[row])
+                costs[key] = cost
+                self._names[key] = snapshot.names[row]
+                latest[key] = (snapshot.cpu_percent[row], snapshot.io_rate[row] / 1024, snapshot.wakeup_rate[row])
+            self._latest = latest
+            
+            modeled = sum(costs.values())
+            baseline = 0.0
+            if system_watts is not None:
+                idle = self._idle_watts(snapshot.timestamp, system_watts, modeled)
+                dynamic = max(0.0, system_watts - idle) if modeled > 0 else 0.0
+                scale = dynamic / modeled if modeled > 0 else 0.0
+                baseline = system_watts - dynamic
+            else:
+                scale = 1.0
+            
+            contributions = {key: cost * scale * elapsed for key, cost in costs.items() if scale > 0}
+            if system_watts is not None:
+                totals = (elapsed, elapsed, system_watts * elapsed, baseline * elapsed, 0.0)
+            else:
+                totals = (elapsed, 0.0, 0.0, 0.0, modeled * elapsed)
+            tick = (snapshot.timestamp, contributions, totals)
+            
+            for window in self.windows:
+                self._add(window, tick)
+                self._expire(window, snapshot.timestamp)
+            
+            live = set().union(*(self._totals[window].keys() for window in self.windows))
+            if len(self._names) > 2 * len(live) + 64:
+                self._names = {key: name for key, name in self._names.items() if key in live}
+            
+            return True
+    
+    def report(self, window: Optional[float] = None, limit: int = 15) -> Dict[str, any]:
+        window = window if window in self._ticks else self.windows[0]
+        
+        with self._lock:
+            duration, measured_seconds, measured_joules, baseline_joules, modeled_joules = self._system[window]
+            totals = self._totals[window]
+            attributed = sum(totals.values())
+            top = heapq.nlargest(limit, totals.items(), key=lambda item: item[1])
+            
+            consumers = []
+            for (pid, create_time), joules in top:
+                cpu_percent, io_kb_s, wakeups_s = self._latest.get((pid, create_time), (0.0, 0.0, 0.0))
+                consumers.append({
+                    'pid': pid,
+                    'name': self._names.get((pid, create_time), ""),
+                    'energy_j': joules,
+                    'watts': joules / duration if duration > 0 else 0.0,
+                    'share_percent': joules / attributed * 100 if attributed > 0 else 0.0,
+                    'cpu_percent': cpu_percent,
+                    'io_kb_s': io_kb_s,
+                    'wakeups_s': wakeups_s
+                })
+        
+        modeled_seconds = duration - measured_seconds
+        return {
+            'window_seconds': duration,
+            'measured_fraction': measured_seconds / duration if duration > 0 else 0.0,
+            'system_watts': measured_joules / measured_seconds if measured_seconds > 0 else None,
+            'baseline_watts': baseline_joules / measured_seconds if measured_seconds > 0 else None,
+            'modeled_watts': modeled_joules / modeled_seconds if modeled_seconds > 1e-9 else None,
+            'attributed_watts': attributed / duration if duration > 0 else None,
+            'consumers': consumers
+        }
+    
+    def clear(self):
+        with self._lock:
+            for window in self.windows:
+                self._ticks[window].clear()
+                self._totals[window].clear()
+                self._system[window] = [0.0] * 5
+            self._names.clear()
+            self._latest = {}
+            self._residuals.clear()
+            self._last_timestamp = None
+    
+    def _idle_watts(self, timestamp: float, system_watts: float, modeled: float) -> float:
+        self._residuals.append((timestamp, system_watts - modeled))
+        while self._residuals and self._residuals[0][0] <= timestamp - self.windows[-1]:
+            self._residuals.popleft()
+        
+        values = sorted(residual for _, residual in self._residuals)
+        return min(system_watts, max(0.0, values[len(values) // 2]))
+    
+    def _add(self, window: float, tick: Tuple):
+        _, contributions, tick_totals = tick
+        totals = self._totals[window]
+        for key, joules in contributions.items():
+            totals[key] += joules
+        
+        system = self._system[window]
+        for index, value in enumerate(tick_totals):
+            system[index] += value
+        self._ticks[window].append(tick)
+    
+    def _expire(self, window: float, now: float):
+        ticks = self._ticks[window]
+        totals = self._totals[window]
+        system = self._system[window]
+        
+        while ticks and ticks[0][0] <= now - window:
+            _, contributions, tick_totals = ticks.popleft()
+            for key, joules in contributions.items():
+                remaining = totals[key] - joules
+                if remaining <= 1e-9:
+                    del totals[key]
+                else:
+                    totals[key] = remaining
+            
+            for index, value in enumerate(tick_totals):
+                system[index] -= value
+        
+        if not ticks:
+            self._system[window] = [0.0] * 5
\ No newline at end of file
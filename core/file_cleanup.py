@@ -1,17 +1,29 @@
 import os
 import time
 import shutil
+import queue
+import sqlite3
 import datetime
 import threading
-from typing import List, Dict, Tuple, Optional, Callable
+from typing import List, Dict, Tuple, Optional, Callable, Iterator
 from platform.platform_detector import PlatformDetector
+from core.scan_engine import ScanEngine
+from core.scan_index import ScanIndex
+from core.file_watcher import FileWatcher
+from core.duplicate_finder import DuplicateFinder
+from core.directory_tree import DirectoryTree
+from core.top_k import TopK, GroupedTopK
 
 class FileCleanup:
     
-    def __init__(self):
+    def __init__(self, scan_workers: Optional[int] = None, index_path: Optional[str] = None):
         self.platform = PlatformDetector.get_platform()
         self.temp_dir = PlatformDetector.get_temp_directory()
         self.trash_dir = PlatformDetector.get_trash_directory()
+        self.scan_engine = ScanEngine(scan_workers)
+        self.scan_index = ScanIndex(index_path)
+        self.file_watcher = FileWatcher()
+        self.duplicate_finder = DuplicateFinder(self.scan_engine)
         
     def get_temp_files(self) -> List[Dict[str, any]]:
         temp_files = []
@@ -91,77 +103,272 @@ class FileCleanup:
         return trash_items
 
     def find_large_unused_files(self, search_paths: List[str], min_size_mb: float = 100,
-                              days_unused: int = 30, stop_event=None) -> List[Dict[str, any]]:
-        large_unused_files = []
+                              days_unused: int = 30, stop_event=None, max_results: int = 1000,
+                              group_by: Optional[str] = None, group_limit: int = 10) -> List[Dict[str, any]]:
         min_size_bytes = min_size_mb * 1024 * 1024
-        cutoff_time = time.time() - (days_unused * 24 * 60 * 60)
+        now = time.time()
+        cutoff_time = now - (days_unused * 24 * 60 * 60)
         
-        batch_size = 1000
-        processed_files = 0
-        total_files_found = 0
-        
-        skip_dirs = self._get_skip_directories()
+        if group_by == 'directory':
+            selector = GroupedTopK(group_limit, lambda x: x[1], lambda x: os.path.dirname(x[0]), max_results)
+        elif group_by == 'extension':
+            selector = GroupedTopK(group_limit, lambda x: x[1], lambda x: os.path.splitext(x[0])[1].lower(),
+                                   max_results)
+        else:
+            selector = TopK(max_results, lambda x: x[1])
+        results_lock = threading.Lock()
         
-        for search_path in search_paths:
-            if not os.path.exists(search_path) or not os.path.isdir(search_path):
-                continue
+        def on_directory(root, files, subdirs):
+            matches = []
+            
+            for file_path, file_stats in files:
+                file_size = file_stats.st_size
                 
-            try:
-                for root, dirs, files in os.walk(search_path, topdown=True):
-                    if stop_event and stop_event.is_set():
-                        return large_unused_files
-                    
-                    dirs[:] = [d for d in dirs if os.path.join(root, d) not in skip_dirs and 
-                              not self._should_skip_directory(d)]
+                if file_size >= min_size_bytes:
+                    last_access = file_stats.st_atime
                     
-                    for file in files:
-                        processed_files += 1
-                        
-                        if stop_event and stop_event.is_set():
-                            return large_unused_files
-                            
-                        if processed_files % 100 == 0:
-                            time.sleep(0.001)
-                            
-                        try:
-                            file_path = os.path.join(root, file)
-                            
-                            if not os.path.isfile(file_path):
-                                continue
-                                
-                            try:
-                                file_stats = os.stat(file_path)
-                                file_size = file_stats.st_size
-                                
-                                if file_size >= min_size_bytes:
-                                    last_access = file_stats.st_atime
-                                    
-                                    if last_access <= cutoff_time:
-                                        large_unused_files.append({
-                                            'path': file_path,
-                                            'size': file_size,
-                                            'size_formatted': self._format_size(file_size),
-                                            'last_access': last_access,
-                                            'last_access_formatted': datetime.datetime.fromtimestamp(last_access).strftime('%Y-%m-%d %H:%M:%S'),
-                                            'days_unused': int((time.time() - last_access) / (24 * 60 * 60))
-                                        })
-                                        total_files_found += 1
-                                        
-                                        if len(large_unused_files) >= batch_size:
-                                            large_unused_files.sort(key=lambda x: x['size'], reverse=True)
-                                            if len(large_unused_files) > 1000:
-                                                large_unused_files = large_unused_files[:1000]
-                            except (PermissionError, FileNotFoundError, OSError):
-                                continue
-                                
-                        except (PermissionError, FileNotFoundError, OSError):
-                            continue
-                            
-            except (PermissionError, OSError):
-                continue
+                    if last_access <= cutoff_time:
+                        matches.append((file_path, file_size, last_access))
+            
+            if not matches:
+                return
+            
+            with results_lock:
+                selector.extend(matches)
+        
+        roots = self._get_scan_roots(search_paths)
+        
+        try:
+            self.scan_engine.scan(roots, on_directory, self._get_scan_filter(), stop_event)
+        except Exception as e:
+            print(f"Error scanning {', '.join(roots)}: {e}")
+        
+        if group_by in ('directory', 'extension'):
+            top = TopK(max_results, lambda x: x[1])
+            for group_items in selector.items().values():
+                top.extend(group_items)
+            selector = top
+        
+        return [self._large_file_entry(file_path, file_size, last_access, now)
+                for file_path, file_size, last_access in selector.items()]
+    
+    def update_scan_index(self, search_paths: List[str], stop_event=None) -> Dict[str, int]:
+        roots = self._get_scan_roots(search_paths)
+        return self.scan_index.refresh(self.scan_engine, roots, self._get_scan_filter(), stop_event)
+    
+    def query_large_unused_files(self, search_paths: List[str], min_size_mb: float = 100,
+                                 days_unused: int = 30) -> List[Dict[str, any]]:
+        now = time.time()
+        rows = self.scan_index.query_large_files(
+            self._get_scan_roots(search_paths),
+            min_size_mb * 1024 * 1024,
+            now - (days_unused * 24 * 60 * 60)
+        )
         
-        large_unused_files.sort(key=lambda x: x['size'], reverse=True)
-        return large_unused_files
+        return [self._large_file_entry(path, size, last_access, now) for path, size, last_access in rows]
+    
+    def find_large_unused_files_incremental(self, search_paths: List[str], min_size_mb: float = 100,
+                                            days_unused: int = 30, stop_event=None) -> List[Dict[str, any]]:
+        try:
+            self.update_scan_index(search_paths, stop_event)
+            return self.query_large_unused_files(search_paths, min_size_mb, days_unused)
+        except sqlite3.Error as e:
+            print(f"Scan index unavailable, falling back to a full scan: {e}")
+            return self.find_large_unused_files(search_paths, min_size_mb, days_unused, stop_event)
+    
+    def iter_large_unused_files(self, search_paths: List[str], min_size_mb: float = 100, days_unused: int = 30,
+                                stop_event=None, use_index: bool = True,
+                                batch_interval: float = 0.25) -> Iterator[Dict[str, any]]:
+        roots = self._get_scan_roots(search_paths)
+        min_size_bytes = min_size_mb * 1024 * 1024
+        now = time.time()
+        cutoff_time = now - (days_unused * 24 * 60 * 60)
+        
+        pending = queue.Queue()
+        stats = {}
+        found = TopK(1000, lambda x: x['size'])
+        outcome = {'error': None}
+        
+        def on_directory(root, files, subdirs):
+            matches = [self._large_file_entry(file_path, file_stats.st_size, file_stats.st_atime, now)
+                       for file_path, file_stats in files
+                       if file_stats.st_size >= min_size_bytes and file_stats.st_atime <= cutoff_time]
+            if matches:
+                pending.put(matches)
+        
+        def run():
+            try:
+                if use_index:
+                    self.scan_index.refresh(self.scan_engine, roots, self._get_scan_filter(), stop_event,
+                                            on_directory, stats)
+                else:
+                    self.scan_engine.scan(roots, on_directory, self._get_scan_filter(), stop_event, stats=stats)
+            except Exception as e:
+                outcome['error'] = e
+            finally:
+                pending.put(None)
+        
+        threading.Thread(target=run, name="LargeFileScan", daemon=True).start()
+        
+        finished = False
+        while not finished:
+            batch = []
+            deadline = time.time() + batch_interval
+            
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = pending.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    finished = True
+                    break
+                batch.extend(item)
+            
+            if not use_index:
+                found.extend(batch)
+            yield self._scan_progress(batch, stats)
+        
+        error = outcome['error']
+        if use_index and isinstance(error, sqlite3.Error):
+            print(f"Scan index unavailable, falling back to a full scan: {error}")
+            yield from self.iter_large_unused_files(search_paths, min_size_mb, days_unused, stop_event,
+                                                    use_index=False, batch_interval=batch_interval)
+            return
+        
+        if error is not None:
+            print(f"Error scanning {', '.join(roots)}: {error}")
+        
+        if use_index and error is None:
+            final_results = self.query_large_unused_files(search_paths, min_size_mb, days_unused)
+        else:
+            final_results = found.items()
+        
+        final_chunk = self._scan_progress(final_results, stats)
+        final_chunk['replace'] = True
+        final_chunk['indexed'] = use_index and error is None and not (stop_event and stop_event.is_set())
+        yield final_chunk
+    
+    def _scan_progress(self, results: List[Dict[str, any]], stats: Dict[str, int]) -> Dict[str, any]:
+        return {
+            'results': results,
+            'dirs': stats.get('dirs', 0),
+            'files': stats.get('files', 0),
+            'bytes': stats.get('bytes', 0)
+        }
+    
+    def _get_scan_roots(self, search_paths: List[str]) -> List[str]:
+        return [os.path.abspath(path) for path in search_paths if os.path.exists(path) and os.path.isdir(path)]
+    
+    def _get_scan_filter(self) -> Callable[[str, str], bool]:
+        skip_dirs = set(self._get_skip_directories())
+        
+        def should_descend(path, name):
+            return path not in skip_dirs and not self._should_skip_directory(name)
+        
+        return should_descend
+    
+    def find_duplicate_files(self, search_paths: List[str], min_size_mb: float = 1, stop_event=None,
+                             on_group: Optional[Callable[[Dict[str, any]], None]] = None) -> List[Dict[str, any]]:
+        def make_group(digest, size, members):
+            files = [self._file_entry(path, file_stats.st_size, file_stats.st_atime) for path, file_stats in members]
+            files.sort(key=lambda x: x['last_access'], reverse=True)
+            
+            for file_info in files:
+                file_info['group'] = digest
+            
+            return {
+                'hash': digest,
+                'size': size,
+                'size_formatted': self._format_size(size),
+                'paths': [file_info['path'] for file_info in files],
+                'files': files,
+                'reclaimable': size * (len(files) - 1),
+                'reclaimable_formatted': self._format_size(size * (len(files) - 1))
+            }
+        
+        try:
+            return self.duplicate_finder.find(
+                self._get_scan_roots(search_paths), int(min_size_mb * 1024 * 1024),
+                self._get_scan_filter(), stop_event, on_group, make_group
+            )
+        except Exception as e:
+            print(f"Error finding duplicate files: {e}")
+            return []
+    
+    def build_directory_tree(self, search_path: str, stop_event=None) -> Optional[DirectoryTree]:
+        if not os.path.isdir(search_path):
+            return None
+        
+        pseudo_dirs = set()
+        if self.platform in [PlatformDetector.LINUX, PlatformDetector.MAC]:
+            pseudo_dirs = {'/proc', '/sys', '/dev', '/run'}
+        
+        try:
+            return DirectoryTree(search_path).build(
+                self.scan_engine, lambda path, name: path not in pseudo_dirs, stop_event
+            )
+        except Exception as e:
+            print(f"Error building directory tree for {search_path}: {e}")
+            return None
+    
+    def watch_results(self, category: str, results: List[Dict[str, any]], search_paths: Optional[List[str]] = None,
+                      min_size_mb: float = 100, days_unused: int = 30) -> bool:
+        if category == 'temp':
+            return self.file_watcher.track(
+                category, [self.temp_dir], results,
+                lambda path, file_stats: self._file_entry(path, file_stats.st_size, file_stats.st_atime)
+            )
+        
+        if category == 'trash':
+            trash_root = os.path.join(self.trash_dir, "files") if self.platform == PlatformDetector.LINUX else self.trash_dir
+            return self.file_watcher.track(
+                category, [trash_root], results,
+                lambda path, file_stats: self._file_entry(path, file_stats.st_size, file_stats.st_atime)
+            )
+        
+        if category == 'large':
+            roots = self._get_scan_roots(search_paths or [])
+            min_size_bytes = min_size_mb * 1024 * 1024
+            
+            def matcher(path, file_stats):
+                now = time.time()
+                if (file_stats.st_size >= min_size_bytes and
+                        file_stats.st_atime <= now - (days_unused * 24 * 60 * 60)):
+                    return self._large_file_entry(path, file_stats.st_size, file_stats.st_atime, now)
+                return None
+            
+            return self.file_watcher.track(
+                category, roots, results, matcher, self._get_scan_filter(),
+                key=(tuple(roots), min_size_mb, days_unused),
+                sort_key=lambda x: x['size'], limit=1000
+            )
+        
+        return False
+    
+    def get_watched_results(self, category: str, search_paths: Optional[List[str]] = None,
+                            min_size_mb: float = 100, days_unused: int = 30) -> Optional[List[Dict[str, any]]]:
+        key = None
+        if category == 'large':
+            key = (tuple(self._get_scan_roots(search_paths or [])), min_size_mb, days_unused)
+        return self.file_watcher.get_results(category, key)
+    
+    def _file_entry(self, file_path: str, file_size: int, last_access: float) -> Dict[str, any]:
+        return {
+            'path': file_path,
+            'size': file_size,
+            'size_formatted': self._format_size(file_size),
+            'last_access': last_access,
+            'last_access_formatted': datetime.datetime.fromtimestamp(last_access).strftime('%Y-%m-%d %H:%M:%S')
+        }
+    
+    def _large_file_entry(self, file_path: str, file_size: int, last_access: float, now: float) -> Dict[str, any]:
+        entry = self._file_entry(file_path, file_size, last_access)
+        entry['days_unused'] = int((now - last_access) / (24 * 60 * 60))
+        return entry
 
     def _get_skip_directories(self) -> List[str]:
         skip_dirs = []
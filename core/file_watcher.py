@@ -0,0 +1,438 @@
+import os
+import stat
+import time
+import errno
+import ctypes
+import ctypes.util
+import select
+import struct
+import threading
+from collections import deque
+from typing import List, Dict, Optional, Callable, Any
+from platform.platform_detector import PlatformDetector
+
+class FileWatcher:
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    
+    WATCH_MASK = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+                  IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR)
+    EVENT_HEADER = struct.Struct('iIII')
+    
+    def __init__(self, max_watches: Optional[int] = None, rescan_interval: float = 300.0,
+                 on_change: Optional[Callable[[str], None]] = None):
+        self.platform = PlatformDetector.get_platform()
+        self.max_watches = max_watches if max_watches is not None else self._get_default_watch_budget()
+        self.rescan_interval = rescan_interval
+        self.on_change = on_change
+        
+        self._libc = None
+        self._fd = -1
+        self._lock = threading.RLock()
+        self._categories = {}
+        self._watches = {}
+        self._watched_dirs = {}
+        self._polled_dirs = {}
+        self._pending = deque()
+        self._changed = set()
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._last_rescan = time.time()
+    
+    def is_supported(self) -> bool:
+        return self.platform == PlatformDetector.LINUX and self._load_libc() is not None
+    
+    def track(self, category: str, roots: List[str], entries: List[Dict[str, Any]],
+              matcher: Callable[[str, os.stat_result], Optional[Dict[str, Any]]],
+              should_descend: Optional[Callable[[str, str], bool]] = None, key: Any = None,
+              sort_key: Optional[Callable[[Dict[str, Any]], Any]] = None, limit: Optional[int] = None) -> bool:
+        if not self.is_supported() or not self._ensure_started():
+            return False
+        
+        roots = [os.path.abspath(root) for root in roots if root and os.path.isdir(root)]
+        
+        with self._lock:
+            self._categories[category] = {
+                'roots': roots,
+                'key': key,
+                'matcher': matcher,
+                'should_descend': should_descend,
+                'sort_key': sort_key,
+                'limit': limit,
+                'results': {entry['path']: entry for entry in entries}
+            }
+        
+        self._pending.append(('prune', None))
+        for root in roots:
+            self._pending.append(('register', root))
+        
+        return True
+    
+    def untrack(self, category: str):
+        with self._lock:
+            self._categories.pop(category, None)
+        self._pending.append(('prune', None))
+    
+    def get_results(self, category: str, key: Any = None) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            tracked = self._categories.get(category)
+            if tracked is None or tracked['key'] != key:
+                return None
+            paths = list(tracked['results'])
+        
+        for path in paths:
+            self._reconcile_file(path)
+        
+        with self._lock:
+            if self._categories.get(category) is not tracked:
+                return None
+            results = list(tracked['results'].values())
+        
+        if tracked['sort_key'] is not None:
+            results.sort(key=tracked['sort_key'], reverse=True)
+        if tracked['limit'] is not None:
+            results = results[:tracked['limit']]
+        return results
+    
+    def get_watch_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {'watched': len(self._watched_dirs), 'polled': len(self._polled_dirs)}
+    
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(2)
+            self._thread = None
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        with self._lock:
+            self._watches.clear()
+            self._watched_dirs.clear()
+            self._polled_dirs.clear()
+    
+    def _load_libc(self):
+        if self._libc is None:
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+                libc.inotify_init1.argtypes = [ctypes.c_int]
+                libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+                libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+                self._libc = libc
+            except (OSError, AttributeError):
+                return None
+        return self._libc
+    
+    def _ensure_started(self) -> bool:
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        
+        fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if fd < 0:
+            print(f"Error initializing inotify: {os.strerror(ctypes.get_errno())}")
+            return False
+        
+        self._fd = fd
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="FileWatcher", daemon=True)
+        self._thread.start()
+        return True
+    
+    def _get_default_watch_budget(self) -> int:
+        try:
+            with open("/proc/sys/fs/inotify/max_user_watches", 'r') as f:
+                return min(8192, int(f.read().strip()) // 2)
+        except (OSError, ValueError):
+            return 4096
+    
+    def _run(self):
+        poller = select.poll()
+        poller.register(self._fd, select.POLLIN)
+        
+        while not self._stop_event.is_set():
+            try:
+                while self._pending:
+                    action, path = self._pending.popleft()
+                    if action == 'register':
+                        self._register_directory(path, reconcile=False)
+                    elif action == 'prune':
+                        self._prune_watches()
+                
+                if poller.poll(500):
+                    self._read_events()
+                
+                if time.time() - self._last_rescan >= self.rescan_interval:
+                    self._rescan()
+                    self._last_rescan = time.time()
+            except Exception as e:
+                print(f"Error in file watcher: {e}")
+            
+            self._notify_changes()
+    
+    def _notify_changes(self):
+        with self._lock:
+            changed = list(self._changed)
+            self._changed.clear()
+        
+        if self.on_change:
+            for category in changed:
+                try:
+                    self.on_change(category)
+                except Exception as e:
+                    print(f"Error notifying file watcher listener: {e}")
+    
+    def _read_events(self):
+        try:
+            data = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return
+        
+        offset = 0
+        header_size = self.EVENT_HEADER.size
+        
+        while offset + header_size <= len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + header_size:offset + header_size + length].split(b'\0', 1)[0]
+            offset += header_size + length
+            self._handle_event(wd, mask, os.fsdecode(name))
+    
+    def _handle_event(self, wd: int, mask: int, name: str):
+        if mask & self.IN_Q_OVERFLOW:
+            with self._lock:
+                directories = list(self._watched_dirs)
+            self._reconcile_directories(directories)
+            return
+        
+        with self._lock:
+            directory = self._watches.get(wd)
+        
+        if directory is None:
+            return
+        
+        if mask & self.IN_IGNORED:
+            with self._lock:
+                self._watches.pop(wd, None)
+                if self._watched_dirs.get(directory) == wd:
+                    del self._watched_dirs[directory]
+            return
+        
+        if mask & self.IN_DELETE_SELF or not name:
+            return
+        
+        path = os.path.join(directory, name)
+        
+        if mask & self.IN_ISDIR:
+            if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                self._register_directory(path, reconcile=True)
+            elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                self._drop_subtree(path)
+        else:
+            self._reconcile_file(path)
+    
+    def _register_directory(self, root: str, reconcile: bool):
+        stack = [root]
+        
+        while stack:
+            directory = stack.pop()
+            
+            with self._lock:
+                in_scope = any(self._directory_in_scope(tracked, directory) for tracked in self._categories.values())
+                known = directory in self._watched_dirs or directory in self._polled_dirs
+            
+            if not in_scope:
+                continue
+            
+            if not known:
+                self._add_directory(directory)
+            
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif reconcile and entry.is_file():
+                                self._reconcile_file(entry.path, entry.stat())
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+    
+    def _add_directory(self, directory: str):
+        with self._lock:
+            if len(self._watched_dirs) < self.max_watches:
+                wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.WATCH_MASK)
+                if wd >= 0:
+                    self._watches[wd] = directory
+                    self._watched_dirs[directory] = wd
+                    return
+                
+                error = ctypes.get_errno()
+                if error == errno.ENOSPC:
+                    self.max_watches = len(self._watched_dirs)
+                elif error in (errno.ENOENT, errno.ENOTDIR):
+                    return
+            
+            try:
+                self._polled_dirs[directory] = os.stat(directory).st_mtime_ns
+            except OSError:
+                pass
+    
+    def _remove_directory(self, directory: str):
+        wd = self._watched_dirs.pop(directory, None)
+        if wd is not None:
+            self._watches.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+        self._polled_dirs.pop(directory, None)
+    
+    def _prune_watches(self):
+        with self._lock:
+            for directory in list(self._watched_dirs) + list(self._polled_dirs):
+                if not any(self._directory_in_scope(tracked, directory) for tracked in self._categories.values()):
+                    self._remove_directory(directory)
+    
+    def _drop_subtree(self, path: str):
+        prefix = path + os.sep
+        
+        with self._lock:
+            for directory in list(self._watched_dirs) + list(self._polled_dirs):
+                if directory == path or directory.startswith(prefix):
+                    self._remove_directory(directory)
+            
+            for category, tracked in self._categories.items():
+                results = tracked['results']
+                stale = [file_path for file_path in results if file_path.startswith(prefix)]
+                for file_path in stale:
+                    del results[file_path]
+                if stale:
+                    self._changed.add(category)
+    
+    def _reconcile_file(self, path: str, file_stats: Optional[os.stat_result] = None):
+        if file_stats is None:
+            try:
+                file_stats = os.stat(path)
+                if not stat.S_ISREG(file_stats.st_mode):
+                    file_stats = None
+            except OSError:
+                file_stats = None
+        
+        directory = os.path.dirname(path)
+        
+        with self._lock:
+            for category, tracked in self._categories.items():
+                if not self._directory_in_scope(tracked, directory):
+                    continue
+                
+                results = tracked['results']
+                entry = tracked['matcher'](path, file_stats) if file_stats is not None else None
+                
+                if entry is None:
+                    if results.pop(path, None) is not None:
+                        self._changed.add(category)
+                elif results.get(path) != entry:
+                    results[path] = entry
+                    self._changed.add(category)
+    
+    def _reconcile_directories(self, directories: List[str]):
+        rescanned = set()
+        present = set()
+        
+        for directory in directories:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                with self._lock:
+                                    known = entry.path in self._watched_dirs or entry.path in self._polled_dirs
+                                if not known:
+                                    self._register_directory(entry.path, reconcile=True)
+                            elif entry.is_file():
+                                present.add(entry.path)
+                                self._reconcile_file(entry.path, entry.stat())
+                        except OSError:
+                            continue
+                rescanned.add(directory)
+            except OSError:
+                self._drop_subtree(directory)
+        
+        with self._lock:
+            for category, tracked in self._categories.items():
+                results = tracked['results']
+                stale = [path for path in results
+                         if path not in present and os.path.dirname(path) in rescanned]
+                for path in stale:
+                    del results[path]
+                if stale:
+                    self._changed.add(category)
+    
+    def _rescan(self):
+        changed_dirs = []
+        
+        with self._lock:
+            polled = list(self._polled_dirs.items())
+        
+        for directory, mtime_ns in polled:
+            try:
+                current_mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                self._drop_subtree(directory)
+                continue
+            
+            if current_mtime != mtime_ns:
+                changed_dirs.append(directory)
+                with self._lock:
+                    if directory in self._polled_dirs:
+                        self._polled_dirs[directory] = current_mtime
+        
+        if changed_dirs:
+            self._reconcile_directories(changed_dirs)
+        
+        with self._lock:
+            tracked_paths = [path for tracked in self._categories.values() for path in tracked['results']]
+        
+        for path in tracked_paths:
+            self._reconcile_file(path)
+        
+        with self._lock:
+            promotable = [directory for directory, _ in polled if directory in self._polled_dirs]
+            free_watches = self.max_watches - len(self._watched_dirs)
+        
+        for directory in promotable[:max(0, free_watches)]:
+            with self._lock:
+                self._polled_dirs.pop(directory, None)
+            self._add_directory(directory)
+    
+    def _directory_in_scope(self, tracked: Dict[str, Any], directory: str) -> bool:
+        should_descend = tracked['should_descend']
+        
+        for root in tracked['roots']:
+            if directory == root:
+                return True
+            
+            if not directory.startswith(root.rstrip(os.sep) + os.sep):
+                continue
+            
+            if should_descend is None:
+                return True
+            
+            current = root
+            for part in directory[len(root):].strip(os.sep).split(os.sep):
+                current = os.path.join(current, part)
+                if not should_descend(current, part):
+                    break
+            else:
+                return True
+        
+        return False
\ No newline at end of file
@@ -0,0 +1,86 @@
+import os
+import time
+import threading
+from typing import Optional, Tuple, Iterable
+import psutil
+
+class MemoryAccounting:
+    
+    def __init__(self, proc_root: Optional[str] = "/proc", ttl: float = 30.0, top_n: int = 25):
+        self.ttl = ttl
+        self.top_n = top_n
+        self.proc_root = proc_root
+        self.use_rollup = bool(proc_root) and os.path.exists(os.path.join(proc_root, "self", "smaps_rollup"))
+        self._cache = {}
+        self._lock = threading.Lock()
+    
+    def refresh(self, snapshot, pids: Iterable[int] = (), top_n: Optional[int] = None):
+        top_n = self.top_n if top_n is None else top_n
+        rows = set(sorted(range(len(snapshot)), key=snapshot.rss.__getitem__, reverse=True)[:top_n])
+        for pid in pids:
+            row = snapshot.row(pid)
+            if row is not None:
+                rows.add(row)
+        
+        now = time.monotonic()
+        with self._lock:
+            for pid in [pid for pid in self._cache if snapshot.row(pid) is None]:
+                del self._cache[pid]
+            
+            for row in rows:
+                pid = snapshot.pids[row]
+                cached = self._cache.get(pid)
+                if cached and cached[0] == snapshot.create_times[row] and cached[1] > now:
+                    continue
+                
+                usage = self.read(pid)
+                pss, uss = usage if usage else (-1, -1)
+                self._cache[pid] = (snapshot.create_times[row], now + self.ttl, pss, uss)
+        
+        self.apply(snapshot)
+    
+    def apply(self, snapshot):
+        with self._lock:
+            for pid, (create_time, _, pss, uss) in self._cache.items():
+                row = snapshot.row(pid)
+                if row is not None and snapshot.create_times[row] == create_time:
+                    snapshot.pss[row] = pss
+                    snapshot.uss[row] = uss
+    
+    def read(self, pid: int) -> Optional[Tuple[int, int]]:
+        if self.use_rollup:
+            return self._read_rollup(pid)
+        
+        try:
+            memory = psutil.Process(pid).memory_full_info()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+        except Exception as e:
+            print(f"Error reading memory usage of PID {pid}: {e}")
+            return None
+        
+        uss = getattr(memory, 'uss', None)
+        if uss is None:
+            return None
+        return getattr(memory, 'pss', uss), uss
+    
+    def _read_rollup(self, pid: int) -> Optional[Tuple[int, int]]:
+        try:
+            with open(os.path.join(self.proc_root, str(pid), "smaps_rollup"), 'rb') as f:
+                content = f.read()
+        except OSError:
+            return None
+        
+        fields = {}
+        for line in content.splitlines()[1:]:
+            parts = line.split()
+            if len(parts) >= 2:
+                fields[parts[0]] = int(parts[1]) * 1024
+        
+        if b"Pss:" not in fields:
+            return None
+        return fields[b"Pss:"], fields.get(b"Private_Clean:", 0) + fields.get(b"Private_Dirty:", 0)
+    
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
\ No newline at end of file
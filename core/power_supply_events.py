@@ -0,0 +1,241 @@
+import os
+import queue
+import select
+import socket
+import threading
+import time
+from typing import List, Dict, Callable, Optional
+
+from core.sysfs_battery import SysfsBatteryReader
+
+NETLINK_KOBJECT_UEVENT = 15
+KERNEL_UEVENT_GROUP = 1
+
+def parse_uevent(data: bytes) -> Optional[Dict[str, str]]:
+    parts = data.split(b'\0')
+    if not parts or b'@' not in parts[0] or parts[0].startswith(b'libudev'):
+        return None
+    
+    event = {}
+    for part in parts[1:]:
+        key, sep, value = part.partition(b'=')
+        if sep:
+            event[key.decode('utf-8', 'replace')] = value.decode('utf-8', 'replace')
+    
+    if 'ACTION' not in event:
+        event['ACTION'] = parts[0].split(b'@', 1)[0].decode('utf-8', 'replace')
+    return event
+
+class NetlinkUeventSource:
+    
+    def __init__(self, buffer_size: int = 65536):
+        self.buffer_size = buffer_size
+        self._socket = None
+        self._wake_read, self._wake_write = None, None
+    
+    @staticmethod
+    def is_supported() -> bool:
+        return hasattr(socket, 'AF_NETLINK')
+    
+    def open(self) -> bool:
+        if not self.is_supported():
+            return False
+        
+        try:
+            self._socket = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_KOBJECT_UEVENT)
+            self._socket.bind((0, KERNEL_UEVENT_GROUP))
+            self._socket.setblocking(False)
+            self._wake_read, self._wake_write = os.pipe()
+            return True
+        except OSError as e:
+            print(f"Error subscribing to power supply events: {e}")
+            self.close()
+            return False
+    
+    def receive(self, timeout: Optional[float]) -> List[Dict[str, str]]:
+        if self._socket is None:
+            return []
+        
+        ready, _, _ = select.select([self._socket, self._wake_read], [], [], timeout)
+        if self._wake_read in ready:
+            os.read(self._wake_read, 64)
+        
+        events = []
+        while self._socket in ready:
+            try:
+                data = self._socket.recv(self.buffer_size)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                print(f"Error reading power supply events: {e}")
+                break
+            
+            event = parse_uevent(data)
+            if event is not None and event.get('SUBSYSTEM') == 'power_supply':
+                events.append(event)
+        return events
+    
+    def wake(self):
+        if self._wake_write is not None:
+            os.write(self._wake_write, b'\0')
+    
+    def close(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        for fd in (self._wake_read, self._wake_write):
+            if fd is not None:
+                os.close(fd)
+        self._wake_read, self._wake_write = None, None
+
+class QueueEventSource:
+    
+    def __init__(self):
+        self._queue = queue.Queue()
+    
+    def open(self) -> bool:
+        return True
+    
+    def inject(self, event: Dict[str, str]):
+        event = dict(event)
+        event.setdefault('ACTION', 'change')
+        event.setdefault('SUBSYSTEM', 'power_supply')
+        self._queue.put(event)
+    
+    def receive(self, timeout: Optional[float]) -> List[Dict[str, str]]:
+        try:
+            events = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return [event for event in events if event is not None and event.get('SUBSYSTEM') == 'power_supply']
+    
+    def wake(self):
+        self._queue.put(None)
+    
+    def close(self):
+        pass
+
+class PowerSupplyListener:
+    FIELDS = ('online', 'status', 'capacity')
+    
+    def __init__(self, reader: Optional[SysfsBatteryReader] = None,
+                 on_change: Optional[Callable[[Dict[str, any]], None]] = None,
+                 source=None, safety_interval: float = 60.0):
+        self.reader = reader if reader is not None else SysfsBatteryReader()
+        self.on_change = on_change
+        self.source = source if source is not None else NetlinkUeventSource()
+        self.safety_interval = safety_interval
+        
+        self._states = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+    
+    def start(self) -> bool:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return True
+            if not self.source.open():
+                return False
+            
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="PowerSupplyListener", daemon=True)
+            self._thread.start()
+            return True
+    
+    def stop(self):
+        self._stop_event.set()
+        self.source.wake()
+        if self._thread is not None:
+            self._thread.join(2)
+            self._thread = None
+        self.source.close()
+    
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def poll(self) -> List[Dict[str, any]]:
+        changes = []
+        supply_dirs = self.reader.supplies("Battery") + self.reader.supplies("Mains")
+        
+        for supply_dir in supply_dirs:
+            change = self._update(os.path.basename(supply_dir), self._read_state(supply_dir), 'poll')
+            if change:
+                changes.append(change)
+        
+        names = {os.path.basename(supply_dir) for supply_dir in supply_dirs}
+        for name in [name for name in self._states if name not in names]:
+            changes.append(self._remove(name))
+        
+        return changes
+    
+    def handle_event(self, event: Dict[str, str]) -> Optional[Dict[str, any]]:
+        name = event.get('POWER_SUPPLY_NAME') or os.path.basename(event.get('DEVPATH', ''))
+        if not name:
+            return None
+        
+        action = event.get('ACTION', 'change')
+        if action in ('add', 'remove'):
+            self.reader.rediscover()
+        if action == 'remove':
+            return self._remove(name) if name in self._states else None
+        
+        supply_dir = os.path.join(self.reader.root, name)
+        if supply_dir not in self.reader.supplies("Battery") + self.reader.supplies("Mains"):
+            return None
+        
+        state = self._read_state(supply_dir)
+        for field in self.FIELDS:
+            value = event.get(f"POWER_SUPPLY_{field.upper()}")
+            if value is not None:
+                state[field] = int(value) if value.lstrip('-').isdigit() else value
+        
+        return self._update(name, state, action)
+    
+    def _run(self):
+        self.poll()
+        next_poll = time.monotonic() + self.safety_interval
+        
+        while not self._stop_event.is_set():
+            try:
+                events = self.source.receive(max(0.0, next_poll - time.monotonic()))
+                for event in events:
+                    self._notify(self.handle_event(event))
+                
+                if time.monotonic() >= next_poll:
+                    for change in self.poll():
+                        self._notify(change)
+                    next_poll = time.monotonic() + self.safety_interval
+            except Exception as e:
+                print(f"Error handling power supply events: {e}")
+                self._stop_event.wait(1)
+    
+    def _read_state(self, supply_dir: str) -> Dict[str, any]:
+        return self.reader.read_many(supply_dir, list(self.FIELDS) + ['type'])
+    
+    def _update(self, name: str, state: Dict[str, any], reason: str) -> Optional[Dict[str, any]]:
+        previous = self._states.get(name)
+        changed = [field for field in self.FIELDS
+                   if state.get(field) is not None and (previous is None or previous.get(field) != state[field])]
+        
+        if previous is not None:
+            state = {**previous, **{key: value for key, value in state.items() if value is not None}}
+        self._states[name] = state
+        
+        if not changed or (previous is None and reason != 'add'):
+            return None
+        return {'supply': name, 'reason': reason, 'changed': changed, **state}
+    
+    def _remove(self, name: str) -> Dict[str, any]:
+        state = self._states.pop(name, {})
+        return {'supply': name, 'reason': 'remove', 'changed': [], **state}
+    
+    def _notify(self, change: Optional[Dict[str, any]]):
+        if change is not None and self.on_change is not None:
+            self.on_change(change)
\ No newline at end of file
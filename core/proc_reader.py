@@ -0,0 +1,224 @@
+import os
+import sys
+import time
+import tempfile
+from typing import Dict, Optional, Callable, Tuple, Iterable
+from platform.platform_detector import PlatformDetector
+from core.process_snapshot import ProcessSnapshot
+
+class ProcReader:
+    STATUS_NAMES = {
+        'R': 'running', 'S': 'sleeping', 'D': 'disk-sleep', 'Z': 'zombie',
+        'T': 'stopped', 't': 'tracing-stop', 'X': 'dead', 'x': 'dead',
+        'K': 'wake-kill', 'W': 'waking', 'P': 'parked', 'I': 'idle'
+    }
+    
+    def __init__(self, proc_root: str = "/proc", buffer_size: int = 4096):
+        self.proc_root = proc_root
+        self.clock_ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+        self.page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+        self.boot_time = self._read_boot_time()
+        self._buffer = bytearray(buffer_size)
+        self._io_denied = set()
+        self._full_names = {}
+    
+    @staticmethod
+    def is_supported(proc_root: str = "/proc") -> bool:
+        return (PlatformDetector.get_platform() == PlatformDetector.LINUX and
+                os.path.exists(os.path.join(proc_root, "self", "stat")))
+    
+    def read_snapshot(self, username: Callable[[int], Optional[str]],
+                      is_system: Callable[[int, str], bool]) -> ProcessSnapshot:
+        snapshot = ProcessSnapshot()
+        root = self.proc_root.encode()
+        
+        for entry in os.listdir(root):
+            if not entry.isdigit():
+                continue
+            
+            pid = int(entry)
+            base = root + b"/" + entry
+            
+            stat, uid = self._read(base + b"/stat", True)
+            if stat is None:
+                continue
+            
+            close = stat.rfind(b")")
+            name = stat[stat.find(b"(") + 1:close].decode('utf-8', 'replace')
+            fields = stat[close + 2:].split(None, 22)
+            if len(fields) < 22:
+                continue
+            
+            start_ticks = int(fields[19])
+            if len(name) == 15:
+                name = self._full_name(base, pid, start_ticks, name)
+            user = username(uid)
+            read_bytes, write_bytes, syscalls = self._read_io(base, pid, start_ticks)
+            
+            snapshot.append(
+                pid,
+                name,
+                user if user else "Unknown",
+                self.STATUS_NAMES.get(fields[0].decode(), "Unknown"),
+                (int(fields[11]) + int(fields[12])) / self.clock_ticks,
+                int(fields[21]) * self.page_size,
+                self.boot_time + start_ticks / self.clock_ticks,
+                is_system(pid, name),
+                int(fields[17]),
+                read_bytes,
+                write_bytes,
+                syscalls,
+                int(fields[1]),
+                -1
+            )
+        
+        if self._io_denied:
+            self._io_denied = {key for key in self._io_denied if snapshot.row(key[0]) is not None}
+        if self._full_names:
+            self._full_names = {key: name for key, name in self._full_names.items()
+                                if snapshot.row(key[0]) is not None}
+        
+        return snapshot
+    
+    def _read(self, path: bytes, with_owner: bool = False):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return (None, -1) if with_owner else None
+        
+        try:
+            length = os.readv(fd, [self._buffer])
+            while length == len(self._buffer):
+                self._buffer.extend(bytes(len(self._buffer)))
+                os.lseek(fd, 0, os.SEEK_SET)
+                length = os.readv(fd, [self._buffer])
+            content = bytes(memoryview(self._buffer)[:length])
+            return (content, os.fstat(fd).st_uid) if with_owner else content
+        except OSError:
+            return (None, -1) if with_owner else None
+        finally:
+            os.close(fd)
+    
+    def _read_io(self, base: bytes, pid: int, start_ticks: int) -> Tuple[int, int, int]:
+        key = (pid, start_ticks)
+        if key in self._io_denied:
+            return 0, 0, 0
+        
+        io = self._read(base + b"/io")
+        if io is None:
+            self._io_denied.add(key)
+            return 0, 0, 0
+        
+        return (self._field(io, b"\nread_bytes:"), self._field(io, b"\nwrite_bytes:"),
+                self._field(io, b"\nsyscr:") + self._field(io, b"\nsyscw:"))
+    
+    def _full_name(self, base: bytes, pid: int, start_ticks: int, name: str) -> str:
+        key = (pid, start_ticks, name)
+        full_name = self._full_names.get(key)
+        if full_name is not None:
+            return full_name
+        
+        full_name = name
+        cmdline = self._read(base + b"/cmdline")
+        if cmdline:
+            cmdline = cmdline.rstrip(b"\0")
+            separator = b"\0" if b"\0" in cmdline else b" "
+            program = os.path.basename(cmdline.split(separator, 1)[0].decode('utf-8', 'replace'))
+            if program.startswith(name):
+                full_name = program
+        
+        self._full_names[key] = full_name
+        return full_name
+    
+    def read_wakeups(self, snapshot: ProcessSnapshot, rows: Iterable[int]):
+        root = self.proc_root.encode()
+        for row in rows:
+            status = self._read(root + b"/" + str(snapshot.pids[row]).encode() + b"/status")
+            if status is not None:
+                snapshot.wakeups[row] = (self._field(status, b"\nvoluntary_ctxt_switches:") +
+                                         self._field(status, b"\nnonvoluntary_ctxt_switches:"))
+    
+    def _field(self, content: bytes, label: bytes) -> int:
+        start = content.find(label)
+        if start < 0:
+            return 0
+        start += len(label)
+        end = content.find(b"\n", start)
+        return int(content[start:end if end >= 0 else len(content)])
+    
+    def _read_boot_time(self) -> float:
+        try:
+            with open(os.path.join(self.proc_root, "stat"), 'rb') as f:
+                for line in f:
+                    if line.startswith(b"btime"):
+                        return float(line.split()[1])
+        except OSError:
+            pass
+        return time.time() - time.monotonic()
+
+def create_synthetic_proc(directory: str, count: int) -> str:
+    with open(os.path.join(directory, "stat"), 'w') as f:
+        f.write("cpu  100 0 100 1000 0 0 0 0 0 0\nbtime 1700000000\n")
+    with open(os.path.join(directory, "uptime"), 'w') as f:
+        f.write("1000.00 900.00\n")
+    
+    for pid in range(1, count + 1):
+        process_dir = os.path.join(directory, str(pid))
+        os.mkdir(process_dir)
+        name = f"worker-{pid}"
+        files = {
+            "stat": (f"{pid} ({name}) S 1 {pid} {pid} 0 -1 4194304 100 0 0 0 {pid % 500} {pid % 70} 0 0 "
+                     f"20 0 {pid % 8 + 1} 0 {pid * 10} 10485760 {pid % 900 + 100} 18446744073709551615 "
+                     f"0 0 0 0 0 0 0 0 0 0 0 0 17 0 0 0 0 0 0\n"),
+            "statm": f"2560 {pid % 900 + 100} 100 5 0 123 0\n",
+            "status": (f"Name:\t{name}\nState:\tS (sleeping)\nTgid:\t{pid}\nPid:\t{pid}\nPPid:\t1\n"
+                       f"Uid:\t0\t0\t0\t0\nGid:\t0\t0\t0\t0\nThreads:\t{pid % 8 + 1}\n"
+                       f"voluntary_ctxt_switches:\t{pid * 10}\nnonvoluntary_ctxt_switches:\t{pid}\n"),
+            "io": (f"rchar: 0\nwchar: 0\nsyscr: 0\nsyscw: 0\nread_bytes: {pid * 4096}\n"
+                   f"write_bytes: {pid * 512}\ncancelled_write_bytes: 0\n"),
+            "cmdline": f"/usr/bin/{name}\0",
+            "comm": f"{name}\n"
+        }
+        for file_name, content in files.items():
+            with open(os.path.join(process_dir, file_name), 'w') as f:
+                f.write(content)
+    
+    return directory
+
+def benchmark(proc_root: str = "/proc", repeat: int = 5) -> Dict[str, float]:
+    from core.process_manager import ProcessManager
+    
+    results = {}
+    manager = ProcessManager(use_proc_reader=False)
+    reader = ProcReader(proc_root)
+    
+    def best_time(func):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            snapshot = func()
+            best = min(best, time.perf_counter() - start)
+        return best, len(snapshot)
+    
+    results['proc_reader_ms'], results['processes'] = best_time(
+        lambda: reader.read_snapshot(manager._username, manager._is_system_name))
+    results['proc_reader_ms'] *= 1000
+    
+    import psutil
+    previous_root = getattr(psutil, 'PROCFS_PATH', "/proc")
+    psutil.PROCFS_PATH = proc_root
+    try:
+        results['psutil_ms'] = best_time(manager._psutil_snapshot)[0] * 1000
+    finally:
+        psutil.PROCFS_PATH = previous_root
+    
+    return results
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    
+    print(f"real /proc: {benchmark()}")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        create_synthetic_proc(directory, count)
+        print(f"synthetic /proc ({count} processes): {benchmark(directory)}")
\ No newline at end of file
@@ -0,0 +1,70 @@
+import threading
+from array import array
+from typing import List, Dict, Optional
+
+class ProcessHistory:
+    METRICS = ('cpu_percent', 'rss', 'io_rate', 'threads')
+    
+    def __init__(self, depth: int = 60, capacity: int = 4096):
+        self.depth = max(1, depth)
+        self.capacity = max(1, capacity)
+        
+        self._series = {metric: array('f', bytes(4 * self.depth * self.capacity)) for metric in self.METRICS}
+        self._lengths = array('q', bytes(8 * self.capacity))
+        self._create_times = array('d', bytes(8 * self.capacity))
+        self._slots = {}
+        self._free = list(range(self.capacity - 1, -1, -1))
+        self._head = -1
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._slots)
+    
+    def record(self, snapshot):
+        with self._lock:
+            self._head = (self._head + 1) % self.depth
+            
+            for pid in [pid for pid in self._slots if snapshot.row(pid) is None]:
+                self._release(pid)
+            
+            for row, pid in enumerate(snapshot.pids):
+                slot = self._slots.get(pid)
+                if slot is not None and self._create_times[slot] != snapshot.create_times[row]:
+                    self._release(pid)
+                    slot = None
+                
+                if slot is None:
+                    if not self._free:
+                        continue
+                    slot = self._free.pop()
+                    self._slots[pid] = slot
+                    self._lengths[slot] = 0
+                    self._create_times[slot] = snapshot.create_times[row]
+                
+                offset = slot * self.depth + self._head
+                self._series['cpu_percent'][offset] = snapshot.cpu_percent[row]
+                self._series['rss'][offset] = snapshot.rss[row]
+                self._series['io_rate'][offset] = snapshot.io_rate[row]
+                self._series['threads'][offset] = snapshot.num_threads[row]
+                
+                if self._lengths[slot] < self.depth:
+                    self._lengths[slot] += 1
+    
+    def get(self, pid: int) -> Optional[Dict[str, List[float]]]:
+        with self._lock:
+            slot = self._slots.get(pid)
+            if slot is None:
+                return None
+            
+            base = slot * self.depth
+            length = self._lengths[slot]
+            offsets = [base + (self._head - length + 1 + index) % self.depth for index in range(length)]
+            return {metric: [series[offset] for offset in offsets] for metric, series in self._series.items()}
+    
+    def clear(self):
+        with self._lock:
+            for pid in list(self._slots):
+                self._release(pid)
+    
+    def _release(self, pid: int):
+        self._free.append(self._slots.pop(pid))
\ No newline at end of file
@@ -1,128 +1,354 @@
 import os
 import time
+import heapq
 import signal
 import subprocess
-from typing import List, Dict, Optional, Tuple
+import threading
+from collections import deque
+from typing import List, Dict, Optional, Tuple, Callable
 import psutil
 from platform.platform_detector import PlatformDetector
+from core.process_snapshot import ProcessSnapshot
+from core.process_history import ProcessHistory
+from core.proc_reader import ProcReader
+from core.process_tree import ProcessTree
+from core.memory_accounting import MemoryAccounting
+
+try:
+    import pwd
+except ImportError:
+    pwd = None
+
+class ProcessSampler:
+    
+    def __init__(self, sample: Callable[[], ProcessSnapshot], interval: float = 2.0, warmup: float = 0.5,
+                 idle_after: float = 15.0):
+        self.sample = sample
+        self.interval = interval
+        self.warmup = warmup
+        self.idle_after = idle_after
+        
+        self._snapshot = None
+        self._last_request = time.monotonic()
+        self._idle = False
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+    
+    def latest(self, timeout: Optional[float] = None) -> Optional[ProcessSnapshot]:
+        self._ensure_started()
+        
+        with self._condition:
+            self._last_request = time.monotonic()
+            if self._idle:
+                stale = self._snapshot
+                self._idle = False
+                self._wake_event.set()
+                if timeout != 0:
+                    self._condition.wait_for(lambda: self._snapshot is not stale and self._has_baseline(), timeout)
+            elif timeout != 0:
+                self._condition.wait_for(self._has_baseline, timeout)
+            return self._snapshot
+    
+    def request_sample(self):
+        self._wake_event.set()
+    
+    def stop(self):
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None:
+            self._thread.join(2)
+            self._thread = None
+    
+    def _has_baseline(self) -> bool:
+        return self._snapshot is not None and self._snapshot.has_cpu_baseline
+    
+    def _ensure_started(self):
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="ProcessSampler", daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        delay = self.warmup
+        
+        while not self._stop_event.is_set():
+            try:
+                snapshot = self.sample()
+            except Exception as e:
+                print(f"Error sampling processes: {e}")
+            else:
+                with self._condition:
+                    self._snapshot = snapshot
+                    self._condition.notify_all()
+            
+            with self._condition:
+                self._idle = time.monotonic() - self._last_request > self.idle_after
+            
+            self._wake_event.wait(None if self._idle else delay)
+            self._wake_event.clear()
+            delay = self.interval
 
 class ProcessManager:
-    def __init__(self):
+    def __init__(self, history_depth: int = 60, use_proc_reader: Optional[bool] = None,
+                 memory_accounting: bool = False):
         self.platform = PlatformDetector.get_platform()
         self.system_processes = self._get_system_process_list()
+        self._last_snapshot = None
+        self._snapshot_lock = threading.Lock()
+        self._details = {}
+        self._usernames = {}
+        self._system_names = {}
+        self._tree = None
+        self.history = ProcessHistory(history_depth)
+        if use_proc_reader is None:
+            use_proc_reader = ProcReader.is_supported()
+        self.proc_reader = ProcReader() if use_proc_reader else None
+        self.memory_accounting = MemoryAccounting(self.proc_reader.proc_root if self.proc_reader else "/proc")
+        self.memory_accounting_enabled = memory_accounting
+        self.sampler = ProcessSampler(self.take_snapshot)
+        self.wakeup_rows = 64
+        self.snapshot_listeners = []
+        self._started = (time.monotonic(), time.process_time())
+        self._own_cpu_samples = deque([self._started], maxlen=720)
     
     def get_running_processes(self) -> List[Dict[str, any]]:
-        processes = []
+        snapshot = self.get_snapshot()
+        return snapshot.to_dicts(snapshot.rows_by_cpu(), self._cached_details(snapshot))
+    
+    def get_snapshot(self) -> ProcessSnapshot:
+        snapshot = self.sampler.latest(self.sampler.warmup + 5)
+        if snapshot is None:
+            snapshot = self.take_snapshot()
+        return snapshot
+    
+    def take_snapshot(self) -> ProcessSnapshot:
+        snapshot = None
+        from_proc = False
+        
+        if self.proc_reader is not None:
+            try:
+                snapshot = self.proc_reader.read_snapshot(self._username, self._is_system_name)
+                from_proc = True
+            except Exception as e:
+                print(f"Error reading /proc, falling back to psutil: {e}")
+                self.proc_reader = None
+        
+        if snapshot is None:
+            snapshot = self._psutil_snapshot()
+        
+        with self._snapshot_lock:
+            previous = self._last_snapshot
+            snapshot.compute_rates(previous)
+            self._last_snapshot = snapshot
         
-        process_list = list(psutil.process_iter(['pid', 'name', 'username', 'status']))
+        if from_proc:
+            rows = heapq.nlargest(self.wakeup_rows, range(len(snapshot)), key=snapshot.cpu_percent.__getitem__)
+            self.proc_reader.read_wakeups(snapshot, rows)
+            snapshot.compute_wakeup_rates(previous, rows)
+        else:
+            snapshot.compute_wakeup_rates(previous)
         
-        MAX_PROCESSES = 100
-        if len(process_list) > MAX_PROCESSES:
-            process_list = process_list[:MAX_PROCESSES]
+        if self.memory_accounting_enabled:
+            self.memory_accounting.refresh(snapshot)
         
-        for proc in process_list:
+        self.history.record(snapshot)
+        
+        for listener in self.snapshot_listeners:
             try:
-                pid = proc.info['pid']
-                name = proc.info['name']
-                username = proc.info['username'] if proc.info['username'] else "Unknown"
-                status = proc.info['status'] if proc.info['status'] else "Unknown"
-                
-                try:
-                    cpu_percent = proc.cpu_percent(interval=None)
-                except:
-                    cpu_percent = 0
-                
-                try:
-                    memory_info = proc.memory_info()
-                    memory_mb = memory_info.rss / (1024 * 1024)
-                except:
-                    memory_mb = 0
-                
-                is_system = self._is_system_process(pid, name)
-                exe = ""
-                cmdline = ""
-                
-                if not is_system:
-                    try:
-                        exe = proc.exe() if hasattr(proc, 'exe') else ""
-                    except:
-                        exe = "Access Denied"
-                    
-                    try:
-                        cmdline = " ".join(proc.cmdline()) if hasattr(proc, 'cmdline') else ""
-                    except:
-                        cmdline = "Access Denied"
-                
-                processes.append({
-                    'pid': pid,
-                    'name': name,
-                    'username': username,
-                    'status': status,
-                    'cpu_percent': cpu_percent,
-                    'memory_mb': memory_mb,
-                    'memory_formatted': f"{memory_mb:.2f} MB",
-                    'cmdline': cmdline,
-                    'exe': exe,
-                    'is_system': is_system
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
+                listener(snapshot)
+            except Exception as e:
+                print(f"Error in snapshot listener: {e}")
+        
+        return snapshot
+    
+    def add_snapshot_listener(self, listener: Callable[[ProcessSnapshot], None]):
+        self.snapshot_listeners.append(listener)
+    
+    def set_memory_accounting(self, enabled: bool):
+        self.memory_accounting_enabled = enabled
+        if not enabled:
+            self.memory_accounting.clear()
+    
+    def get_memory_usage(self, pids: List[int]) -> Dict[int, Dict[str, Optional[float]]]:
+        snapshot = self.get_snapshot()
+        self.memory_accounting.refresh(snapshot, pids, top_n=0)
+        
+        usage = {}
+        for pid in pids:
+            row = snapshot.row(pid)
+            if row is not None:
+                process = snapshot.to_dict(row)
+                usage[pid] = {'pss_mb': process['pss_mb'], 'uss_mb': process['uss_mb']}
+        return usage
+    
+    def _psutil_snapshot(self) -> ProcessSnapshot:
+        attrs = ['pid', 'ppid', 'name', 'status', 'cpu_times', 'memory_info', 'create_time', 'num_threads',
+                 'num_ctx_switches']
+        attrs.append('username' if pwd is None else 'uids')
+        if hasattr(psutil.Process, 'io_counters'):
+            attrs.append('io_counters')
+        
+        snapshot = ProcessSnapshot()
+        
+        for proc in psutil.process_iter(attrs):
+            info = proc.info
+            pid = info['pid']
+            name = info['name'] or ""
+            cpu_times = info['cpu_times']
+            memory_info = info['memory_info']
+            io_counters = info.get('io_counters')
+            ctx_switches = info['num_ctx_switches']
+            
+            if pwd is None:
+                username = info['username']
+            else:
+                username = self._username(info['uids'].real) if info['uids'] else None
+            
+            snapshot.append(
+                pid,
+                name,
+                username if username else "Unknown",
+                info['status'] if info['status'] else "Unknown",
+                cpu_times.user + cpu_times.system if cpu_times else 0.0,
+                memory_info.rss if memory_info else 0,
+                info['create_time'] or 0.0,
+                self._is_system_name(pid, name),
+                info['num_threads'] or 0,
+                io_counters.read_bytes if io_counters else 0,
+                io_counters.write_bytes if io_counters else 0,
+                io_counters.read_count + io_counters.write_count if io_counters else 0,
+                info['ppid'] or 0,
+                ctx_switches.voluntary + ctx_switches.involuntary if ctx_switches else 0
+            )
+        
+        return snapshot
+    
+    def build_process_tree(self, snapshot: Optional[ProcessSnapshot] = None) -> ProcessTree:
+        snapshot = snapshot or self.get_snapshot()
         
-        processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
-        return processes
+        tree = self._tree
+        if tree is None or tree.snapshot is not snapshot:
+            tree = self._tree = ProcessTree(snapshot)
+        return tree
+    
+    def get_process_groups(self, by: str = 'name'):
+        return self.build_process_tree().group(by)
     
-    def get_high_resource_processes(self, cpu_threshold: float = 5.0, memory_threshold_mb: float = 500) -> List[Dict[str, any]]:
-        high_resource_processes = []
+    def get_own_cpu_usage(self) -> Dict[str, float]:
+        now, cpu_time = time.monotonic(), time.process_time()
+        if now - self._own_cpu_samples[-1][0] >= 5:
+            self._own_cpu_samples.append((now, cpu_time))
         
-        for proc in psutil.process_iter(['pid', 'name', 'username', 'status']):
+        window_start = next((sample for sample in self._own_cpu_samples if now - sample[0] <= 3600),
+                            self._own_cpu_samples[-1])
+        uptime = now - self._started[0]
+        window = now - window_start[0]
+        
+        return {
+            'cpu_seconds': cpu_time - self._started[1],
+            'uptime_seconds': uptime,
+            'cpu_seconds_per_hour': (cpu_time - self._started[1]) / uptime * 3600 if uptime > 0 else 0.0,
+            'recent_cpu_seconds_per_hour': (cpu_time - window_start[1]) / window * 3600 if window > 0 else 0.0
+        }
+    
+    def get_process_history(self, pid: int) -> Optional[Dict[str, List[float]]]:
+        return self.history.get(pid)
+    
+    def get_process_details(self, pids: List[int]) -> Dict[int, Dict[str, str]]:
+        details = {}
+        
+        for pid in pids:
             try:
-                pid = proc.info['pid']
-                name = proc.info['name']
-                
-                try:
-                    cpu_percent = proc.cpu_percent(interval=None)
+                proc = psutil.Process(pid)
+                with proc.oneshot():
+                    create_time = proc.create_time()
+                    with self._snapshot_lock:
+                        cached = self._details.get(pid)
+                    if cached and cached[0] == create_time:
+                        details[pid] = cached[1]
+                        continue
+                    
+                    exe = ""
+                    cmdline = ""
                     
-                    if cpu_percent >= cpu_threshold:
-                        memory_mb = proc.memory_info().rss / (1024 * 1024)
+                    if not self._is_system_process(pid, proc.name()):
+                        try:
+                            exe = proc.exe()
+                        except:
+                            exe = "Access Denied"
                         
-                        if cpu_percent >= cpu_threshold or memory_mb >= memory_threshold_mb:
-                            is_system = self._is_system_process(pid, name)
-                            
-                            high_resource_processes.append({
-                                'pid': pid,
-                                'name': name,
-                                'username': proc.info['username'] if proc.info['username'] else "Unknown",
-                                'status': proc.info['status'] if proc.info['status'] else "Unknown",
-                                'cpu_percent': cpu_percent,
-                                'memory_mb': memory_mb,
-                                'memory_formatted': f"{memory_mb:.2f} MB",
-                                'is_system': is_system
-                            })
-                    else:
-                        memory_mb = proc.memory_info().rss / (1024 * 1024)
-                        if memory_mb >= memory_threshold_mb:
-                            is_system = self._is_system_process(pid, name)
-                            
-                            high_resource_processes.append({
-                                'pid': pid,
-                                'name': name,
-                                'username': proc.info['username'] if proc.info['username'] else "Unknown",
-                                'status': proc.info['status'] if proc.info['status'] else "Unknown",
-                                'cpu_percent': cpu_percent,
-                                'memory_mb': memory_mb,
-                                'memory_formatted': f"{memory_mb:.2f} MB",
-                                'is_system': is_system
-                            })
-                except:
-                    continue
-            except:
+                        try:
+                            cmdline = " ".join(proc.cmdline())
+                        except:
+                            cmdline = "Access Denied"
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 continue
+            
+            details[pid] = {'exe': exe, 'cmdline': cmdline}
+            with self._snapshot_lock:
+                self._details[pid] = (create_time, details[pid])
+        
+        return details
+    
+    def _cached_details(self, snapshot: ProcessSnapshot) -> Dict[int, Dict[str, str]]:
+        details = {}
+        
+        with self._snapshot_lock:
+            for pid, (create_time, info) in list(self._details.items()):
+                row = snapshot.row(pid)
+                if row is None or snapshot.create_times[row] != create_time:
+                    del self._details[pid]
+                else:
+                    details[pid] = info
         
-        high_resource_processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
+        return details
+    
+    def _username(self, uid: int) -> Optional[str]:
+        if uid not in self._usernames:
+            try:
+                self._usernames[uid] = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                self._usernames[uid] = str(uid)
+        return self._usernames[uid]
+    
+    def _is_system_name(self, pid: int, name: str) -> bool:
+        if pid <= 4:
+            return True
+        
+        if name not in self._system_names:
+            self._system_names[name] = self._is_system_process(pid, name)
+        return self._system_names[name]
+    
+    def get_high_resource_processes(self, cpu_threshold: float = 5.0, memory_threshold_mb: float = 500,
+                                    memory_metric: str = 'rss', io_threshold_kb_s: float = 0) -> List[Dict[str, any]]:
+        snapshot = self.get_snapshot()
+        memory_threshold_bytes = memory_threshold_mb * 1024 * 1024
+        memory = snapshot.rss
+        
+        if memory_metric in ('pss', 'uss') and memory_threshold_mb > 0:
+            candidates = [pid for row, pid in enumerate(snapshot.pids) if snapshot.rss[row] >= memory_threshold_bytes]
+            self.memory_accounting.refresh(snapshot, candidates, top_n=0)
+            accounted = snapshot.pss if memory_metric == 'pss' else snapshot.uss
+            memory = [value if value >= 0 else snapshot.rss[row] for row, value in enumerate(accounted)]
+        
+        rows = [row for row in snapshot.rows_by_cpu()
+                if (cpu_threshold > 0 and snapshot.cpu_percent[row] >= cpu_threshold)
+                or (memory_threshold_mb > 0 and memory[row] >= memory_threshold_bytes)
+                or (io_threshold_kb_s > 0 and snapshot.io_rate[row] >= io_threshold_kb_s * 1024)]
         
         MAX_HIGH_RESOURCE_PROCESSES = 50
-        return high_resource_processes[:MAX_HIGH_RESOURCE_PROCESSES] if len(high_resource_processes) > MAX_HIGH_RESOURCE_PROCESSES else high_resource_processes
+        return snapshot.to_dicts(rows[:MAX_HIGH_RESOURCE_PROCESSES], self._cached_details(snapshot))
 
+    def get_top_io_processes(self, limit: int = 20, min_kb_s: float = 0) -> List[Dict[str, any]]:
+        snapshot = self.get_snapshot()
+        rows = [row for row in snapshot.rows_by_io(limit) if snapshot.io_rate[row] > min_kb_s * 1024]
+        return snapshot.to_dicts(rows, self._cached_details(snapshot))
+    
     def terminate_process(self, pid: int, force: bool = False) -> Tuple[bool, Optional[str]]: 
         try:
             if not psutil.pid_exists(pid):
@@ -130,7 +356,7 @@ class ProcessManager:
             
             process = psutil.Process(pid)
             
-            if self._is_system_process(pid, process.name()):
+            if self._is_system_target(process, self.sampler.latest(0)):
                 return False, f"Cannot terminate system process: {process.name()} (PID: {pid})"
             
             if force:
@@ -148,6 +374,65 @@ class ProcessManager:
         except Exception as e:
             return False, str(e)
     
+    def terminate_process_tree(self, pid: int, force: bool = False, timeout: float = 5.0) -> Tuple[bool, Optional[str]]:
+        tree = self.build_process_tree()
+        snapshot = tree.snapshot
+        
+        try:
+            root = psutil.Process(pid)
+            if self._is_system_target(root, snapshot):
+                return False, f"Cannot terminate system process: {root.name()} (PID: {pid})"
+            processes = root.children(recursive=True)[::-1]
+        except psutil.NoSuchProcess:
+            return False, f"Process with PID {pid} not found"
+        except Exception as e:
+            return False, str(e)
+        
+        live = {process.pid for process in processes}
+        node = tree.find_pid(pid)
+        if node is not None and abs(root.create_time() - snapshot.create_times[node]) <= 1:
+            for row in tree.subtree(node):
+                if snapshot.pids[row] in live or row == node:
+                    continue
+                try:
+                    process = psutil.Process(snapshot.pids[row])
+                    if abs(process.create_time() - snapshot.create_times[row]) <= 1:
+                        processes.insert(0, process)
+                except psutil.NoSuchProcess:
+                    continue
+        processes.append(root)
+        
+        targets = []
+        skipped = []
+        for process in processes:
+            try:
+                if self._is_system_target(process, snapshot):
+                    skipped.append(process.pid)
+                    continue
+                if force:
+                    process.kill()
+                else:
+                    process.terminate()
+                targets.append(process)
+            except psutil.NoSuchProcess:
+                continue
+            except psutil.AccessDenied:
+                skipped.append(process.pid)
+        
+        _, alive = psutil.wait_procs(targets, timeout=timeout)
+        self.sampler.request_sample()
+        
+        if alive or skipped:
+            remaining = sorted([process.pid for process in alive] + skipped)
+            return False, f"{len(remaining)} processes in the tree could not be terminated: {', '.join(map(str, remaining))}"
+        return True, None
+    
+    def _is_system_target(self, process, snapshot: Optional[ProcessSnapshot]) -> bool:
+        row = snapshot.row(process.pid) if snapshot else None
+        if row is not None and abs(snapshot.create_times[row] - process.create_time()) <= 1:
+            return bool(snapshot.is_system[row])
+        return self._is_system_process(process.pid, process.name())
+    
     def get_startup_items(self) -> List[Dict[str, any]]:
         startup_items = []
         
@@ -0,0 +1,139 @@
+import time
+import heapq
+from array import array
+from typing import List, Dict, Optional, Iterable
+
+class ProcessSnapshot:
+    
+    def __init__(self, timestamp: Optional[float] = None):
+        self.timestamp = time.monotonic() if timestamp is None else timestamp
+        self.pids = array('q')
+        self.ppids = array('q')
+        self.names = []
+        self.usernames = []
+        self.statuses = []
+        self.cpu_times = array('d')
+        self.cpu_percent = array('d')
+        self.rss = array('q')
+        self.pss = array('q')
+        self.uss = array('q')
+        self.create_times = array('d')
+        self.num_threads = array('q')
+        self.read_bytes = array('q')
+        self.write_bytes = array('q')
+        self.syscalls = array('q')
+        self.wakeups = array('q')
+        self.read_rate = array('d')
+        self.write_rate = array('d')
+        self.syscall_rate = array('d')
+        self.wakeup_rate = array('d')
+        self.io_rate = array('d')
+        self.is_system = bytearray()
+        self.has_cpu_baseline = False
+        self._rows = {}
+    
+    def __len__(self) -> int:
+        return len(self.pids)
+    
+    def append(self, pid: int, name: str, username: str, status: str, cpu_time: float,
+               rss: int, create_time: float, is_system: bool, num_threads: int = 0, read_bytes: int = 0,
+               write_bytes: int = 0, syscalls: int = 0, ppid: int = 0, wakeups: int = -1) -> int:
+        row = len(self.pids)
+        self._rows[pid] = row
+        self.pids.append(pid)
+        self.ppids.append(ppid)
+        self.names.append(name)
+        self.usernames.append(username)
+        self.statuses.append(status)
+        self.cpu_times.append(cpu_time)
+        self.cpu_percent.append(0.0)
+        self.rss.append(rss)
+        self.pss.append(-1)
+        self.uss.append(-1)
+        self.create_times.append(create_time)
+        self.num_threads.append(num_threads)
+        self.read_bytes.append(read_bytes)
+        self.write_bytes.append(write_bytes)
+        self.syscalls.append(syscalls)
+        self.wakeups.append(wakeups)
+        self.read_rate.append(0.0)
+        self.write_rate.append(0.0)
+        self.syscall_rate.append(0.0)
+        self.wakeup_rate.append(0.0)
+        self.io_rate.append(0.0)
+        self.is_system.append(1 if is_system else 0)
+        return row
+    
+    def row(self, pid: int) -> Optional[int]:
+        return self._rows.get(pid)
+    
+    def compute_rates(self, previous: Optional['ProcessSnapshot']):
+        if previous is None:
+            return
+        
+        elapsed = self.timestamp - previous.timestamp
+        if elapsed <= 0:
+            return
+        
+        self.has_cpu_baseline = True
+        for row, pid in enumerate(self.pids):
+            previous_row = previous.row(pid)
+            if previous_row is None or previous.create_times[previous_row] != self.create_times[row]:
+                continue
+            delta = self.cpu_times[row] - previous.cpu_times[previous_row]
+            self.cpu_percent[row] = max(0.0, delta / elapsed * 100)
+            self.read_rate[row] = max(0, self.read_bytes[row] - previous.read_bytes[previous_row]) / elapsed
+            self.write_rate[row] = max(0, self.write_bytes[row] - previous.write_bytes[previous_row]) / elapsed
+            self.syscall_rate[row] = max(0, self.syscalls[row] - previous.syscalls[previous_row]) / elapsed
+            self.io_rate[row] = self.read_rate[row] + self.write_rate[row]
+    
+    def compute_wakeup_rates(self, previous: Optional['ProcessSnapshot'], rows: Optional[Iterable[int]] = None):
+        if previous is None:
+            return
+        
+        elapsed = self.timestamp - previous.timestamp
+        if elapsed <= 0:
+            return
+        
+        for row in range(len(self.pids)) if rows is None else rows:
+            previous_row = previous.row(self.pids[row])
+            if (previous_row is None or previous.create_times[previous_row] != self.create_times[row] or
+                    self.wakeups[row] < 0 or previous.wakeups[previous_row] < 0):
+                continue
+            self.wakeup_rate[row] = max(0, self.wakeups[row] - previous.wakeups[previous_row]) / elapsed
+    
+    def rows_by_cpu(self) -> List[int]:
+        return sorted(range(len(self.pids)), key=self.cpu_percent.__getitem__, reverse=True)
+    
+    def rows_by_io(self, limit: Optional[int] = None) -> List[int]:
+        if limit is None:
+            return sorted(range(len(self.pids)), key=self.io_rate.__getitem__, reverse=True)
+        return heapq.nlargest(limit, range(len(self.pids)), key=self.io_rate.__getitem__)
+    
+    def to_dict(self, row: int, details: Optional[Dict[str, str]] = None) -> Dict[str, any]:
+        memory_mb = self.rss[row] / (1024 * 1024)
+        return {
+            'pid': self.pids[row],
+            'name': self.names[row],
+            'username': self.usernames[row],
+            'status': self.statuses[row],
+            'cpu_percent': self.cpu_percent[row],
+            'memory_mb': memory_mb,
+            'memory_formatted': f"{memory_mb:.2f} MB",
+            'read_kb_s': self.read_rate[row] / 1024,
+            'write_kb_s': self.write_rate[row] / 1024,
+            'syscalls_s': self.syscall_rate[row],
+            'wakeups_s': self.wakeup_rate[row],
+            'pss_mb': self.pss[row] / (1024 * 1024) if self.pss[row] >= 0 else None,
+            'uss_mb': self.uss[row] / (1024 * 1024) if self.uss[row] >= 0 else None,
+            'cmdline': details['cmdline'] if details else "",
+            'exe': details['exe'] if details else "",
+            'is_system': bool(self.is_system[row])
+        }
+    
+    def to_dicts(self, rows: Optional[Iterable[int]] = None,
+                 details: Optional[Dict[int, Dict[str, str]]] = None) -> List[Dict[str, any]]:
+        if rows is None:
+            rows = range(len(self.pids))
+        details = details or {}
+        return [self.to_dict(row, details.get(self.pids[row])) for row in rows]
\ No newline at end of file
@@ -0,0 +1,237 @@
+from array import array
+from collections import deque
+from typing import List, Dict, Optional
+
+class ProcessTree:
+    APP_LAUNCHERS = {
+        "systemd", "init", "launchd", "explorer.exe", "services.exe", "svchost.exe",
+        "gnome-shell", "gnome-session-binary", "plasmashell", "kwin_x11", "kwin_wayland",
+        "xfce4-session", "xfce4-panel", "lxsession", "Finder", "Dock", "tmux: server", "screen"
+    }
+    
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        count = len(snapshot)
+        self.root = count
+        
+        self.parent = array('q', [count]) * count
+        for row in range(count):
+            parent = snapshot.row(snapshot.ppids[row])
+            if parent is not None and parent != row:
+                self.parent[row] = parent
+        
+        self.child_start = array('q', bytes(8 * (count + 2)))
+        for row in range(count):
+            self.child_start[self.parent[row] + 1] += 1
+        for node in range(count + 1):
+            self.child_start[node + 1] += self.child_start[node]
+        
+        self.child_index = array('q', bytes(8 * count))
+        fill = array('q', self.child_start)
+        for row in range(count):
+            parent = self.parent[row]
+            self.child_index[fill[parent]] = row
+            fill[parent] += 1
+        
+        self.total_cpu = array('d', snapshot.cpu_percent)
+        self.total_rss = array('q', snapshot.rss)
+        self.total_count = array('q', [1]) * count
+        self._positions = array('q', bytes(8 * count))
+        
+        order = self._breadth_first()
+        for row in reversed(order):
+            parent = self.parent[row]
+            if parent != self.root:
+                self.total_cpu[parent] += self.total_cpu[row]
+                self.total_rss[parent] += self.total_rss[row]
+                self.total_count[parent] += self.total_count[row]
+        
+        self._sort_children()
+    
+    def __len__(self) -> int:
+        return self.root
+    
+    def child_count(self, node: int) -> int:
+        return self.child_start[node + 1] - self.child_start[node]
+    
+    def child(self, node: int, position: int) -> int:
+        return self.child_index[self.child_start[node] + position]
+    
+    def children(self, node: int) -> List[int]:
+        return list(self.child_index[self.child_start[node]:self.child_start[node + 1]])
+    
+    def parent_of(self, node: int) -> int:
+        return self.parent[node]
+    
+    def position_of(self, node: int) -> int:
+        return self._positions[node]
+    
+    def find_pid(self, pid: int) -> Optional[int]:
+        return self.snapshot.row(pid)
+    
+    def pid(self, node: int) -> Optional[int]:
+        return self.snapshot.pids[node] if node != self.root else None
+    
+    def subtree(self, node: int) -> List[int]:
+        order = []
+        seen = {node}
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            order.append(current)
+            for child in self.children(current):
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        order.reverse()
+        return order
+    
+    def node_info(self, node: int) -> Dict[str, any]:
+        snapshot = self.snapshot
+        return {
+            'pid': snapshot.pids[node],
+            'name': snapshot.names[node],
+            'username': snapshot.usernames[node],
+            'cpu_percent': snapshot.cpu_percent[node],
+            'memory_mb': snapshot.rss[node] / (1024 * 1024),
+            'total_cpu_percent': self.total_cpu[node],
+            'total_memory_mb': self.total_rss[node] / (1024 * 1024),
+            'count': self.total_count[node],
+            'is_system': bool(snapshot.is_system[node])
+        }
+    
+    def group(self, by: str = 'name') -> 'ProcessGroups':
+        snapshot = self.snapshot
+        app_roots = self._app_roots() if by == 'app' else None
+        members = {}
+        
+        for row in range(len(snapshot)):
+            key = snapshot.names[app_roots[row] if app_roots is not None else row]
+            members.setdefault(key, []).append(row)
+        
+        return ProcessGroups(self, members)
+    
+    def _app_roots(self) -> array:
+        snapshot = self.snapshot
+        app_roots = array('q', range(self.root))
+        
+        for row in self._breadth_first():
+            parent = self.parent[row]
+            if (parent != self.root and not snapshot.is_system[parent] and
+                    snapshot.usernames[parent] == snapshot.usernames[row] and
+                    snapshot.names[parent] not in self.APP_LAUNCHERS):
+                app_roots[row] = app_roots[parent]
+        
+        return app_roots
+    
+    def _breadth_first(self) -> List[int]:
+        order = []
+        queue = deque(self.children(self.root))
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            queue.extend(self.children(node))
+        return order
+    
+    def _sort_children(self):
+        for node in range(self.root + 1):
+            start, end = self.child_start[node], self.child_start[node + 1]
+            if end - start > 1:
+                self.child_index[start:end] = array('q', sorted(
+                    self.child_index[start:end],
+                    key=lambda row: (self.total_cpu[row], self.total_rss[row]),
+                    reverse=True
+                ))
+            for position in range(start, end):
+                self._positions[self.child_index[position]] = position - start
+
+class ProcessGroups:
+    
+    def __init__(self, tree: ProcessTree, members: Dict[str, List[int]]):
+        self.tree = tree
+        snapshot = tree.snapshot
+        
+        groups = []
+        for key, rows in members.items():
+            total_cpu = sum(snapshot.cpu_percent[row] for row in rows)
+            total_rss = sum(snapshot.rss[row] for row in rows)
+            rows.sort(key=lambda row: (snapshot.cpu_percent[row], snapshot.rss[row]), reverse=True)
+            groups.append((total_cpu, total_rss, key, rows))
+        groups.sort(key=lambda group: (group[0], group[1]), reverse=True)
+        
+        self.keys = [group[2] for group in groups]
+        self.total_cpu = array('d', [group[0] for group in groups])
+        self.total_rss = array('q', [group[1] for group in groups])
+        self.member_start = array('q', [0])
+        self.members = array('q')
+        for group in groups:
+            self.members.extend(group[3])
+            self.member_start.append(len(self.members))
+        
+        self.group_count = len(groups)
+        self.root = self.group_count + len(self.members)
+    
+    def __len__(self) -> int:
+        return self.group_count
+    
+    def child_count(self, node: int) -> int:
+        if node == self.root:
+            return self.group_count
+        if node < self.group_count:
+            return self.member_start[node + 1] - self.member_start[node]
+        return 0
+    
+    def child(self, node: int, position: int) -> int:
+        if node == self.root:
+            return position
+        return self.group_count + self.member_start[node] + position
+    
+    def parent_of(self, node: int) -> int:
+        if node < self.group_count:
+            return self.root
+        offset = node - self.group_count
+        low, high = 0, self.group_count
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self.member_start[middle] <= offset:
+                low = middle
+            else:
+                high = middle
+        return low
+    
+    def find_pid(self, pid: int) -> Optional[int]:
+        row = self.tree.snapshot.row(pid)
+        if row is None:
+            return None
+        offset = self.members.index(row)
+        return self.group_count + offset
+    
+    def pid(self, node: int) -> Optional[int]:
+        if node < self.group_count or node == self.root:
+            return None
+        return self.tree.snapshot.pids[self.members[node - self.group_count]]
+    
+    def position_of(self, node: int) -> int:
+        if node < self.group_count:
+            return node
+        return node - self.group_count - self.member_start[self.parent_of(node)]
+    
+    def node_info(self, node: int) -> Dict[str, any]:
+        if node >= self.group_count:
+            info = self.tree.node_info(self.members[node - self.group_count])
+            info['count'] = 1
+            info['total_cpu_percent'] = info['cpu_percent']
+            info['total_memory_mb'] = info['memory_mb']
+            return info
+        
+        return {
+            'pid': None,
+            'name': self.keys[node],
+            'username': "",
+            'cpu_percent': self.total_cpu[node],
+            'memory_mb': self.total_rss[node] / (1024 * 1024),
+            'total_cpu_percent': self.total_cpu[node],
+            'total_memory_mb': self.total_rss[node] / (1024 * 1024),
+            'count': self.child_count(node),
+            'is_system': False
+        }
\ No newline at end of file
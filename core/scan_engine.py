@@ -0,0 +1,128 @@
+import os
+import threading
+from collections import deque
+from typing import List, Dict, Tuple, Optional, Callable
+
+class ScanEngine:
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        if max_workers is None:
+            max_workers = min(8, (os.cpu_count() or 1) * 2)
+        self.max_workers = max(1, max_workers)
+    
+    def scan(self, roots: List[str], on_directory: Callable[[str, List[Tuple[str, os.stat_result]], List[str]], None],
+             should_descend: Optional[Callable[[str, str], bool]] = None, stop_event=None,
+             reuse_directory: Optional[Callable[[str], Optional[List[str]]]] = None,
+             stats: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        if stats is None:
+            stats = {}
+        stats.update({'dirs': 0, 'files': 0, 'bytes': 0, 'reused': 0})
+        workers = self.max_workers
+        queues = [deque() for _ in range(workers)]
+        condition = threading.Condition()
+        state = {'pending': len(roots), 'error': None}
+        
+        for index, root in enumerate(roots):
+            queues[index % workers].append(root)
+        
+        def stopped():
+            return state['error'] is not None or (stop_event is not None and stop_event.is_set())
+        
+        def next_directory(index):
+            own = queues[index]
+            try:
+                return own.pop()
+            except IndexError:
+                pass
+            
+            for offset in range(1, workers):
+                victim = queues[(index + offset) % workers]
+                try:
+                    return victim.popleft()
+                except IndexError:
+                    continue
+            return None
+        
+        def worker(index):
+            own = queues[index]
+            
+            while not stopped():
+                path = next_directory(index)
+                
+                if path is None:
+                    with condition:
+                        if state['pending'] == 0:
+                            condition.notify_all()
+                            return
+                        condition.wait(0.05)
+                    continue
+                
+                subdirs = []
+                try:
+                    subdirs = self._scan_directory(path, on_directory, should_descend, reuse_directory,
+                                                   stats, condition)
+                except Exception as e:
+                    state['error'] = e
+                
+                with condition:
+                    own.extend(subdirs)
+                    state['pending'] += len(subdirs) - 1
+                    if subdirs or state['pending'] == 0:
+                        condition.notify_all()
+        
+        if workers == 1:
+            worker(0)
+        else:
+            threads = [threading.Thread(target=worker, args=(index,), daemon=True) for index in range(workers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        if state['error'] is not None:
+            raise state['error']
+        
+        return stats
+    
+    def _scan_directory(self, path: str, on_directory, should_descend, reuse_directory,
+                        stats: Dict[str, int], lock: threading.Condition) -> List[str]:
+        if reuse_directory is not None:
+            cached_subdirs = reuse_directory(path)
+            if cached_subdirs is not None:
+                with lock:
+                    stats['dirs'] += 1
+                    stats['reused'] += 1
+                return cached_subdirs
+        
+        subdirs = []
+        files = []
+        total_bytes = 0
+        
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            if not entry.is_symlink() and (should_descend is None or should_descend(entry.path, entry.name)):
+                                subdirs.append(entry.path)
+                            continue
+                        
+                        if not entry.is_file():
+                            continue
+                        
+                        file_stats = entry.stat()
+                        files.append((entry.path, file_stats))
+                        total_bytes += file_stats.st_size
+                    except (PermissionError, FileNotFoundError, OSError):
+                        continue
+        except (PermissionError, FileNotFoundError, OSError):
+            return subdirs
+        
+        with lock:
+            stats['dirs'] += 1
+            stats['files'] += len(files)
+            stats['bytes'] += total_bytes
+        
+        on_directory(path, files, subdirs)
+        
+        return subdirs
\ No newline at end of file
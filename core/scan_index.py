@@ -0,0 +1,186 @@
+import os
+import time
+import sqlite3
+import threading
+from collections import defaultdict
+from typing import List, Dict, Tuple, Optional, Callable
+from platform.platform_detector import PlatformDetector
+
+class ScanIndex:
+    
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS directories (
+        path TEXT PRIMARY KEY,
+        parent TEXT,
+        mtime_ns INTEGER NOT NULL,
+        scanned_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS directories_parent ON directories(parent);
+    CREATE TABLE IF NOT EXISTS files (
+        path TEXT PRIMARY KEY,
+        dir TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        atime REAL NOT NULL,
+        mtime REAL NOT NULL,
+        inode INTEGER,
+        device INTEGER
+    );
+    CREATE INDEX IF NOT EXISTS files_dir ON files(dir);
+    CREATE INDEX IF NOT EXISTS files_size ON files(size);
+    """
+    
+    def __init__(self, db_path: Optional[str] = None):
+        if db_path is None:
+            db_path = os.path.join(PlatformDetector.get_data_directory(), "scan_index.db")
+        self.db_path = db_path
+        self._initialized = False
+    
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        
+        if not self._initialized:
+            conn.executescript(self.SCHEMA)
+            self._initialized = True
+        
+        return conn
+    
+    def refresh(self, engine, roots: List[str], should_descend: Optional[Callable[[str, str], bool]] = None,
+                stop_event=None, on_scanned: Optional[Callable[[str, List, List[str]], None]] = None,
+                stats: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        conn = self._connect()
+        try:
+            known_mtimes = {}
+            children = defaultdict(list)
+            
+            for root in roots:
+                low, high = self._subtree_bounds(root)
+                rows = conn.execute(
+                    "SELECT path, parent, mtime_ns FROM directories WHERE path = ? OR (path > ? AND path < ?)",
+                    (root, low, high)
+                )
+                for path, parent, mtime_ns in rows:
+                    known_mtimes[path] = mtime_ns
+                    if parent is not None:
+                        children[parent].append(path)
+            
+            scanned_mtimes = {}
+            changed = []
+            changed_lock = threading.Lock()
+            
+            def reuse_directory(path):
+                try:
+                    mtime_ns = os.stat(path).st_mtime_ns
+                except OSError:
+                    return None
+                
+                if known_mtimes.get(path) == mtime_ns:
+                    return [child for child in children.get(path, ())
+                            if should_descend is None or should_descend(child, os.path.basename(child))]
+                
+                scanned_mtimes[path] = mtime_ns
+                return None
+            
+            def on_directory(path, files, subdirs):
+                with changed_lock:
+                    changed.append((path, files, subdirs))
+                if on_scanned:
+                    on_scanned(path, files, subdirs)
+            
+            stats = engine.scan(roots, on_directory, should_descend, stop_event, reuse_directory, stats)
+            
+            now = time.time()
+            with conn:
+                for path, files, subdirs in changed:
+                    for child in set(children.get(path, ())).difference(subdirs):
+                        self._delete_subtree(conn, child)
+                    
+                    conn.execute("DELETE FROM files WHERE dir = ?", (path,))
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO files (path, dir, size, atime, mtime, inode, device) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [(file_path, path, file_stats.st_size, file_stats.st_atime, file_stats.st_mtime,
+                          file_stats.st_ino, file_stats.st_dev) for file_path, file_stats in files]
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO directories (path, parent, mtime_ns, scanned_at) VALUES (?, ?, ?, ?)",
+                        (path, os.path.dirname(path), scanned_mtimes.get(path, -1), now)
+                    )
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO directories (path, parent, mtime_ns, scanned_at) VALUES (?, ?, -1, 0)",
+                        [(subdir, path) for subdir in subdirs]
+                    )
+            
+            stats['changed'] = len(changed)
+            return stats
+        finally:
+            conn.close()
+    
+    def query_large_files(self, roots: List[str], min_size_bytes: float, cutoff_time: float,
+                          limit: int = 1000) -> List[Tuple[str, int, float]]:
+        results = []
+        
+        conn = self._connect()
+        try:
+            for root in roots:
+                low, high = self._subtree_bounds(root)
+                results.extend(conn.execute(
+                    "SELECT path, size, atime FROM files WHERE size >= ? AND atime <= ? AND path > ? AND path < ? "
+                    "ORDER BY size DESC LIMIT ?",
+                    (min_size_bytes, cutoff_time, low, high, limit)
+                ))
+            
+            results.sort(key=lambda row: row[1], reverse=True)
+            results = self._restat(conn, results[:limit])
+        finally:
+            conn.close()
+        
+        return [row for row in results if row[1] >= min_size_bytes and row[2] <= cutoff_time]
+    
+    def _restat(self, conn: sqlite3.Connection, rows: List[Tuple[str, int, float]]) -> List[Tuple[str, int, float]]:
+        current = []
+        updated = []
+        removed = []
+        
+        for path, size, atime in rows:
+            try:
+                file_stats = os.stat(path)
+            except FileNotFoundError:
+                removed.append((path,))
+                continue
+            except OSError:
+                current.append((path, size, atime))
+                continue
+            
+            current.append((path, file_stats.st_size, file_stats.st_atime))
+            if file_stats.st_size != size or file_stats.st_atime != atime:
+                updated.append((file_stats.st_size, file_stats.st_atime, file_stats.st_mtime, path))
+        
+        if updated or removed:
+            with conn:
+                conn.executemany("UPDATE files SET size = ?, atime = ?, mtime = ? WHERE path = ?", updated)
+                conn.executemany("DELETE FROM files WHERE path = ?", removed)
+        
+        return current
+    
+    def is_indexed(self, root: str) -> bool:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT mtime_ns FROM directories WHERE path = ?", (root,)).fetchone()
+            return row is not None and row[0] >= 0
+        finally:
+            conn.close()
+    
+    def _delete_subtree(self, conn: sqlite3.Connection, path: str):
+        low, high = self._subtree_bounds(path)
+        conn.execute("DELETE FROM files WHERE dir = ? OR (dir > ? AND dir < ?)", (path, low, high))
+        conn.execute("DELETE FROM directories WHERE path = ? OR (path > ? AND path < ?)", (path, low, high))
+    
+    def _subtree_bounds(self, path: str) -> Tuple[str, str]:
+        prefix = path.rstrip(os.sep) + os.sep
+        return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
\ No newline at end of file
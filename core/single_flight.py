@@ -0,0 +1,58 @@
+import time
+import threading
+from typing import Callable, Optional, Any, Hashable
+
+class _Call:
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    
+    def __init__(self):
+        self._calls = {}
+        self._results = {}
+        self._generations = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key: Hashable, func: Callable[[], Any], ttl: float = 0.0) -> Any:
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and time.monotonic() - cached[0] < ttl:
+                return cached[1]
+            
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                generation = self._generations.get(key, 0)
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+        
+        with self._lock:
+            del self._calls[key]
+            if call.error is None and self._generations.get(key, 0) == generation:
+                self._results[key] = (time.monotonic(), call.result)
+        call.done.set()
+        
+        if call.error is not None:
+            raise call.error
+        return call.result
+    
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None):
+        with self._lock:
+            keys = [key for key in set(self._results) | set(self._calls) if predicate is None or predicate(key)]
+            for key in keys:
+                self._results.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
\ No newline at end of file
@@ -0,0 +1,123 @@
+import os
+import time
+import threading
+from typing import List, Dict, Optional, Union
+
+class SysfsBatteryReader:
+    
+    def __init__(self, root: str = "/sys/class/power_supply", rescan_interval: float = 60.0,
+                 buffer_size: int = 256):
+        self.root = root
+        self.rescan_interval = rescan_interval
+        self.buffer_size = buffer_size
+        
+        self._supplies = None
+        self._by_type = {}
+        self._fds = {}
+        self._scanned_at = 0.0
+        self._lock = threading.Lock()
+    
+    def batteries(self) -> List[str]:
+        return self.supplies("Battery")
+    
+    def supplies(self, supply_type: str) -> List[str]:
+        with self._lock:
+            if self._supplies is None or self._supplies_changed():
+                self._discover()
+            return list(self._by_type.get(supply_type, []))
+    
+    def rediscover(self):
+        with self._lock:
+            self._discover()
+    
+    def read(self, supply_dir: str, name: str) -> Optional[str]:
+        key = (supply_dir, name)
+        
+        with self._lock:
+            if key in self._fds:
+                fd = self._fds[key]
+            else:
+                try:
+                    fd = os.open(os.path.join(supply_dir, name), os.O_RDONLY)
+                except OSError:
+                    fd = None
+                self._fds[key] = fd
+            
+            if fd is None:
+                return None
+            
+            try:
+                return os.pread(fd, self.buffer_size, 0).decode('utf-8', 'replace').strip()
+            except OSError:
+                self._discover()
+                return None
+    
+    def read_value(self, supply_dir: str, name: str) -> Optional[Union[int, str]]:
+        content = self.read(supply_dir, name)
+        if content is None:
+            return None
+        try:
+            return int(content)
+        except ValueError:
+            return content
+    
+    def read_int(self, supply_dir: str, name: str) -> Optional[int]:
+        value = self.read_value(supply_dir, name)
+        return value if isinstance(value, int) else None
+    
+    def read_many(self, supply_dir: str, names: List[str]) -> Dict[str, Optional[Union[int, str]]]:
+        return {name: self.read_value(supply_dir, name) for name in names}
+    
+    def close(self):
+        with self._lock:
+            self._close_fds()
+            self._supplies = None
+            self._by_type = {}
+    
+    def _supplies_changed(self) -> bool:
+        now = time.monotonic()
+        if now - self._scanned_at < self.rescan_interval:
+            return False
+        self._scanned_at = now
+        
+        try:
+            return set(os.listdir(self.root)) != self._supplies
+        except OSError:
+            return bool(self._supplies)
+    
+    def _discover(self):
+        self._close_fds()
+        self._scanned_at = time.monotonic()
+        
+        try:
+            self._supplies = set(os.listdir(self.root))
+        except OSError:
+            self._supplies = set()
+        
+        self._by_type = {}
+        for item in sorted(self._supplies):
+            item_path = os.path.join(self.root, item)
+            try:
+                with open(os.path.join(item_path, "type"), 'r') as f:
+                    supply_type = f.read().strip()
+            except OSError:
+                continue
+            
+            if self._scope(item_path) != "Device":
+                self._by_type.setdefault(supply_type, []).append(item_path)
+    
+    def _scope(self, supply_dir: str) -> Optional[str]:
+        try:
+            with open(os.path.join(supply_dir, "scope"), 'r') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+    
+    def _close_fds(self):
+        for fd in self._fds.values():
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._fds.clear()
\ No newline at end of file
@@ -0,0 +1,175 @@
+import heapq
+import itertools
+import threading
+from typing import Dict, Callable, Optional, Any
+
+class CancellationToken(threading.Event):
+    
+    def cancel(self):
+        self.set()
+    
+    def is_cancelled(self) -> bool:
+        return self.is_set()
+
+class ScheduledTask:
+    
+    def __init__(self, task_id: str, func: Callable, kwargs: Dict[str, Any], priority: int,
+                 callback: Optional[Callable] = None, on_chunk: Optional[Callable] = None,
+                 on_error: Optional[Callable] = None, streaming: bool = False):
+        self.task_id = task_id
+        self.func = func
+        self.kwargs = kwargs
+        self.priority = priority
+        self.callback = callback
+        self.on_chunk = on_chunk
+        self.on_error = on_error
+        self.streaming = streaming
+        self.token = CancellationToken()
+        self.running = False
+        self.discarded = False
+
+class TaskScheduler:
+    INTERACTIVE = 0
+    REFRESH = 1
+    BULK = 2
+    
+    def __init__(self, deliver: Callable[[Callable[[], None]], None], max_workers: int = 4,
+                 max_bulk_workers: Optional[int] = None):
+        self.deliver = deliver
+        self.max_workers = max(1, max_workers)
+        self.max_bulk_workers = max(1, max_bulk_workers or self.max_workers - 1)
+        
+        self._queue = []
+        self._counter = itertools.count()
+        self._tasks = {}
+        self._bulk_running = 0
+        self._condition = threading.Condition()
+        self._shutdown = False
+        self._workers = []
+    
+    def submit(self, task: ScheduledTask) -> CancellationToken:
+        with self._condition:
+            if self._shutdown:
+                task.token.cancel()
+                return task.token
+            
+            previous = self._tasks.get(task.task_id)
+            if previous is not None:
+                previous.discarded = True
+                previous.token.cancel()
+            
+            self._tasks[task.task_id] = task
+            heapq.heappush(self._queue, (task.priority, next(self._counter), task))
+            self._ensure_workers()
+            self._condition.notify()
+        
+        return task.token
+    
+    def cancel(self, task_id: str) -> bool:
+        with self._condition:
+            task = self._tasks.pop(task_id, None)
+            if task is None:
+                return False
+            task.discarded = True
+            task.token.cancel()
+            return True
+    
+    def is_active(self, task_id: str) -> bool:
+        with self._condition:
+            return task_id in self._tasks
+    
+    def shutdown(self, wait: float = 1.0):
+        with self._condition:
+            self._shutdown = True
+            for task in self._tasks.values():
+                task.discarded = True
+                task.token.cancel()
+            self._tasks.clear()
+            self._queue.clear()
+            self._condition.notify_all()
+            workers = list(self._workers)
+        
+        for worker in workers:
+            worker.join(wait)
+    
+    def _ensure_workers(self):
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+        busy = sum(1 for task in self._tasks.values() if task.running)
+        if len(self._workers) < self.max_workers and len(self._workers) - busy < len(self._queue):
+            worker = threading.Thread(target=self._run, name=f"TaskWorker-{len(self._workers)}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+    
+    def _next_task(self) -> Optional[ScheduledTask]:
+        with self._condition:
+            while True:
+                if self._shutdown:
+                    return None
+                
+                while self._queue and self._queue[0][2].token.is_cancelled():
+                    heapq.heappop(self._queue)
+                
+                if self._queue:
+                    task = self._queue[0][2]
+                    if task.priority < self.BULK or self._bulk_running < self.max_bulk_workers:
+                        heapq.heappop(self._queue)
+                        task.running = True
+                        if task.priority >= self.BULK:
+                            self._bulk_running += 1
+                        return task
+                
+                self._condition.wait()
+    
+    def _run(self):
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            
+            try:
+                self._execute(task)
+            finally:
+                with self._condition:
+                    task.running = False
+                    if task.priority >= self.BULK:
+                        self._bulk_running -= 1
+                    if self._tasks.get(task.task_id) is task:
+                        del self._tasks[task.task_id]
+                    self._condition.notify_all()
+    
+    def _execute(self, task: ScheduledTask):
+        kwargs = dict(task.kwargs)
+        cooperative = 'stop_event' in task.func.__code__.co_varnames
+        if cooperative:
+            kwargs['stop_event'] = task.token
+        
+        try:
+            if task.streaming:
+                result = None
+                for chunk in task.func(**kwargs):
+                    if task.token.is_cancelled() and not cooperative:
+                        return
+                    result = chunk
+                    if task.on_chunk is not None:
+                        self._deliver(task, task.on_chunk, chunk)
+            else:
+                result = task.func(**kwargs)
+        except Exception as e:
+            print(f"Error in background task {task.task_id}: {e}")
+            if task.on_error is not None:
+                self._deliver(task, task.on_error, str(e), final=True)
+            return
+        
+        if task.callback is not None and (cooperative or not task.token.is_cancelled()):
+            self._deliver(task, task.callback, result, final=True)
+    
+    def _deliver(self, task: ScheduledTask, handler: Callable, value, final: bool = False):
+        def dropped() -> bool:
+            return task.discarded or (not final and task.token.is_cancelled())
+        
+        def invoke():
+            if not dropped():
+                handler(value)
+        
+        if not dropped():
+            self.deliver(invoke)
\ No newline at end of file
@@ -0,0 +1,96 @@
+import heapq
+import itertools
+from typing import List, Dict, Callable, Any, Optional
+
+class TopK:
+    
+    def __init__(self, k: int, key: Callable[[Any], Any]):
+        self.k = max(0, k)
+        self.key = key
+        self._heap = []
+        self._counter = itertools.count()
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def push(self, item: Any) -> bool:
+        if self.k == 0:
+            return False
+        
+        entry = (self.key(item), -next(self._counter), item)
+        
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        
+        if entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        
+        return False
+    
+    def extend(self, items) -> None:
+        for item in items:
+            self.push(item)
+    
+    def threshold(self) -> Optional[Any]:
+        return self._heap[0][0] if len(self._heap) >= self.k and self._heap else None
+    
+    def items(self) -> List[Any]:
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+class GroupedTopK:
+    
+    def __init__(self, k: int, key: Callable[[Any], Any], group: Callable[[Any], Any],
+                 max_groups: Optional[int] = None):
+        self.k = max(0, k)
+        self.key = key
+        self.group = group
+        self.max_groups = max_groups
+        self.groups = {}
+        self._best = {}
+        self._ranking = []
+        self._counter = itertools.count()
+    
+    def push(self, item: Any) -> bool:
+        if self.k == 0 or self.max_groups == 0:
+            return False
+        
+        value = self.key(item)
+        group = self.group(item)
+        selector = self.groups.get(group)
+        if selector is None:
+            if self.max_groups is not None and len(self.groups) >= self.max_groups and not self._evict(value):
+                return False
+            selector = self.groups[group] = TopK(self.k, self.key)
+        
+        if not selector.push(item):
+            return False
+        
+        best = self._best.get(group)
+        if best is None or value > best[0]:
+            entry = self._best[group] = (value, next(self._counter), group)
+            heapq.heappush(self._ranking, entry)
+            if len(self._ranking) > 2 * len(self._best) + 64:
+                self._ranking = list(self._best.values())
+                heapq.heapify(self._ranking)
+        return True
+    
+    def extend(self, items) -> None:
+        for item in items:
+            self.push(item)
+    
+    def items(self) -> Dict[Any, List[Any]]:
+        return {group: selector.items() for group, selector in self.groups.items()}
+    
+    def _evict(self, value: Any) -> bool:
+        while self._ranking and self._best.get(self._ranking[0][2]) is not self._ranking[0]:
+            heapq.heappop(self._ranking)
+        
+        if not self._ranking or value <= self._ranking[0][0]:
+            return False
+        
+        _, _, group = heapq.heappop(self._ranking)
+        del self.groups[group]
+        del self._best[group]
+        return True
\ No newline at end of file
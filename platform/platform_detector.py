@@ -39,6 +39,17 @@ class PlatformDetector:
         else:
             return None
     
+    @staticmethod
+    def get_data_directory():
+        if PlatformDetector.get_platform() == PlatformDetector.WINDOWS:
+            base = os.environ.get('LOCALAPPDATA') or os.path.expanduser("~\\AppData\\Local")
+            return os.path.join(base, "OptiMate")
+        elif PlatformDetector.get_platform() == PlatformDetector.MAC:
+            return os.path.expanduser("~/Library/Application Support/OptiMate")
+        else:
+            base = os.environ.get('XDG_DATA_HOME') or os.path.expanduser("~/.local/share")
+            return os.path.join(base, "optimate")
+    
     @staticmethod
     def is_admin():
         try:
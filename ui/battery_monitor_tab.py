@@ -11,23 +11,31 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QSize
 from PyQt5.QtGui import QIcon, QFont, QColor, QBrush, QPalette
 
+from core.task_scheduler import TaskScheduler
+
 class BatteryMonitorTab(QWidget):
+    refreshed = pyqtSignal(str, float)
+    MEASUREMENT_SECONDS = 30
+    CONTINUOUS_WINDOW_SECONDS = 300
+    ENERGY_HEADERS = ["Process", "PID", "Power (W)", "Share (%)", "CPU (%)", "Wakeups/s", "I/O (KB/s)"]
+    ENERGY_WINDOWS = [("Last minute", 60.0), ("Last 10 minutes", 600.0)]
     
     def __init__(self, controller):
         super().__init__()
         self.controller = controller
+        self.last_status = None
+        self.last_energy_pids = []
+        self.measurement_start = None
+        
+        self.measurement_timer = QTimer(self)
+        self.measurement_timer.setInterval(2000)
+        self.measurement_timer.timeout.connect(self._poll_measurement)
         
         self.main_layout = QVBoxLayout(self)
         
         self._setup_ui()
         
         self._connect_signals()
-        
-        self.refresh_timer = QTimer(self)
-        self.refresh_timer.timeout.connect(self.refresh_data)
-        self.refresh_timer.start(5000)
-        
-        self.refresh_data()
     
     def _setup_ui(self):
         status_group = QGroupBox("Current Battery Status")
@@ -84,6 +92,9 @@ class BatteryMonitorTab(QWidget):
         self.manufacturer_label = QLabel("Manufacturer:")
         self.manufacturer_value = QLabel("N/A")
         
+        self.capacity_trend_label = QLabel("Capacity Trend:")
+        self.capacity_trend_value = QLabel("N/A")
+        
         details_layout.addWidget(self.design_capacity_label, 0, 0)
         details_layout.addWidget(self.design_capacity_value, 0, 1)
         
@@ -99,6 +110,9 @@ class BatteryMonitorTab(QWidget):
         details_layout.addWidget(self.manufacturer_label, 4, 0)
         details_layout.addWidget(self.manufacturer_value, 4, 1)
         
+        details_layout.addWidget(self.capacity_trend_label, 5, 0)
+        details_layout.addWidget(self.capacity_trend_value, 5, 1)
+        
         usage_group = QGroupBox("Battery Usage")
         usage_layout = QVBoxLayout(usage_group)
         
@@ -122,6 +136,28 @@ class BatteryMonitorTab(QWidget):
         usage_layout.addLayout(estimated_remaining_layout)
         usage_layout.addWidget(self.monitor_usage_btn)
         
+        energy_group = QGroupBox("Top Energy Consumers")
+        energy_layout = QVBoxLayout(energy_group)
+        
+        energy_header_layout = QHBoxLayout()
+        self.energy_summary_label = QLabel("Collecting samples...")
+        self.energy_window_combo = QComboBox()
+        for label, _ in self.ENERGY_WINDOWS:
+            self.energy_window_combo.addItem(label)
+        energy_header_layout.addWidget(self.energy_summary_label, 1)
+        energy_header_layout.addWidget(self.energy_window_combo)
+        
+        self.energy_table = QTableWidget()
+        self.energy_table.setColumnCount(len(self.ENERGY_HEADERS))
+        self.energy_table.setHorizontalHeaderLabels(self.ENERGY_HEADERS)
+        self.energy_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.energy_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.energy_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.energy_table.verticalHeader().setVisible(False)
+        
+        energy_layout.addLayout(energy_header_layout)
+        energy_layout.addWidget(self.energy_table)
+        
         recommendations_group = QGroupBox("Battery Optimization Recommendations")
         recommendations_layout = QVBoxLayout(recommendations_group)
         
@@ -154,6 +190,7 @@ class BatteryMonitorTab(QWidget):
         
         self.main_layout.addLayout(top_panel)
         self.main_layout.addWidget(usage_group)
+        self.main_layout.addWidget(energy_group)
         self.main_layout.addWidget(recommendations_group)
         self.main_layout.addLayout(status_layout_bar)
     
@@ -161,6 +198,15 @@ class BatteryMonitorTab(QWidget):
         self.refresh_btn.clicked.connect(self.refresh_data)
         self.monitor_usage_btn.clicked.connect(self.monitor_battery_usage)
         self.refresh_recommendations_btn.clicked.connect(self.refresh_recommendations)
+        self.energy_window_combo.currentIndexChanged.connect(self.refresh_energy)
+    
+    def showEvent(self, event):
+        self.controller.keep_power_measurement(True)
+        super().showEvent(event)
+    
+    def hideEvent(self, event):
+        self.controller.keep_power_measurement(False)
+        super().hideEvent(event)
     
     def refresh_data(self):
         self._set_status("Refreshing battery information...")
@@ -168,6 +214,7 @@ class BatteryMonitorTab(QWidget):
         
         self.controller.run_task_in_background(
             task_id="battery_status",
+            priority=TaskScheduler.REFRESH,
             func=lambda stop_event: self.controller.get_battery_status(),
             callback=self._on_battery_status_loaded
         )
@@ -175,8 +222,16 @@ class BatteryMonitorTab(QWidget):
     def _on_battery_status_loaded(self, battery_status):
         self._display_battery_status(battery_status)
         
+        if battery_status is not None:
+            previous = self.last_status or {}
+            changed = (battery_status.get('percent') != previous.get('percent') or
+                       battery_status.get('power_plugged') != previous.get('power_plugged'))
+            self.last_status = battery_status
+            self.refreshed.emit('battery', 1.0 if changed else 0.0)
+        
         self.controller.run_task_in_background(
             task_id="battery_health",
+            priority=TaskScheduler.REFRESH,
             func=lambda stop_event: self.controller.get_battery_health(),
             callback=self._on_battery_health_loaded
         )
@@ -184,37 +239,71 @@ class BatteryMonitorTab(QWidget):
     def _on_battery_health_loaded(self, battery_health):
         self._display_battery_health(battery_health)
         
+        self.controller.run_task_in_background(
+            task_id="capacity_trend",
+            priority=TaskScheduler.BULK,
+            func=lambda stop_event: self.controller.get_capacity_trend(),
+            callback=lambda trend: self._display_capacity_trend(trend) if trend else None
+        )
+        
         self.refresh_recommendations()
         self._set_status("Battery information updated.")
         self.progress_bar.setVisible(False)
+        
+        if self.measurement_start is None:
+            window = self.CONTINUOUS_WINDOW_SECONDS
+            self.controller.run_task_in_background(
+                task_id="power_usage",
+                priority=TaskScheduler.REFRESH,
+                func=lambda stop_event: self.controller.get_power_usage_stats(window),
+                callback=lambda power_stats: self._display_power_usage(power_stats) if power_stats else None
+            )
     
     def monitor_battery_usage(self):
         self._set_status("Monitoring battery usage...")
         self.progress_bar.setVisible(True)
         self.monitor_usage_btn.setEnabled(False)
         
+        self.measurement_start = self.controller.start_power_measurement()
+        self.measurement_timer.start()
+    
+    def _poll_measurement(self):
+        if self.measurement_start is None or self.controller.is_task_running("power_measurement"):
+            return
+        
+        since = self.measurement_start
         self.controller.run_task_in_background(
-            task_id="power_usage",
-            func=lambda stop_event: self.controller.get_power_usage_stats(30),
+            task_id="power_measurement",
+            func=lambda stop_event: self.controller.get_power_usage_stats(self.MEASUREMENT_SECONDS, since),
             callback=self._on_power_usage_loaded
         )
     
     def _on_power_usage_loaded(self, power_stats):
+        power_stats = power_stats or {'available': False}
         self._display_power_usage(power_stats)
         
         if not power_stats.get('available', False):
+            self._finish_measurement()
             self._set_status("Battery monitoring unavailable. Your device might be plugged in or has no battery.")
             QMessageBox.information(self, "Information", 
                                   "Battery monitoring unavailable. Your device might be plugged in or has no battery.")
+        elif power_stats.get('complete', True):
+            self._finish_measurement()
+            self._set_status(f"Battery usage monitoring complete ({power_stats.get('samples', 0)} samples).")
         else:
-            self._set_status("Battery usage monitoring complete.")
-            
+            self._set_status(f"Monitoring battery usage... {power_stats.get('window_seconds', 0):.0f} of "
+                             f"{self.MEASUREMENT_SECONDS} seconds")
+    
+    def _finish_measurement(self):
+        self.measurement_timer.stop()
+        self.measurement_start = None
         self.progress_bar.setVisible(False)
         self.monitor_usage_btn.setEnabled(True)
     
     def refresh_recommendations(self):
         self.controller.run_task_in_background(
             task_id="battery_recommendations",
+            priority=TaskScheduler.REFRESH,
             func=lambda stop_event: self.controller.get_battery_optimization_recommendations(),
             callback=self._display_recommendations
         )
@@ -255,6 +344,23 @@ class BatteryMonitorTab(QWidget):
         if 'status_detail' in status:
             self.health_status_value.setText(status['status_detail'])
         
+    def _display_capacity_trend(self, trend):
+        if not trend.get('available', False):
+            self.capacity_trend_value.setText(f"Collecting data ({trend.get('points', 0)} samples)")
+            self.capacity_trend_value.setToolTip("")
+            return
+        
+        text = f"-{trend['fade_percent_per_year']:.1f}%/year"
+        if 'days_to_threshold' in trend:
+            text += f", {trend['threshold_percent']:.0f}% in ~{trend['days_to_threshold'] / 30.4:.0f} months"
+        self.capacity_trend_value.setText(text)
+        
+        tooltip = (f"Fade {trend['fade_low']:.1f} to {trend['fade_high']:.1f}%/year over "
+                   f"{trend['days']:.0f} days ({trend['points']} points)")
+        if 'fade_percent_per_100_cycles' in trend:
+            tooltip += f"; {trend['fade_percent_per_100_cycles']:.1f}% per 100 cycles"
+        self.capacity_trend_value.setToolTip(tooltip)
+    
     def _display_battery_health(self, health):
         if not health:
             self.design_capacity_value.setText("Unknown")
@@ -299,7 +405,15 @@ class BatteryMonitorTab(QWidget):
         
         if 'discharge_rate_percent_per_hour' in power_stats:
             discharge_rate = power_stats['discharge_rate_percent_per_hour']
-            self.discharge_rate_value.setText(f"{discharge_rate}% per hour")
+            text = f"{discharge_rate}% per hour"
+            if 'watts' in power_stats:
+                text += f" ({power_stats['watts']} W)"
+            if 'confidence' in power_stats:
+                text += (f", range {power_stats['discharge_rate_low']}-{power_stats['discharge_rate_high']}%, "
+                         f"confidence {power_stats['confidence']:.0%}")
+            self.discharge_rate_value.setText(text)
+        elif power_stats.get('samples', 0) < 3:
+            self.discharge_rate_value.setText("Measuring...")
         
         if 'estimated_hours_remaining' in power_stats:
             hours = power_stats['estimated_hours_remaining']
@@ -307,6 +421,67 @@ class BatteryMonitorTab(QWidget):
             minutes = int((hours - hours_int) * 60)
             self.estimated_remaining_value.setText(f"{hours_int} hours, {minutes} minutes")
     
+    def refresh_energy(self):
+        window = self.ENERGY_WINDOWS[self.energy_window_combo.currentIndex()][1]
+        self.controller.run_task_in_background(
+            task_id="energy_consumers",
+            priority=TaskScheduler.REFRESH,
+            func=lambda stop_event: self.controller.get_energy_consumers(window),
+            callback=self._on_energy_loaded
+        )
+    
+    def _on_energy_loaded(self, report):
+        if report is None:
+            return
+        
+        consumers = report['consumers']
+        pids = [consumer['pid'] for consumer in consumers]
+        changed = sum(1 for row, pid in enumerate(pids)
+                      if row >= len(self.last_energy_pids) or self.last_energy_pids[row] != pid)
+        self.last_energy_pids = pids
+        self._display_energy(report)
+        self.refreshed.emit('energy', changed / len(pids) if pids else 0.0)
+    
+    def _display_energy(self, report):
+        fraction = report['measured_fraction']
+        if not report['window_seconds']:
+            self.energy_summary_label.setText("Collecting samples...")
+        elif fraction > 0:
+            text = (f"Measured {report['system_watts']:.1f} W, baseline {report['baseline_watts']:.1f} W, "
+                    f"attributed {report['attributed_watts']:.1f} W over {report['window_seconds']:.0f} s")
+            if fraction < 0.99:
+                text += f" (measured for {fraction * 100:.0f}% of the window, modeled otherwise)"
+            self.energy_summary_label.setText(text)
+        else:
+            reason = ("no discharge measurement while plugged in" if report.get('measurable')
+                      else "power draw is not measured on this system")
+            self.energy_summary_label.setText(
+                f"Estimated from CPU, I/O and wakeups over {report['window_seconds']:.0f} s ({reason})"
+            )
+        
+        consumers = report['consumers']
+        self.energy_table.setRowCount(len(consumers))
+        
+        for row, consumer in enumerate(consumers):
+            values = [
+                consumer['name'],
+                str(consumer['pid']),
+                f"{consumer['watts']:.2f}",
+                f"{consumer['share_percent']:.1f}",
+                f"{consumer['cpu_percent']:.1f}",
+                f"{consumer['wakeups_s']:.0f}",
+                f"{consumer['io_kb_s']:.1f}"
+            ]
+            for column, value in enumerate(values):
+                item = self.energy_table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if column > 0:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    self.energy_table.setItem(row, column, item)
+                if item.text() != value:
+                    item.setText(value)
+    
     def _display_recommendations(self, recommendations):
         self.recommendations_table.setRowCount(0)
         
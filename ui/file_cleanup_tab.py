@@ -1,7 +1,8 @@
 import os
 import time
+import heapq
 import datetime
-import threading
+from array import array
 from typing import List, Dict, Any
 
 from PyQt5.QtWidgets import (
@@ -9,12 +10,350 @@ from PyQt5.QtWidgets import (
     QMessageBox, QProgressBar, QFileDialog, QCheckBox, 
     QGroupBox, QScrollArea, QTableWidget, QTableWidgetItem,
     QHeaderView, QAbstractItemView, QSpinBox, QDoubleSpinBox, 
-    QComboBox, QFrame, QSplitter, QApplication
+    QComboBox, QFrame, QSplitter, QApplication, QTabWidget, QToolTip,
+    QTableView, QLineEdit
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QSize, QTimer
-from PyQt5.QtGui import QIcon, QFont, QColor
+from PyQt5.QtCore import (
+    Qt, pyqtSignal, QSize, QTimer, QRectF,
+    QAbstractTableModel, QSortFilterProxyModel, QModelIndex
+)
+from PyQt5.QtGui import QIcon, QFont, QColor, QPainter, QPen
+
+from core.task_scheduler import TaskScheduler
+
+class TreemapWidget(QWidget):
+    nodeChanged = pyqtSignal(int)
+    
+    MAX_TILES = 60
+    
+    def __init__(self, format_size, parent=None):
+        super().__init__(parent)
+        self.format_size = format_size
+        self.tree = None
+        self.node = 0
+        self.tiles = []
+        
+        self.setMouseTracking(True)
+        self.setMinimumHeight(200)
+    
+    def set_tree(self, tree, node=0):
+        self.tree = tree
+        self.set_node(node)
+    
+    def set_node(self, node):
+        self.node = node
+        self._layout_tiles()
+        self.update()
+        self.nodeChanged.emit(node)
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._layout_tiles()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().base())
+        
+        if not self.tiles:
+            painter.drawText(self.rect(), Qt.AlignCenter, "No disk usage data")
+            return
+        
+        for index, (rect, node, label, size) in enumerate(self.tiles):
+            color = QColor.fromHsv((index * 47) % 360, 90 if node is not None else 30, 230)
+            painter.fillRect(rect, color)
+            painter.setPen(QPen(QColor(80, 80, 80)))
+            painter.drawRect(rect)
+            
+            if rect.width() > 60 and rect.height() > 30:
+                painter.setPen(QColor(0, 0, 0))
+                painter.drawText(rect.adjusted(4, 2, -4, -2), Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap,
+                                 f"{label}\n{self.format_size(size)}")
+    
+    def mousePressEvent(self, event):
+        tile = self._tile_at(event.pos())
+        if tile and tile[1] is not None and self.tree.node_info(tile[1])['has_children']:
+            self.set_node(tile[1])
+    
+    def mouseMoveEvent(self, event):
+        tile = self._tile_at(event.pos())
+        if tile is None:
+            QToolTip.hideText()
+            return
+        
+        rect, node, label, size = tile
+        text = f"{label}\n{self.format_size(size)}"
+        if node is not None:
+            info = self.tree.node_info(node)
+            text += f"\n{info['files']} files"
+            if info['oldest_access']:
+                oldest = datetime.datetime.fromtimestamp(info['oldest_access']).strftime('%Y-%m-%d')
+                text += f"\nOldest access: {oldest}"
+        QToolTip.showText(event.globalPos(), text, self)
+    
+    def _tile_at(self, pos):
+        for tile in self.tiles:
+            if tile[0].contains(pos.x(), pos.y()):
+                return tile
+        return None
+    
+    def _layout_tiles(self):
+        self.tiles = []
+        
+        if self.tree is None:
+            return
+        
+        entries = [(child, self.tree.names[child], self.tree.total_bytes[child])
+                   for child in self.tree.children(self.node)[:self.MAX_TILES]
+                   if self.tree.total_bytes[child] > 0]
+        
+        direct_size = self.tree.direct_bytes[self.node]
+        if direct_size > 0:
+            entries.append((None, "(files in this folder)", direct_size))
+        
+        entries.sort(key=lambda entry: entry[2], reverse=True)
+        
+        rects = self._squarify([entry[2] for entry in entries], QRectF(self.rect()).adjusted(1, 1, -1, -1))
+        self.tiles = [(rect, node, label, size) for rect, (node, label, size) in zip(rects, entries)]
+    
+    def _squarify(self, values, rect):
+        rects = []
+        x, y, width, height = rect.x(), rect.y(), rect.width(), rect.height()
+        total = sum(values)
+        
+        if total <= 0 or width <= 0 or height <= 0:
+            return rects
+        
+        scale = width * height / total
+        areas = [value * scale for value in values]
+        
+        index = 0
+        while index < len(areas):
+            length = min(width, height)
+            row = [areas[index]]
+            index += 1
+            
+            while index < len(areas) and self._worst_ratio(row + [areas[index]], length) <= self._worst_ratio(row, length):
+                row.append(areas[index])
+                index += 1
+            
+            row_area = sum(row)
+            if width >= height:
+                row_width = row_area / height
+                offset = y
+                for area in row:
+                    rects.append(QRectF(x, offset, row_width, area / row_width))
+                    offset += area / row_width
+                x += row_width
+                width -= row_width
+            else:
+                row_height = row_area / width
+                offset = x
+                for area in row:
+                    rects.append(QRectF(offset, y, area / row_height, row_height))
+                    offset += area / row_height
+                y += row_height
+                height -= row_height
+        
+        return rects
+    
+    def _worst_ratio(self, row, length):
+        row_area = sum(row)
+        if row_area <= 0 or length <= 0 or min(row) <= 0:
+            return float('inf')
+        return max(max(row) * length * length / (row_area * row_area),
+                   (row_area * row_area) / (length * length * min(row)))
+
+class FileResultsModel(QAbstractTableModel):
+    checkedChanged = pyqtSignal(int)
+    
+    HEADERS = ["File Path", "Size", "Last Accessed", "Select"]
+    SELECT_COLUMN = 3
+    SORT_ROLE = Qt.UserRole
+    SHADE_COLOR = QColor(235, 240, 250)
+    
+    def __init__(self, format_size, parent=None):
+        super().__init__(parent)
+        self.format_size = format_size
+        self._reset_columns()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.paths)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.column() == self.SELECT_COLUMN:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        row, column = index.row(), index.column()
+        
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return self.paths[row]
+            if column == 1:
+                return self.format_size(self.sizes[row])
+            if column == 2:
+                return self._format_time(self.atimes[row])
+        elif role == Qt.CheckStateRole:
+            if column == self.SELECT_COLUMN:
+                return Qt.Checked if self.checked[row] else Qt.Unchecked
+        elif role == self.SORT_ROLE:
+            if column == 0:
+                return self.paths[row]
+            if column == 1:
+                return float(self.sizes[row])
+            if column == 2:
+                return self.atimes[row]
+            return self.checked[row]
+        elif role == Qt.BackgroundRole:
+            if self.shaded[row] and column != self.SELECT_COLUMN:
+                return self.SHADE_COLOR
+        elif role == Qt.ToolTipRole:
+            if column == 0:
+                return self.paths[row]
+        
+        return None
+    
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or index.column() != self.SELECT_COLUMN or role != Qt.CheckStateRole:
+            return False
+        
+        self._set_checked(index.row(), value == Qt.Checked)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.checkedChanged.emit(self.checked_count)
+        return True
+    
+    def set_files(self, files):
+        self.beginResetModel()
+        self._reset_columns()
+        self._extend(files, False)
+        self.endResetModel()
+        self.checkedChanged.emit(self.checked_count)
+    
+    def append_files(self, files, shaded=False):
+        if not files:
+            return
+        
+        first_row = len(self.paths)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(files) - 1)
+        self._extend(files, shaded)
+        self.endInsertRows()
+    
+    def append_largest_files(self, files, limit):
+        candidates = [(size, -row, None) for row, size in enumerate(self.sizes)]
+        candidates.extend((int(file_info.get('size', 0)), -(len(self.paths) + index), file_info)
+                          for index, file_info in enumerate(files))
+        
+        largest = heapq.nlargest(limit, candidates, key=lambda candidate: candidate[:2])
+        keep = sorted(-candidate[1] for candidate in largest if candidate[2] is None)
+        added = sorted((candidate for candidate in largest if candidate[2] is not None),
+                       key=lambda candidate: candidate[1], reverse=True)
+        
+        self._keep_rows(keep)
+        self.append_files([candidate[2] for candidate in added])
+    
+    def remove_paths(self, paths):
+        self._keep_rows([row for row, path in enumerate(self.paths) if path not in paths])
+    
+    def _keep_rows(self, keep):
+        if len(keep) == len(self.paths):
+            return
+        
+        kept = set(keep)
+        removed = [row for row in range(len(self.paths)) if row not in kept]
+        for first, last in reversed(self._row_runs(removed)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self.checked_count -= sum(self.checked[first:last + 1])
+            for column in (self.paths, self.sizes, self.atimes, self.checked, self.shaded):
+                del column[first:last + 1]
+            self.endRemoveRows()
+        self.checkedChanged.emit(self.checked_count)
+    
+    def _row_runs(self, rows):
+        runs = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        return runs
+    
+    def checked_paths(self):
+        return [path for path, checked in zip(self.paths, self.checked) if checked]
+    
+    def set_rows_checked(self, rows, checked):
+        for row in rows:
+            self._set_checked(row, checked)
+        self._emit_checks_changed()
+    
+    def set_checked_paths(self, paths):
+        for row, path in enumerate(self.paths):
+            self._set_checked(row, path in paths)
+        self._emit_checks_changed()
+    
+    def _emit_checks_changed(self):
+        if self.paths:
+            self.dataChanged.emit(self.index(0, self.SELECT_COLUMN),
+                                  self.index(len(self.paths) - 1, self.SELECT_COLUMN),
+                                  [Qt.CheckStateRole])
+        self.checkedChanged.emit(self.checked_count)
+    
+    def _set_checked(self, row, checked):
+        if bool(self.checked[row]) != checked:
+            self.checked[row] = checked
+            self.checked_count += 1 if checked else -1
+    
+    def _reset_columns(self):
+        self.paths = []
+        self.sizes = array('q')
+        self.atimes = array('d')
+        self.checked = bytearray()
+        self.shaded = bytearray()
+        self.checked_count = 0
+    
+    def _extend(self, files, shaded):
+        for file_info in files:
+            self.paths.append(file_info['path'])
+            self.sizes.append(int(file_info.get('size', 0)))
+            self.atimes.append(float(file_info.get('last_access', -1)))
+        
+        self.checked.extend(bytes(len(files)))
+        self.shaded.extend((b'\x01' if shaded else b'\x00') * len(files))
+    
+    def _format_time(self, timestamp):
+        if timestamp < 0:
+            return "Unknown"
+        return datetime.datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+class FileResultsProxyModel(QSortFilterProxyModel):
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(FileResultsModel.SORT_ROLE)
+        self.setFilterKeyColumn(0)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setDynamicSortFilter(True)
+    
+    def source_rows(self):
+        return [self.mapToSource(self.index(row, 0)).row() for row in range(self.rowCount())]
 
 class FileCleanupTab(QWidget):
+    watchedResultsChanged = pyqtSignal(str)
+    duplicateGroupFound = pyqtSignal(object)
+    
+    MAX_LARGE_FILES = 1000
     
     def __init__(self, controller):
         super().__init__()
@@ -24,11 +363,19 @@ class FileCleanupTab(QWidget):
         
         self.active_task = None
         self.stop_event = None
+        self.indexed_directory = None
+        self.indexed_criteria = None
+        self.displayed_watch = None
+        self.watch_refresh_pending = False
+        self.duplicate_groups = {}
+        self.duplicate_bytes = 0
         
         self._setup_ui()
         
         self._connect_signals()
         
+        self.controller.set_file_watch_listener(self.watchedResultsChanged.emit)
+        
         self.refresh_data()
     
     def _setup_ui(self):
@@ -38,6 +385,8 @@ class FileCleanupTab(QWidget):
         self.scan_temp_btn = QPushButton("Scan Temporary Files")
         self.scan_trash_btn = QPushButton("Scan Recycle Bin/Trash")
         self.scan_large_btn = QPushButton("Find Large Unused Files")
+        self.find_duplicates_btn = QPushButton("Find Duplicate Files")
+        self.analyze_usage_btn = QPushButton("Analyze Disk Usage")
         self.empty_trash_btn = QPushButton("Empty Recycle Bin/Trash")
         
         scan_options_layout = QHBoxLayout()
@@ -73,6 +422,8 @@ class FileCleanupTab(QWidget):
         actions_layout.addWidget(self.scan_temp_btn)
         actions_layout.addWidget(self.scan_trash_btn)
         actions_layout.addWidget(self.scan_large_btn)
+        actions_layout.addWidget(self.find_duplicates_btn)
+        actions_layout.addWidget(self.analyze_usage_btn)
         actions_layout.addLayout(scan_options_layout)
         actions_layout.addWidget(self.simulate_checkbox)
         actions_layout.addWidget(self.empty_trash_btn)
@@ -80,11 +431,21 @@ class FileCleanupTab(QWidget):
         results_group = QGroupBox("Scan Results")
         results_layout = QVBoxLayout(results_group)
         
-        self.results_table = QTableWidget()
-        self.results_table.setColumnCount(4)
-        self.results_table.setHorizontalHeaderLabels(["File Path", "Size", "Last Accessed", "Select"])
+        self.results_model = FileResultsModel(self._format_size, self)
+        self.results_proxy = FileResultsProxyModel(self)
+        self.results_proxy.setSourceModel(self.results_model)
+        
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_proxy)
         self.results_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.results_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.results_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.results_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.results_table.setSortingEnabled(True)
+        
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter by path...")
+        self.filter_edit.setClearButtonEnabled(True)
         
         table_actions_layout = QHBoxLayout()
         self.select_all_btn = QPushButton("Select All")
@@ -97,8 +458,32 @@ class FileCleanupTab(QWidget):
         table_actions_layout.addStretch()
         table_actions_layout.addWidget(self.delete_selected_btn)
         
-        results_layout.addWidget(self.results_table)
-        results_layout.addLayout(table_actions_layout)
+        files_page = QWidget()
+        files_layout = QVBoxLayout(files_page)
+        files_layout.addWidget(self.filter_edit)
+        files_layout.addWidget(self.results_table)
+        files_layout.addLayout(table_actions_layout)
+        
+        usage_page = QWidget()
+        usage_layout = QVBoxLayout(usage_page)
+        
+        usage_nav_layout = QHBoxLayout()
+        self.treemap_up_btn = QPushButton("Up")
+        self.treemap_up_btn.setEnabled(False)
+        self.treemap_path_label = QLabel("Run \"Analyze Disk Usage\" to see folder sizes")
+        usage_nav_layout.addWidget(self.treemap_up_btn)
+        usage_nav_layout.addWidget(self.treemap_path_label, 1)
+        
+        self.treemap = TreemapWidget(self._format_size)
+        
+        usage_layout.addLayout(usage_nav_layout)
+        usage_layout.addWidget(self.treemap, 1)
+        
+        self.results_tabs = QTabWidget()
+        self.results_tabs.addTab(files_page, "Files")
+        self.results_tabs.addTab(usage_page, "Disk Usage")
+        
+        results_layout.addWidget(self.results_tabs)
         
         progress_layout = QHBoxLayout()
         
@@ -124,26 +509,32 @@ class FileCleanupTab(QWidget):
         self.scan_temp_btn.clicked.connect(self.on_scan_temp)
         self.scan_trash_btn.clicked.connect(self.on_scan_trash)
         self.scan_large_btn.clicked.connect(self.on_scan_large)
+        self.find_duplicates_btn.clicked.connect(self.on_find_duplicates)
+        self.analyze_usage_btn.clicked.connect(self.on_analyze_usage)
+        self.treemap_up_btn.clicked.connect(self.on_treemap_up)
+        self.treemap.nodeChanged.connect(self._on_treemap_node_changed)
         self.empty_trash_btn.clicked.connect(self.on_empty_trash)
         self.browse_btn.clicked.connect(self.on_browse)
         
         self.select_all_btn.clicked.connect(self.on_select_all)
         self.select_none_btn.clicked.connect(self.on_select_none)
         self.delete_selected_btn.clicked.connect(self.on_delete_selected)
+        self.filter_edit.textChanged.connect(self.results_proxy.setFilterFixedString)
+        self.results_model.checkedChanged.connect(self._update_delete_button)
+        
+        self.watchedResultsChanged.connect(self._on_watched_results_changed)
+        self.duplicateGroupFound.connect(self._on_duplicate_group_found)
 
     def _cancel_operation(self):
         if self.active_task and self.stop_event:
-            self.stop_event.set()
+            self.stop_event.cancel()
             self._set_status("Cancelling operation...")
-            
-            QTimer.singleShot(500, self._finish_cancellation)
     
-    def _finish_cancellation(self):
+    def _abandon_operation(self):
         if self.active_task:
             self.controller.stop_background_task(self.active_task)
-            self.active_task = None
-            self.stop_event = None
-            self._end_operation("Operation cancelled.")
+        self.active_task = None
+        self.stop_event = None
         
     def refresh_data(self):
         pass
@@ -157,10 +548,18 @@ class FileCleanupTab(QWidget):
             self.dir_path.setText(directory)
     
     def on_scan_temp(self):
+        watched_files = self.controller.get_watched_file_results('temp')
+        if watched_files is not None and not self.active_task:
+            self.displayed_watch = ('temp', None, 100, 30)
+            self._display_files(watched_files)
+            self._end_operation(f"Found {len(watched_files)} temporary files.")
+            return
+        
         self._start_operation("Scanning temporary files...")
         
         self.controller.run_task_in_background(
             task_id="temp_files_scan",
+            priority=TaskScheduler.BULK,
             func=lambda stop_event: self.controller.get_temp_files(),
             callback=self._on_temp_files_loaded
         )
@@ -168,12 +567,23 @@ class FileCleanupTab(QWidget):
     def _on_temp_files_loaded(self, temp_files):
         self._display_files(temp_files)
         self._end_operation(f"Found {len(temp_files)} temporary files.")
+        
+        if self.controller.watch_file_results('temp', temp_files):
+            self.displayed_watch = ('temp', None, 100, 30)
     
     def on_scan_trash(self):
+        watched_items = self.controller.get_watched_file_results('trash')
+        if watched_items is not None and not self.active_task:
+            self.displayed_watch = ('trash', None, 100, 30)
+            self._display_files(watched_items)
+            self._end_operation(f"Found {len(watched_items)} items in recycle bin/trash.")
+            return
+        
         self._start_operation("Scanning recycle bin/trash...")
         
         self.controller.run_task_in_background(
             task_id="trash_scan",
+            priority=TaskScheduler.BULK,
             func=lambda stop_event: self.controller.get_trash_items(),
             callback=self._on_trash_loaded
         )
@@ -181,6 +591,9 @@ class FileCleanupTab(QWidget):
     def _on_trash_loaded(self, trash_items):
         self._display_files(trash_items)
         self._end_operation(f"Found {len(trash_items)} items in recycle bin/trash.")
+        
+        if self.controller.watch_file_results('trash', trash_items):
+            self.displayed_watch = ('trash', None, 100, 30)
     
     def on_scan_large(self):
         directory = self.dir_path.text()
@@ -197,31 +610,95 @@ class FileCleanupTab(QWidget):
             QTimer.singleShot(500, lambda: self._start_large_file_scan(directory, min_size_mb, days_unused))
             return
         
+        watched_files = self.controller.get_watched_file_results('large', [directory], min_size_mb, days_unused)
+        if watched_files is not None:
+            self.displayed_watch = ('large', [directory], min_size_mb, days_unused)
+            self._display_files(watched_files)
+            self._end_operation(f"Found {len(watched_files)} large unused files.")
+            return
+        
+        if directory == self.indexed_directory and (min_size_mb, days_unused) != self.indexed_criteria:
+            self._start_large_file_query(directory, min_size_mb, days_unused)
+            return
+        
         self._start_large_file_scan(directory, min_size_mb, days_unused)
     
     def _start_large_file_scan(self, directory, min_size_mb, days_unused):
+        self._abandon_operation()
         self.active_task = "scan_large_files"
         
-        self.stop_event = threading.Event()
-        
         self._start_operation(f"Scanning for files larger than {min_size_mb}MB "
                              f"unused for {days_unused} days...")
         
         self.cancel_btn.setVisible(True)
+        self.displayed_watch = None
+        self._display_files([])
         
-        self.controller.run_task_in_background(
+        self.stop_event = self.controller.run_streaming_task_in_background(
             task_id="scan_large_files",
-            func=lambda stop_event: self.controller.find_large_unused_files(
+            func=lambda stop_event: self.controller.iter_large_unused_files(
                 [directory], min_size_mb, days_unused, stop_event
             ),
-            callback=self._on_scan_large_complete
+            on_chunk=self._on_scan_large_chunk,
+            callback=lambda chunk: self._on_scan_large_complete(
+                chunk['results'] if chunk else None, directory, min_size_mb, days_unused,
+                bool(chunk and chunk.get('indexed'))
+            )
+        )
+    
+    def _on_scan_large_chunk(self, chunk):
+        if self.active_task != "scan_large_files" or chunk.get('replace'):
+            return
+        
+        if chunk['results']:
+            self.results_model.append_largest_files(chunk['results'], self.MAX_LARGE_FILES)
+        
+        self.status_label.setText(f"Scanning... {chunk['dirs']} folders, {chunk['files']} files "
+                                  f"({self._format_size(chunk['bytes'])}) checked, "
+                                  f"{self.results_model.rowCount()} matches so far")
+    
+    def _start_large_file_query(self, directory, min_size_mb, days_unused):
+        self.active_task = "scan_large_files"
+        
+        self._start_operation(f"Filtering indexed files larger than {min_size_mb}MB "
+                             f"unused for {days_unused} days...")
+        
+        self.stop_event = self.controller.run_task_in_background(
+            task_id="scan_large_files",
+            func=lambda stop_event: self.controller.query_large_unused_files(
+                [directory], min_size_mb, days_unused
+            ),
+            callback=lambda results: self._on_large_file_query_complete(results, directory, min_size_mb, days_unused)
         )
     
-    def _on_scan_large_complete(self, results):
+    def _on_large_file_query_complete(self, results, directory, min_size_mb, days_unused):
+        if results is None:
+            self.indexed_directory = None
+            self.indexed_criteria = None
+            self.active_task = None
+            self._start_large_file_scan(directory, min_size_mb, days_unused)
+            return
+        
+        self._on_scan_large_complete(results, directory, min_size_mb, days_unused, True)
+    
+    def _on_scan_large_complete(self, results, directory=None, min_size_mb=None, days_unused=None, indexed=False):
         self.cancel_btn.setVisible(False)
         
+        self.displayed_watch = None
+        
+        if indexed:
+            self.indexed_directory = directory
+            self.indexed_criteria = (min_size_mb, days_unused)
+        elif directory == self.indexed_directory:
+            self.indexed_directory = None
+            self.indexed_criteria = None
+        
+        if results is not None and not (self.stop_event and self.stop_event.is_cancelled()):
+            if self.controller.watch_file_results('large', results, [directory], min_size_mb, days_unused):
+                self.displayed_watch = ('large', [directory], min_size_mb, days_unused)
+        
         if not results:
-            if self.stop_event and self.stop_event.is_set():
+            if self.stop_event and self.stop_event.is_cancelled():
                 self._end_operation("File scan cancelled.")
             else:
                 self._end_operation("No large unused files found matching criteria.")
@@ -231,7 +708,7 @@ class FileCleanupTab(QWidget):
             
         self._display_files(results)
         
-        if self.stop_event and self.stop_event.is_set():
+        if self.stop_event and self.stop_event.is_cancelled():
             self._end_operation(f"Scan cancelled. Found {len(results)} large unused files so far.")
         else:
             self._end_operation(f"Found {len(results)} large unused files.")
@@ -239,6 +716,115 @@ class FileCleanupTab(QWidget):
         self.active_task = None
         self.stop_event = None
     
+    def on_find_duplicates(self):
+        directory = self.dir_path.text()
+        
+        if directory == "No directory selected" or not os.path.exists(directory):
+            QMessageBox.warning(self, "Warning", "Please select a valid directory to scan.")
+            return
+        
+        if self.active_task:
+            return
+        
+        min_size_mb = self.min_size_spin.value()
+        
+        self.active_task = "find_duplicates"
+        self.displayed_watch = None
+        self._display_files([])
+        
+        self._start_operation(f"Searching for duplicate files larger than {min_size_mb}MB...")
+        self.cancel_btn.setVisible(True)
+        
+        self.stop_event = self.controller.run_task_in_background(
+            task_id="find_duplicates",
+            priority=TaskScheduler.BULK,
+            func=lambda stop_event: self.controller.find_duplicate_files(
+                [directory], min_size_mb, stop_event, self.duplicateGroupFound.emit
+            ),
+            callback=self._on_find_duplicates_complete
+        )
+    
+    def _on_duplicate_group_found(self, group):
+        if self.active_task != "find_duplicates":
+            return
+        
+        self._append_files(group['files'], len(self.duplicate_groups) % 2 == 1)
+        
+        self.duplicate_groups[group['hash']] = set(group['paths'])
+        self.duplicate_bytes += group['reclaimable']
+        
+        self._set_status(f"Found {len(self.duplicate_groups)} duplicate groups "
+                         f"({self._format_size(self.duplicate_bytes)} reclaimable)...")
+    
+    def _on_find_duplicates_complete(self, groups):
+        self.results_table.resizeColumnsToContents()
+        
+        cancelled = self.stop_event and self.stop_event.is_cancelled()
+        summary = (f"{len(self.duplicate_groups)} duplicate groups, "
+                   f"{self._format_size(self.duplicate_bytes)} reclaimable")
+        
+        if groups is None:
+            self._end_operation("Error searching for duplicate files.")
+        elif cancelled:
+            self._end_operation(f"Duplicate search cancelled. Found {summary} so far.")
+        elif not self.duplicate_groups:
+            self._end_operation("No duplicate files found.")
+        else:
+            self._end_operation(f"Found {summary}.")
+        
+        self.active_task = None
+        self.stop_event = None
+    
+    def on_analyze_usage(self):
+        directory = self.dir_path.text()
+        
+        if directory == "No directory selected" or not os.path.exists(directory):
+            QMessageBox.warning(self, "Warning", "Please select a valid directory to scan.")
+            return
+        
+        if self.active_task:
+            return
+        
+        self.active_task = "directory_tree"
+        
+        self._start_operation(f"Analyzing disk usage of {directory}...")
+        self.cancel_btn.setVisible(True)
+        
+        self.stop_event = self.controller.run_task_in_background(
+            task_id="directory_tree",
+            priority=TaskScheduler.BULK,
+            func=lambda stop_event: self.controller.build_directory_tree(directory, stop_event),
+            callback=self._on_directory_tree_built
+        )
+    
+    def _on_directory_tree_built(self, tree):
+        if tree is None:
+            self._end_operation("Failed to analyze disk usage.")
+        else:
+            self.treemap.set_tree(tree)
+            self.results_tabs.setCurrentIndex(1)
+            
+            prefix = "Analysis cancelled. Partial results: " if self.stop_event and self.stop_event.is_cancelled() else ""
+            self._end_operation(f"{prefix}{self._format_size(tree.total_bytes[0])} in "
+                                f"{tree.total_files[0]} files across {len(tree)} folders.")
+        
+        self.active_task = None
+        self.stop_event = None
+    
+    def on_treemap_up(self):
+        tree = self.treemap.tree
+        if tree is not None and tree.parent[self.treemap.node] >= 0:
+            self.treemap.set_node(tree.parent[self.treemap.node])
+    
+    def _on_treemap_node_changed(self, node):
+        tree = self.treemap.tree
+        if tree is None:
+            return
+        
+        self.treemap_path_label.setText(f"{tree.path(node)} ({self._format_size(tree.total_bytes[node])}, "
+                                        f"{tree.total_files[node]} files)")
+        self.treemap_up_btn.setEnabled(tree.parent[node] >= 0)
+    
     def on_empty_trash(self):
         reply = QMessageBox.question(
             self, "Confirm Empty Trash/Recycle Bin",
@@ -267,34 +853,31 @@ class FileCleanupTab(QWidget):
                 QMessageBox.critical(self, "Error", f"Failed to empty trash/recycle bin: {str(e)}")
     
     def on_select_all(self):
-        for row in range(self.results_table.rowCount()):
-            checkbox_item = self.results_table.cellWidget(row, 3)
-            if isinstance(checkbox_item, QCheckBox):
-                checkbox_item.setChecked(True)
-        
-        self._update_delete_button()
+        self.results_model.set_rows_checked(self.results_proxy.source_rows(), True)
     
     def on_select_none(self):
-        for row in range(self.results_table.rowCount()):
-            checkbox_item = self.results_table.cellWidget(row, 3)
-            if isinstance(checkbox_item, QCheckBox):
-                checkbox_item.setChecked(False)
-        
-        self._update_delete_button()
+        self.results_model.set_rows_checked(range(self.results_model.rowCount()), False)
     
     def on_delete_selected(self):
-        selected_paths = []
-        
-        for row in range(self.results_table.rowCount()):
-            checkbox_item = self.results_table.cellWidget(row, 3)
-            if isinstance(checkbox_item, QCheckBox) and checkbox_item.isChecked():
-                file_path = self.results_table.item(row, 0).text()
-                selected_paths.append(file_path)
+        selected_paths = self._get_checked_paths()
         
         if not selected_paths:
             QMessageBox.information(self, "Information", "No files selected for deletion.")
             return
         
+        selected_set = set(selected_paths)
+        whole_groups = [paths for paths in self.duplicate_groups.values() if paths and paths <= selected_set]
+        if whole_groups:
+            reply = QMessageBox.warning(
+                self, "Deleting Every Copy",
+                f"Your selection includes every copy of {len(whole_groups)} duplicate groups.\n"
+                f"No copy of those files would be kept. Continue anyway?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No
+            )
+            if reply != QMessageBox.Yes:
+                return
+        
         reply = QMessageBox.question(
             self, "Confirm Deletion",
             f"Are you sure you want to delete {len(selected_paths)} files?\n"
@@ -329,53 +912,55 @@ class FileCleanupTab(QWidget):
                 QMessageBox.critical(self, "Error", f"Failed to delete files: {str(e)}")
     
     def _display_files(self, files):
-        self.results_table.setRowCount(0)
+        self.results_model.set_files(files or [])
+        self.duplicate_groups = {}
+        self.duplicate_bytes = 0
         
         if not files:
             return
         
-        self.results_table.setRowCount(len(files))
+        self.results_table.resizeColumnsToContents()
+    
+    def _append_files(self, files, shaded=False):
+        self.results_model.append_files(files, shaded)
+    
+    def _get_checked_paths(self):
+        return self.results_model.checked_paths()
+    
+    def _on_watched_results_changed(self, category):
+        if not self.displayed_watch or self.displayed_watch[0] != category or self.watch_refresh_pending:
+            return
         
-        for row, file_info in enumerate(files):
-            self.results_table.setItem(row, 0, QTableWidgetItem(file_info['path']))
-            
-            size_str = file_info.get('size_formatted', str(file_info.get('size', 0)))
-            self.results_table.setItem(row, 1, QTableWidgetItem(size_str))
-            
-            last_access = file_info.get('last_access_formatted')
-            if not last_access and 'last_access' in file_info:
-                last_access = datetime.datetime.fromtimestamp(file_info['last_access']).strftime('%Y-%m-%d %H:%M:%S')
-            self.results_table.setItem(row, 2, QTableWidgetItem(last_access or "Unknown"))
-            
-            checkbox = QCheckBox()
-            checkbox.stateChanged.connect(self._update_delete_button)
-            self.results_table.setCellWidget(row, 3, checkbox)
+        self.watch_refresh_pending = True
+        QTimer.singleShot(1000, self._refresh_watched_results)
+    
+    def _refresh_watched_results(self):
+        self.watch_refresh_pending = False
         
-        self.results_table.resizeColumnsToContents()
-        self.results_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        if self.active_task or not self.displayed_watch:
+            return
+        
+        results = self.controller.get_watched_file_results(*self.displayed_watch)
+        if results is None:
+            return
+        
+        checked_paths = set(self._get_checked_paths())
+        self._display_files(results)
+        
+        if checked_paths:
+            self.results_model.set_checked_paths(checked_paths)
+        
+        self._update_delete_button()
     
     def _remove_deleted_files(self, deleted_paths):
         deleted_set = set(deleted_paths)
-        rows_to_remove = []
-        
-        for row in range(self.results_table.rowCount()):
-            file_path = self.results_table.item(row, 0).text()
-            if file_path in deleted_set:
-                rows_to_remove.append(row)
+        self.results_model.remove_paths(deleted_set)
         
-        for row in sorted(rows_to_remove, reverse=True):
-            self.results_table.removeRow(row)
+        for paths in self.duplicate_groups.values():
+            paths.difference_update(deleted_set)
     
     def _update_delete_button(self):
-        any_selected = False
-        
-        for row in range(self.results_table.rowCount()):
-            checkbox_item = self.results_table.cellWidget(row, 3)
-            if isinstance(checkbox_item, QCheckBox) and checkbox_item.isChecked():
-                any_selected = True
-                break
-        
-        self.delete_selected_btn.setEnabled(any_selected)
+        self.delete_selected_btn.setEnabled(self.results_model.checked_count > 0)
     
     def _start_operation(self, message):
         self.progress_bar.setVisible(True)
@@ -384,6 +969,8 @@ class FileCleanupTab(QWidget):
         self.scan_temp_btn.setEnabled(False)
         self.scan_trash_btn.setEnabled(False)
         self.scan_large_btn.setEnabled(False)
+        self.find_duplicates_btn.setEnabled(False)
+        self.analyze_usage_btn.setEnabled(False)
         self.empty_trash_btn.setEnabled(False)
         self.delete_selected_btn.setEnabled(False)
         
@@ -398,12 +985,17 @@ class FileCleanupTab(QWidget):
         self.scan_temp_btn.setEnabled(True)
         self.scan_trash_btn.setEnabled(True)
         self.scan_large_btn.setEnabled(True)
+        self.find_duplicates_btn.setEnabled(True)
+        self.analyze_usage_btn.setEnabled(True)
         self.empty_trash_btn.setEnabled(True)
         
         self._update_delete_button()
         
         QApplication.processEvents()
         
+    def _format_size(self, size_bytes):
+        return self.controller.file_cleanup._format_size(size_bytes)
+    
     def _set_status(self, message):
         self.status_label.setText(message)
         QApplication.processEvents()
\ No newline at end of file
@@ -9,12 +9,14 @@ from PyQt5.QtWidgets import (
     QGroupBox, QScrollArea, QFrame, QSplitter, QTableWidget, QTableWidgetItem,
     QHeaderView, QAbstractItemView
 )
-from PyQt5.QtCore import Qt, QSize, pyqtSignal, QTimer, QThread
+from PyQt5.QtCore import Qt, QSize, pyqtSignal, QTimer, QThread, QEvent
 from PyQt5.QtGui import QIcon, QFont, QColor, QPalette
 
 from ui.file_cleanup_tab import FileCleanupTab
 from ui.process_manager_tab import ProcessManagerTab
 from ui.battery_monitor_tab import BatteryMonitorTab
+from ui.refresh_scheduler import RefreshScheduler
+from core.task_scheduler import TaskScheduler
 
 class MainWindow(QMainWindow):
     
@@ -44,15 +46,37 @@ class MainWindow(QMainWindow):
         self.status_bar = self.statusBar()
         self.status_bar_label = QLabel()
         self.status_bar.addWidget(self.status_bar_label)
+        self.own_usage_label = QLabel()
+        self.status_bar.addPermanentWidget(self.own_usage_label)
         
         self.update_status("Ready")
         
-        self.tabs.currentChanged.connect(self.on_tab_changed)
+        self.refresh_scheduler = RefreshScheduler(parent=self)
+        self.refresh_scheduler.register_source('processes', 5.0, min_interval=2.0, max_interval=30.0)
+        if self.controller.start_power_supply_listener(self.on_power_supply_changed):
+            self.refresh_scheduler.register_source('battery', 60.0, max_interval=300.0)
+            self.refresh_scheduler.register_source('power_state', 300.0)
+        else:
+            self.refresh_scheduler.register_source('battery', 5.0, max_interval=60.0)
+            self.refresh_scheduler.register_source('power_state', 60.0)
+        self.refresh_scheduler.register_source('own_usage', 10.0)
+        self.refresh_scheduler.register_source('energy', 5.0, max_interval=30.0)
+        self.refresh_scheduler.register_view(self.file_cleanup_tab, [], self.file_cleanup_tab.refresh_data)
+        self.refresh_scheduler.register_view(self.process_manager_tab, ['processes'],
+                                             self.process_manager_tab.auto_refresh)
+        self.refresh_scheduler.register_view(self.battery_monitor_tab, ['battery'],
+                                             self.battery_monitor_tab.refresh_data)
+        self.refresh_scheduler.register_view(self.battery_monitor_tab, ['energy'],
+                                             self.battery_monitor_tab.refresh_energy)
+        self.refresh_scheduler.register_background(['power_state'], self.check_power_state)
+        self.refresh_scheduler.register_background(['own_usage'], self.update_own_usage)
+        
+        self.process_manager_tab.refreshed.connect(self.refresh_scheduler.report)
+        self.battery_monitor_tab.refreshed.connect(self.refresh_scheduler.report)
         
-        self.refresh_timer = QTimer(self)
-        self.refresh_timer.timeout.connect(self.refresh_current_tab)
-        self.refresh_timer.start(5000)
+        self.tabs.currentChanged.connect(self.on_tab_changed)
         
+        self.refresh_scheduler.start()
         self.on_tab_changed(0)
     
     def update_status(self, message):
@@ -62,12 +86,43 @@ class MainWindow(QMainWindow):
         tab_name = self.tabs.tabText(index)
         self.update_status(f"Viewing {tab_name}")
         
-        self.refresh_current_tab()
+        self.refresh_scheduler.set_current_view(self.tabs.currentWidget())
     
     def refresh_current_tab(self):
-        current_widget = self.tabs.currentWidget()
-        if hasattr(current_widget, 'refresh_data'):
-            current_widget.refresh_data()
+        self.refresh_scheduler.refresh_now()
+    
+    def check_power_state(self):
+        self.controller.run_task_in_background(
+            task_id="power_state",
+            priority=TaskScheduler.REFRESH,
+            func=lambda stop_event: self.controller.get_battery_status(),
+            callback=self._on_power_state_loaded
+        )
+    
+    def _on_power_state_loaded(self, status):
+        if status is not None:
+            self.refresh_scheduler.set_on_battery(status.get('available', False) and
+                                                  not status.get('power_plugged', True))
+    
+    def on_power_supply_changed(self, change):
+        if change['reason'] in ('add', 'remove') or 'online' in change['changed'] or 'status' in change['changed']:
+            self.refresh_scheduler.invalidate('battery', 'power_state')
+        else:
+            self.refresh_scheduler.invalidate('battery')
+    
+    def update_own_usage(self):
+        usage = self.controller.get_own_cpu_usage()
+        self.own_usage_label.setText(f"Own CPU: {usage['recent_cpu_seconds_per_hour']:.1f} s/hour")
+        self.own_usage_label.setToolTip(
+            f"{usage['cpu_seconds']:.1f} s of CPU time in {usage['uptime_seconds'] / 3600:.2f} hours "
+            f"({usage['cpu_seconds_per_hour']:.1f} s/hour overall); refresh intervals: " +
+            ", ".join(f"{source} {interval:.0f}s" for source, interval in self.refresh_scheduler.intervals().items())
+        )
+    
+    def changeEvent(self, event):
+        if event.type() in (QEvent.WindowStateChange, QEvent.ActivationChange):
+            self.refresh_scheduler.set_window_state(self.isMinimized(), self.isActiveWindow())
+        super().changeEvent(event)
     
     def closeEvent(self, event):
         reply = QMessageBox.question(
@@ -78,6 +133,8 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.Yes:
+            self.refresh_scheduler.stop()
+            self.controller.shutdown()
             event.accept()
         else:
             event.ignore()
\ No newline at end of file
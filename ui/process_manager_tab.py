@@ -6,12 +6,356 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
     QMessageBox, QProgressBar, QTableWidget, QTableWidgetItem,
     QHeaderView, QAbstractItemView, QSpinBox, QDoubleSpinBox, 
-    QGroupBox, QScrollArea, QSplitter, QApplication
+    QGroupBox, QScrollArea, QSplitter, QApplication, QTableView,
+    QTreeView, QStackedWidget, QComboBox, QCheckBox
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer
-from PyQt5.QtGui import QIcon, QFont, QColor, QBrush
+from PyQt5.QtCore import (
+    Qt, pyqtSignal, QTimer,
+    QAbstractTableModel, QAbstractItemModel, QSortFilterProxyModel, QModelIndex, QPointF
+)
+from PyQt5.QtGui import QIcon, QFont, QColor, QBrush, QPainter, QPen, QPolygonF
+
+from core.task_scheduler import TaskScheduler
+
+class SparklineWidget(QWidget):
+    LINE_COLOR = QColor(40, 110, 200)
+    
+    def __init__(self, title, format_value, parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.format_value = format_value
+        self.values = []
+        
+        self.setMinimumSize(120, 50)
+    
+    def set_values(self, values):
+        self.values = values or []
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().base())
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        label = self.title
+        if self.values:
+            label += f": {self.format_value(self.values[-1])}"
+        painter.setPen(self.palette().text().color())
+        painter.drawText(self.rect().adjusted(4, 2, -4, -2), Qt.AlignLeft | Qt.AlignTop, label)
+        
+        if len(self.values) < 2:
+            return
+        
+        top = painter.fontMetrics().height() + 4
+        height = max(1, self.height() - top - 4)
+        width = max(1, self.width() - 8)
+        peak = max(self.values) or 1
+        step = width / (len(self.values) - 1)
+        
+        points = QPolygonF([QPointF(4 + index * step, top + height - value / peak * height)
+                            for index, value in enumerate(self.values)])
+        painter.setPen(QPen(self.LINE_COLOR, 1.5))
+        painter.drawPolyline(points)
+
+class ProcessTableModel(QAbstractTableModel):
+    HEADERS = ["PID", "Name", "CPU %", "Memory (MB)", "Read (KB/s)", "Write (KB/s)", "Status", "User", "Path"]
+    PATH_COLUMN = 8
+    SORT_ROLE = Qt.UserRole
+    SYSTEM_COLOR = QColor(255, 200, 200)
+    HIGH_COLOR = QColor(200, 0, 0)
+    MEDIUM_COLOR = QColor(200, 100, 0)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pids = []
+        self.processes = {}
+        self.memory_key = 'memory_mb'
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.pids)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            if section == 3 and self.memory_key == 'pss_mb':
+                return "PSS (MB)"
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def set_memory_key(self, memory_key):
+        self.memory_key = memory_key
+        self.headerDataChanged.emit(Qt.Horizontal, 3, 3)
+        if self.pids:
+            self.dataChanged.emit(self.index(0, 3), self.index(len(self.pids) - 1, 3))
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        process = self.processes[self.pids[index.row()]]
+        column = index.column()
+        
+        if role == Qt.DisplayRole:
+            return self._display_value(process, column)
+        elif role == self.SORT_ROLE:
+            if column == 0:
+                return process['pid']
+            if column == 2:
+                return float(process['cpu_percent'])
+            if column == 3:
+                return float(self._memory_value(process))
+            if column == 4:
+                return float(process['read_kb_s'])
+            if column == 5:
+                return float(process['write_kb_s'])
+            return self._display_value(process, column).lower()
+        elif role == Qt.BackgroundRole:
+            if process.get('is_system', False):
+                return self.SYSTEM_COLOR
+        elif role == Qt.ForegroundRole:
+            if column == 2:
+                return self.threshold_color(process['cpu_percent'], 10, 20)
+            if column == 3:
+                return self.threshold_color(self._memory_value(process), 500, 1000)
+            if column in (4, 5):
+                return self.threshold_color(process['read_kb_s' if column == 4 else 'write_kb_s'], 1024, 10240)
+        
+        return None
+    
+    def process_at(self, row):
+        return self.processes[self.pids[row]]
+    
+    def pids_missing_details(self, rows):
+        pids = []
+        for row in rows:
+            process = self.processes[self.pids[row]]
+            if not process.get('exe') and not process.get('is_system', False):
+                pids.append(process['pid'])
+        return pids
+    
+    def update_details(self, details):
+        changed = []
+        for row, pid in enumerate(self.pids):
+            if pid in details:
+                self.processes[pid].update(details[pid])
+                changed.append(row)
+        
+        for first, last in self._row_runs(changed):
+            self.dataChanged.emit(self.index(first, self.PATH_COLUMN), self.index(last, self.PATH_COLUMN))
+    
+    def update_memory(self, usage):
+        changed = []
+        for row, pid in enumerate(self.pids):
+            if pid in usage:
+                self.processes[pid].update(usage[pid])
+                changed.append(row)
+        
+        for first, last in self._row_runs(changed):
+            self.dataChanged.emit(self.index(first, 3), self.index(last, 3))
+    
+    def update_processes(self, processes):
+        incoming = {process['pid']: process for process in processes}
+        previous_count = len(self.pids)
+        
+        removed = [row for row, pid in enumerate(self.pids) if pid not in incoming]
+        for first, last in reversed(self._row_runs(removed)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for pid in self.pids[first:last + 1]:
+                del self.processes[pid]
+            del self.pids[first:last + 1]
+            self.endRemoveRows()
+        
+        changed = []
+        significant = 0
+        for row, pid in enumerate(self.pids):
+            if self._row_values(self.processes[pid]) != self._row_values(incoming[pid]):
+                changed.append(row)
+                if self._is_significant_change(self.processes[pid], incoming[pid]):
+                    significant += 1
+            self.processes[pid] = incoming[pid]
+        
+        for first, last in self._row_runs(changed):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.HEADERS) - 1))
+        
+        added = [pid for pid in incoming if pid not in self.processes]
+        if added:
+            first_row = len(self.pids)
+            self.beginInsertRows(QModelIndex(), first_row, first_row + len(added) - 1)
+            self.pids.extend(added)
+            for pid in added:
+                self.processes[pid] = incoming[pid]
+            self.endInsertRows()
+        
+        return (len(removed) + len(added) + significant) / max(1, previous_count, len(self.pids))
+    
+    @staticmethod
+    def _is_significant_change(old, new):
+        return (abs(new['cpu_percent'] - old['cpu_percent']) >= 5 or
+                abs(new['memory_mb'] - old['memory_mb']) >= max(10, old['memory_mb'] * 0.1))
+    
+    def _display_value(self, process, column):
+        if column == 0:
+            return str(process['pid'])
+        if column == 1:
+            return process['name']
+        if column == 2:
+            return f"{process['cpu_percent']:.1f}"
+        if column == 3:
+            return f"{self._memory_value(process):.1f}"
+        if column == 4:
+            return f"{process['read_kb_s']:.1f}"
+        if column == 5:
+            return f"{process['write_kb_s']:.1f}"
+        if column == 6:
+            return process['status']
+        if column == 7:
+            return process['username']
+        return process.get('exe', 'Unknown')
+    
+    def _memory_value(self, process):
+        value = process.get(self.memory_key)
+        return process['memory_mb'] if value is None else value
+    
+    def _row_values(self, process):
+        return (tuple(self._display_value(process, column) for column in range(len(self.HEADERS))),
+                process.get('is_system', False))
+    
+    @staticmethod
+    def threshold_color(value, medium, high):
+        if value > high:
+            return ProcessTableModel.HIGH_COLOR
+        if value > medium:
+            return ProcessTableModel.MEDIUM_COLOR
+        return None
+    
+    def _row_runs(self, rows):
+        runs = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        return runs
+
+class ProcessTreeModel(QAbstractItemModel):
+    HEADERS = ["Name", "PID", "CPU %", "Total CPU %", "Memory (MB)", "Total Memory (MB)", "User"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tree = None
+        self.node_values = {}
+    
+    def set_tree(self, tree):
+        self.beginResetModel()
+        self.tree = tree
+        self.endResetModel()
+        
+        previous, self.node_values = self.node_values, self._node_values(tree)
+        changed = len(previous.keys() ^ self.node_values.keys())
+        changed += sum(1 for key in previous.keys() & self.node_values.keys()
+                       if ProcessTableModel._is_significant_change(previous[key], self.node_values[key]))
+        return changed / max(1, len(previous), len(self.node_values))
+    
+    def _node_values(self, tree):
+        values = {}
+        for node in range(len(tree) if tree is not None else 0):
+            info = tree.node_info(node)
+            values[('pid', info['pid']) if info['pid'] is not None else ('group', info['name'])] = info
+        return values
+    
+    def index(self, row, column, parent=QModelIndex()):
+        if self.tree is None or not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        node = parent.internalId() if parent.isValid() else self.tree.root
+        return self.createIndex(row, column, self.tree.child(node, row))
+    
+    def parent(self, index):
+        if self.tree is None or not index.isValid():
+            return QModelIndex()
+        parent = self.tree.parent_of(index.internalId())
+        if parent == self.tree.root:
+            return QModelIndex()
+        return self.createIndex(self.tree.position_of(parent), 0, parent)
+    
+    def rowCount(self, parent=QModelIndex()):
+        if self.tree is None or parent.column() > 0:
+            return 0
+        return self.tree.child_count(parent.internalId() if parent.isValid() else self.tree.root)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if self.tree is None or not index.isValid():
+            return None
+        
+        column = index.column()
+        
+        if role == Qt.DisplayRole:
+            info = self.tree.node_info(index.internalId())
+            if column == 0:
+                return info['name'] if info['pid'] is not None else f"{info['name']} ({info['count']})"
+            if column == 1:
+                return str(info['pid']) if info['pid'] is not None else ""
+            if column == 2:
+                return f"{info['cpu_percent']:.1f}"
+            if column == 3:
+                return f"{info['total_cpu_percent']:.1f}"
+            if column == 4:
+                return f"{info['memory_mb']:.1f}"
+            if column == 5:
+                return f"{info['total_memory_mb']:.1f}"
+            return info['username']
+        elif role == Qt.BackgroundRole:
+            if self.tree.node_info(index.internalId())['is_system']:
+                return ProcessTableModel.SYSTEM_COLOR
+        elif role == Qt.ForegroundRole:
+            if column in (2, 3, 4, 5):
+                info = self.tree.node_info(index.internalId())
+                if column in (2, 3):
+                    return ProcessTableModel.threshold_color(info[self._value_key(column)], 10, 20)
+                return ProcessTableModel.threshold_color(info[self._value_key(column)], 500, 1000)
+        
+        return None
+    
+    def node_info(self, index):
+        if self.tree is None or not index.isValid():
+            return None
+        return self.tree.node_info(index.internalId())
+    
+    def node_key(self, index):
+        info = self.node_info(index)
+        if info is None:
+            return None
+        return ('pid', info['pid']) if info['pid'] is not None else ('group', info['name'])
+    
+    def index_for_key(self, key):
+        if self.tree is None or key is None:
+            return QModelIndex()
+        
+        if key[0] == 'pid':
+            node = self.tree.find_pid(key[1])
+        else:
+            keys = getattr(self.tree, 'keys', [])
+            node = keys.index(key[1]) if key[1] in keys else None
+        
+        if node is None:
+            return QModelIndex()
+        return self.createIndex(self.tree.position_of(node), 0, node)
+    
+    def _value_key(self, column):
+        return ('cpu_percent', 'total_cpu_percent', 'memory_mb', 'total_memory_mb')[column - 2]
 
 class ProcessManagerTab(QWidget):
+    refreshed = pyqtSignal(str, float)
+    
     def __init__(self, controller):
         super().__init__()
         self.controller = controller
@@ -21,11 +365,10 @@ class ProcessManagerTab(QWidget):
         self._setup_ui()
         self._connect_signals()
         
-        self.refresh_timer = QTimer(self)
-        self.refresh_timer.timeout.connect(self.auto_refresh)
-        self.refresh_timer.start(5000)
-        
-        QTimer.singleShot(500, self.refresh_data)
+        self.details_timer = QTimer(self)
+        self.details_timer.setSingleShot(True)
+        self.details_timer.setInterval(200)
+        self.details_timer.timeout.connect(self._request_visible_details)
     
     def auto_refresh(self):
         if self.active_task or not self.isVisible():
@@ -41,12 +384,27 @@ class ProcessManagerTab(QWidget):
         self.refresh_btn = QPushButton("Refresh Now")
         self.high_cpu_btn = QPushButton("Show High CPU Usage")
         self.high_mem_btn = QPushButton("Show High Memory Usage")
+        self.high_io_btn = QPushButton("Show High Disk I/O")
+        self.top_io_btn = QPushButton("Show Top Disk I/O")
         self.show_all_btn = QPushButton("Show All Processes")
         
         upper_controls.addWidget(self.refresh_btn)
         upper_controls.addWidget(self.high_cpu_btn)
         upper_controls.addWidget(self.high_mem_btn)
+        upper_controls.addWidget(self.high_io_btn)
+        upper_controls.addWidget(self.top_io_btn)
         upper_controls.addWidget(self.show_all_btn)
+        upper_controls.addStretch()
+        
+        self.view_mode_label = QLabel("View:")
+        self.view_mode_combo = QComboBox()
+        self.view_mode_combo.addItem("List", None)
+        self.view_mode_combo.addItem("Tree", 'tree')
+        self.view_mode_combo.addItem("Group by Application", 'app')
+        self.view_mode_combo.addItem("Group by Executable", 'name')
+        
+        upper_controls.addWidget(self.view_mode_label)
+        upper_controls.addWidget(self.view_mode_combo)
         
         filter_options = QHBoxLayout()
         
@@ -65,6 +423,18 @@ class ProcessManagerTab(QWidget):
         filter_options.addWidget(self.cpu_threshold_spin)
         filter_options.addWidget(self.mem_threshold_label)
         filter_options.addWidget(self.mem_threshold_spin)
+        
+        self.io_threshold_label = QLabel("Disk I/O Threshold (KB/s):")
+        self.io_threshold_spin = QSpinBox()
+        self.io_threshold_spin.setRange(1, 1000000)
+        self.io_threshold_spin.setValue(1024)
+        
+        filter_options.addWidget(self.io_threshold_label)
+        filter_options.addWidget(self.io_threshold_spin)
+        
+        self.pss_check = QCheckBox("Proportional Memory (PSS)")
+        self.pss_check.setToolTip("Count shared memory proportionally instead of in full for every process")
+        filter_options.addWidget(self.pss_check)
         filter_options.addStretch()
         
         controls_layout.addLayout(upper_controls)
@@ -73,27 +443,59 @@ class ProcessManagerTab(QWidget):
         table_group = QGroupBox("Running Processes")
         table_layout = QVBoxLayout(table_group)
         
-        self.process_table = QTableWidget()
-        self.process_table.setColumnCount(7)
-        self.process_table.setHorizontalHeaderLabels([
-            "PID", "Name", "CPU %", "Memory (MB)", "Status", "User", "Path"
-        ])
-        self.process_table.horizontalHeader().setSectionResizeMode(6, QHeaderView.Stretch)
+        self.process_model = ProcessTableModel(self)
+        self.process_proxy = QSortFilterProxyModel(self)
+        self.process_proxy.setSortRole(ProcessTableModel.SORT_ROLE)
+        self.process_proxy.setSourceModel(self.process_model)
+        
+        self.process_table = QTableView()
+        self.process_table.setModel(self.process_proxy)
+        self.process_table.horizontalHeader().setSectionResizeMode(ProcessTableModel.PATH_COLUMN, QHeaderView.Stretch)
+        self.process_table.horizontalHeader().setSortIndicator(2, Qt.DescendingOrder)
+        self.process_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.process_table.setSortingEnabled(True)
         self.process_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.process_table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.process_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         
+        self.process_tree_model = ProcessTreeModel(self)
+        self.process_tree = QTreeView()
+        self.process_tree.setModel(self.process_tree_model)
+        self.process_tree.setUniformRowHeights(True)
+        self.process_tree.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.process_tree.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.process_tree.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        
+        self.process_views = QStackedWidget()
+        self.process_views.addWidget(self.process_table)
+        self.process_views.addWidget(self.process_tree)
+        
         table_actions = QHBoxLayout()
         self.terminate_btn = QPushButton("Terminate Process")
         self.force_terminate_btn = QPushButton("Force Terminate")
+        self.terminate_tree_btn = QPushButton("Terminate Process Tree")
         self.terminate_btn.setEnabled(False)
         self.force_terminate_btn.setEnabled(False)
+        self.terminate_tree_btn.setEnabled(False)
         
         table_actions.addWidget(self.terminate_btn)
         table_actions.addWidget(self.force_terminate_btn)
+        table_actions.addWidget(self.terminate_tree_btn)
         table_actions.addStretch()
         
-        table_layout.addWidget(self.process_table)
+        history_layout = QHBoxLayout()
+        self.cpu_sparkline = SparklineWidget("CPU", lambda value: f"{value:.1f}%")
+        self.memory_sparkline = SparklineWidget("Memory", lambda value: f"{value / (1024 * 1024):.1f} MB")
+        self.io_sparkline = SparklineWidget("I/O", lambda value: f"{value / 1024:.1f} KB/s")
+        self.threads_sparkline = SparklineWidget("Threads", lambda value: f"{value:.0f}")
+        
+        history_layout.addWidget(self.cpu_sparkline)
+        history_layout.addWidget(self.memory_sparkline)
+        history_layout.addWidget(self.io_sparkline)
+        history_layout.addWidget(self.threads_sparkline)
+        
+        table_layout.addWidget(self.process_views)
+        table_layout.addLayout(history_layout)
         table_layout.addLayout(table_actions)
         
         startup_group = QGroupBox("Startup Applications")
@@ -152,12 +554,20 @@ class ProcessManagerTab(QWidget):
         self.refresh_btn.clicked.connect(self.refresh_data)
         self.high_cpu_btn.clicked.connect(self.show_high_cpu)
         self.high_mem_btn.clicked.connect(self.show_high_memory)
+        self.high_io_btn.clicked.connect(self.show_high_io)
+        self.top_io_btn.clicked.connect(self.show_top_io)
         self.show_all_btn.clicked.connect(self.show_all_processes)
         
-        self.process_table.itemSelectionChanged.connect(self.process_selection_changed)
+        self.process_table.selectionModel().selectionChanged.connect(self.process_selection_changed)
+        self.process_table.verticalScrollBar().valueChanged.connect(lambda: self.details_timer.start())
+        self.process_proxy.layoutChanged.connect(lambda: self.details_timer.start())
+        self.process_tree.selectionModel().selectionChanged.connect(self.process_selection_changed)
+        self.view_mode_combo.currentIndexChanged.connect(self.on_view_mode_changed)
+        self.pss_check.toggled.connect(self.on_memory_accounting_toggled)
         
         self.terminate_btn.clicked.connect(lambda: self.terminate_process(False))
         self.force_terminate_btn.clicked.connect(lambda: self.terminate_process(True))
+        self.terminate_tree_btn.clicked.connect(self.terminate_process_tree)
         
         self.refresh_startup_btn.clicked.connect(self.refresh_startup_items)
         self.startup_table.itemSelectionChanged.connect(self.startup_selection_changed)
@@ -167,6 +577,11 @@ class ProcessManagerTab(QWidget):
         if self.active_task:
             return
         
+        view_mode = self.view_mode_combo.currentData()
+        if view_mode:
+            self._refresh_process_tree(view_mode)
+            return
+        
         self.active_task = "refresh_processes"
         self._set_status("Refreshing process list...")
         self.progress_bar.setVisible(True)
@@ -177,15 +592,95 @@ class ProcessManagerTab(QWidget):
         
         self.controller.run_task_in_background(
             task_id="refresh_processes",
+            priority=TaskScheduler.REFRESH,
             func=lambda stop_event: self.controller.get_running_processes(),
             callback=self._on_processes_loaded
         )
     
+    def on_memory_accounting_toggled(self, enabled):
+        self.controller.set_memory_accounting(enabled)
+        self.process_model.set_memory_key('pss_mb' if enabled else 'memory_mb')
+        self.details_timer.start()
+    
+    def on_view_mode_changed(self, index):
+        self.process_views.setCurrentIndex(1 if self.view_mode_combo.currentData() else 0)
+        self.process_selection_changed()
+        self.refresh_data()
+    
+    def _show_list_view(self):
+        self.view_mode_combo.blockSignals(True)
+        self.view_mode_combo.setCurrentIndex(0)
+        self.view_mode_combo.blockSignals(False)
+        self.process_views.setCurrentIndex(0)
+    
+    def _refresh_process_tree(self, view_mode):
+        self.active_task = "refresh_process_tree"
+        self._set_status("Building process tree..." if view_mode == 'tree' else "Grouping processes...")
+        self.progress_bar.setVisible(True)
+        
+        self._set_buttons_enabled(False)
+        
+        if view_mode == 'tree':
+            func = lambda stop_event: self.controller.build_process_tree()
+        else:
+            func = lambda stop_event: self.controller.get_process_groups(view_mode)
+        
+        self.controller.run_task_in_background(
+            task_id="refresh_process_tree",
+            priority=TaskScheduler.REFRESH,
+            func=func,
+            callback=self._on_process_tree_loaded
+        )
+    
+    def _on_process_tree_loaded(self, tree):
+        if tree is None:
+            self._set_status("Error building process tree.")
+        else:
+            self.refreshed.emit('processes', self._display_process_tree(tree))
+            self._set_status(f"Found {len(tree)} {'processes' if self.view_mode_combo.currentData() == 'tree' else 'groups'}.")
+        
+        self._set_buttons_enabled(True)
+        self.progress_bar.setVisible(False)
+        self.active_task = None
+    
+    def _display_process_tree(self, tree):
+        model = self.process_tree_model
+        first_fill = model.tree is None
+        selected_key = model.node_key(self.process_tree.currentIndex())
+        expanded_keys = []
+        
+        pending = [QModelIndex()]
+        while pending:
+            parent = pending.pop()
+            for row in range(model.rowCount(parent)):
+                index = model.index(row, 0, parent)
+                if self.process_tree.isExpanded(index):
+                    expanded_keys.append(model.node_key(index))
+                    pending.append(index)
+        
+        changed = model.set_tree(tree)
+        
+        for key in expanded_keys:
+            index = model.index_for_key(key)
+            if index.isValid():
+                self.process_tree.expand(index)
+        
+        selected = model.index_for_key(selected_key)
+        if selected.isValid():
+            self.process_tree.setCurrentIndex(selected)
+        
+        if first_fill:
+            for column in range(1, len(ProcessTreeModel.HEADERS)):
+                self.process_tree.resizeColumnToContents(column)
+        
+        self._update_history(self._selected_process())
+        return changed
+    
     def _on_processes_loaded(self, processes):
         if processes is None:
             self._set_status("Error loading process data.")
         else:
-            self._display_processes(processes)
+            self.refreshed.emit('processes', self._display_processes(processes))
             self._set_status(f"Found {len(processes)} processes.")
         
         self._set_buttons_enabled(True)
@@ -195,7 +690,8 @@ class ProcessManagerTab(QWidget):
     def show_high_cpu(self):
         if self.active_task:
             return
-            
+        
+        self._show_list_view()
         self.active_task = "high_cpu_processes"
         cpu_threshold = self.cpu_threshold_spin.value()
         
@@ -228,9 +724,11 @@ class ProcessManagerTab(QWidget):
     def show_high_memory(self):
         if self.active_task:
             return
-            
+        
+        self._show_list_view()
         self.active_task = "high_memory_processes"
         memory_threshold = self.mem_threshold_spin.value()
+        memory_metric = 'pss' if self.pss_check.isChecked() else 'rss'
         
         self._set_status(f"Finding processes using more than {memory_threshold} MB memory...")
         self.progress_bar.setVisible(True)
@@ -242,7 +740,7 @@ class ProcessManagerTab(QWidget):
         self.controller.run_task_in_background(
             task_id="high_memory_processes",
             func=lambda stop_event: self.controller.get_high_resource_processes(
-                cpu_threshold=0, memory_threshold_mb=memory_threshold
+                cpu_threshold=0, memory_threshold_mb=memory_threshold, memory_metric=memory_metric
             ),
             callback=lambda processes: self._on_high_memory_loaded(processes, memory_threshold)
         )
@@ -257,11 +755,76 @@ class ProcessManagerTab(QWidget):
         self._set_buttons_enabled(True)
         self.progress_bar.setVisible(False)
         self.active_task = None
+    
+    def show_high_io(self):
+        if self.active_task:
+            return
+        
+        self._show_list_view()
+        self.active_task = "high_io_processes"
+        io_threshold = self.io_threshold_spin.value()
+        
+        self._set_status(f"Finding processes doing more than {io_threshold} KB/s of disk I/O...")
+        self.progress_bar.setVisible(True)
+        
+        self._set_buttons_enabled(False)
+        
+        QApplication.processEvents()
+        
+        self.controller.run_task_in_background(
+            task_id="high_io_processes",
+            func=lambda stop_event: self.controller.get_high_resource_processes(
+                cpu_threshold=0, memory_threshold_mb=0, io_threshold_kb_s=io_threshold
+            ),
+            callback=lambda processes: self._on_high_io_loaded(processes, io_threshold)
+        )
+    
+    def _on_high_io_loaded(self, processes, threshold):
+        if processes is None:
+            self._set_status("Error loading high disk I/O processes.")
+        else:
+            self._display_processes(processes)
+            self._set_status(f"Found {len(processes)} processes doing more than {threshold} KB/s of disk I/O.")
+        
+        self._set_buttons_enabled(True)
+        self.progress_bar.setVisible(False)
+        self.active_task = None
+    
+    def show_top_io(self):
+        if self.active_task:
+            return
+        
+        self._show_list_view()
+        self.active_task = "top_io_processes"
+        self._set_status("Finding the busiest disk I/O processes...")
+        self.progress_bar.setVisible(True)
+        
+        self._set_buttons_enabled(False)
+        
+        QApplication.processEvents()
+        
+        self.controller.run_task_in_background(
+            task_id="top_io_processes",
+            func=lambda stop_event: self.controller.get_top_io_processes(),
+            callback=self._on_top_io_loaded
+        )
+    
+    def _on_top_io_loaded(self, processes):
+        if processes is None:
+            self._set_status("Error loading disk I/O processes.")
+        else:
+            self._display_processes(processes)
+            self._set_status(f"Showing the {len(processes)} processes with the most disk I/O.")
+        
+        self._set_buttons_enabled(True)
+        self.progress_bar.setVisible(False)
+        self.active_task = None
         
     def show_all_processes(self):
         if self.active_task:
             return
-            
+        
+        self._show_list_view()
         self.active_task = "all_processes"
         self._set_status("Loading all processes...")
         self.progress_bar.setVisible(True)
@@ -293,6 +856,7 @@ class ProcessManagerTab(QWidget):
         
         self.controller.run_task_in_background(
             task_id="refresh_startup",
+            priority=TaskScheduler.REFRESH,
             func=lambda stop_event: self.controller.get_startup_items(),
             callback=self._on_startup_items_loaded
         )
@@ -303,53 +867,48 @@ class ProcessManagerTab(QWidget):
         self.progress_bar.setVisible(False)
     
     def process_selection_changed(self):
-        selected_items = self.process_table.selectedItems()
+        process = self._selected_process()
+        self._update_history(process)
         
-        if selected_items and len(selected_items) > 0:
-            row = selected_items[0].row()
-            pid_item = self.process_table.item(row, 0)
-            name_item = self.process_table.item(row, 1)
+        if process:
+            pid = process['pid']
+            name = process['name']
+            is_system = process.get('is_system', False)
             
-            if pid_item and name_item:
-                pid = int(pid_item.text())
-                name = name_item.text()
-                
-                is_system = False
-                for col in range(self.process_table.columnCount()):
-                    item = self.process_table.item(row, col)
-                    if item and item.background().color() == QColor(255, 200, 200):
-                        is_system = True
-                        break
-                
-                self.terminate_btn.setEnabled(not is_system)
-                self.force_terminate_btn.setEnabled(not is_system)
-                
-                if is_system:
-                    self._set_status(f"Process {name} (PID: {pid}) is a system process and cannot be terminated.")
-                else:
-                    self._set_status(f"Selected process: {name} (PID: {pid})")
+            self.terminate_btn.setEnabled(not is_system)
+            self.force_terminate_btn.setEnabled(not is_system)
+            self.terminate_tree_btn.setEnabled(not is_system)
+            
+            if is_system:
+                self._set_status(f"Process {name} (PID: {pid}) is a system process and cannot be terminated.")
             else:
-                self.terminate_btn.setEnabled(False)
-                self.force_terminate_btn.setEnabled(False)
+                self._set_status(f"Selected process: {name} (PID: {pid})")
         else:
             self.terminate_btn.setEnabled(False)
             self.force_terminate_btn.setEnabled(False)
+            self.terminate_tree_btn.setEnabled(False)
     
-    def terminate_process(self, force: bool = False):
-        selected_items = self.process_table.selectedItems()
+    def _selected_process(self):
+        if self.view_mode_combo.currentData():
+            selected_rows = self.process_tree.selectionModel().selectedRows()
+            info = self.process_tree_model.node_info(selected_rows[0]) if selected_rows else None
+            return info if info and info['pid'] is not None else None
         
-        if not selected_items or len(selected_items) == 0:
-            return
+        selected_rows = self.process_table.selectionModel().selectedRows()
         
-        row = selected_items[0].row()
-        pid_item = self.process_table.item(row, 0)
-        name_item = self.process_table.item(row, 1)
+        if not selected_rows:
+            return None
+        
+        return self.process_model.process_at(self.process_proxy.mapToSource(selected_rows[0]).row())
+    
+    def terminate_process(self, force: bool = False):
+        process = self._selected_process()
         
-        if not pid_item or not name_item:
+        if not process:
             return
         
-        pid = int(pid_item.text())
-        name = name_item.text()
+        pid = process['pid']
+        name = process['name']
         
         message = f"Are you sure you want to {'' if not force else 'force '}terminate process {name} (PID: {pid})?"
         if force:
@@ -383,6 +942,50 @@ class ProcessManagerTab(QWidget):
         finally:
             self.progress_bar.setVisible(False)
     
+    def terminate_process_tree(self):
+        process = self._selected_process()
+        
+        if not process or self.active_task:
+            return
+        
+        pid = process['pid']
+        name = process['name']
+        
+        reply = QMessageBox.question(
+            self, "Confirm Process Tree Termination",
+            f"Are you sure you want to terminate process {name} (PID: {pid}) and all of its child processes?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        
+        if reply != QMessageBox.Yes:
+            return
+        
+        self.active_task = "terminate_process_tree"
+        self._set_status(f"Terminating process tree of {name} (PID: {pid})...")
+        self.progress_bar.setVisible(True)
+        self._set_buttons_enabled(False)
+        
+        self.controller.run_task_in_background(
+            task_id="terminate_process_tree",
+            func=lambda stop_event: self.controller.terminate_process_tree(pid),
+            callback=lambda result: self._on_process_tree_terminated(result, name, pid)
+        )
+    
+    def _on_process_tree_terminated(self, result, name, pid):
+        self.progress_bar.setVisible(False)
+        self._set_buttons_enabled(True)
+        self.active_task = None
+        
+        success, error = result if result else (False, "Unknown error")
+        
+        if success:
+            self._set_status(f"Successfully terminated process tree of {name} (PID: {pid}).")
+            self.refresh_data()
+        else:
+            self._set_status(f"Failed to terminate process tree: {error}")
+            QMessageBox.critical(self, "Error", f"Failed to terminate process tree: {error}")
+    
     def startup_selection_changed(self):
         selected_items = self.startup_table.selectedItems()
         
@@ -453,57 +1056,53 @@ class ProcessManagerTab(QWidget):
             self.progress_bar.setVisible(False)
     
     def _display_processes(self, processes):
-        self.process_table.setRowCount(0)
+        first_fill = self.process_model.rowCount() == 0
         
-        if not processes:
-            return
+        change = self.process_model.update_processes(processes or [])
         
-        self.process_table.setUpdatesEnabled(False)
-        self.process_table.setRowCount(len(processes))
+        if first_fill and processes:
+            self.process_table.resizeColumnsToContents()
         
-        for row, process in enumerate(processes):
-            pid_item = QTableWidgetItem(str(process['pid']))
-            self.process_table.setItem(row, 0, pid_item)
-            
-            name_item = QTableWidgetItem(process['name'])
-            self.process_table.setItem(row, 1, name_item)
-            
-            cpu_item = QTableWidgetItem(f"{process['cpu_percent']:.1f}")
-            self.process_table.setItem(row, 2, cpu_item)
-            
-            memory_item = QTableWidgetItem(f"{process['memory_mb']:.1f}")
-            self.process_table.setItem(row, 3, memory_item)
-            
-            status_item = QTableWidgetItem(process['status'])
-            self.process_table.setItem(row, 4, status_item)
-            
-            user_item = QTableWidgetItem(process['username'])
-            self.process_table.setItem(row, 5, user_item)
-            
-            path_item = QTableWidgetItem(process.get('exe', 'Unknown'))
-            self.process_table.setItem(row, 6, path_item)
-            
-            if process.get('is_system', False):
-                for col in range(self.process_table.columnCount()):
-                    item = self.process_table.item(row, col)
-                    if item:
-                        item.setBackground(QBrush(QColor(255, 200, 200)))
-            
-            if process['cpu_percent'] > 20:
-                cpu_item.setForeground(QBrush(QColor(200, 0, 0)))
-            elif process['cpu_percent'] > 10:
-                cpu_item.setForeground(QBrush(QColor(200, 100, 0)))
-                
-            if process['memory_mb'] > 1000:
-                memory_item.setForeground(QBrush(QColor(200, 0, 0)))
-            elif process['memory_mb'] > 500:
-                memory_item.setForeground(QBrush(QColor(200, 100, 0)))
-        
-        self.process_table.setUpdatesEnabled(True)
-        self.process_table.resizeColumnsToContents()
-        self.process_table.horizontalHeader().setSectionResizeMode(6, QHeaderView.Stretch)
+        self.details_timer.start()
+        self._update_history(self._selected_process())
+        return change
+    
+    def _update_history(self, process):
+        history = self.controller.get_process_history(process['pid']) if process else None
+        history = history or {}
+        
+        self.cpu_sparkline.set_values(history.get('cpu_percent'))
+        self.memory_sparkline.set_values(history.get('rss'))
+        self.io_sparkline.set_values(history.get('io_rate'))
+        self.threads_sparkline.set_values(history.get('threads'))
+    
+    def _request_visible_details(self):
+        first = self.process_table.rowAt(0)
+        if first < 0:
+            return
         
-        QApplication.processEvents()
+        last = self.process_table.rowAt(self.process_table.viewport().height() - 1)
+        if last < 0:
+            last = self.process_proxy.rowCount() - 1
+        
+        rows = [self.process_proxy.mapToSource(self.process_proxy.index(row, 0)).row() for row in range(first, last + 1)]
+        pids = self.process_model.pids_missing_details(rows)
+        if pids and not self.controller.is_task_running("process_details"):
+            self.controller.run_task_in_background(
+                task_id="process_details",
+                priority=TaskScheduler.REFRESH,
+                func=lambda stop_event: self.controller.get_process_details(pids),
+                callback=lambda details: self.process_model.update_details(details or {})
+            )
+        
+        memory_pids = [self.process_model.pids[row] for row in rows] if self.pss_check.isChecked() else []
+        if memory_pids and not self.controller.is_task_running("process_memory"):
+            self.controller.run_task_in_background(
+                task_id="process_memory",
+                priority=TaskScheduler.REFRESH,
+                func=lambda stop_event: self.controller.get_memory_usage(memory_pids),
+                callback=lambda usage: self.process_model.update_memory(usage or {})
+            )
     
     def _display_startup_items(self, startup_items):
         self.startup_table.setRowCount(0)
@@ -540,13 +1139,16 @@ class ProcessManagerTab(QWidget):
         self.refresh_btn.setEnabled(enabled)
         self.high_cpu_btn.setEnabled(enabled)
         self.high_mem_btn.setEnabled(enabled)
+        self.high_io_btn.setEnabled(enabled)
+        self.top_io_btn.setEnabled(enabled)
         self.show_all_btn.setEnabled(enabled)
         
-        if enabled and self.process_table.selectedItems():
+        if enabled and self._selected_process():
             self.process_selection_changed()
         else:
             self.terminate_btn.setEnabled(False)
             self.force_terminate_btn.setEnabled(False)
+            self.terminate_tree_btn.setEnabled(False)
             
         self.refresh_startup_btn.setEnabled(enabled)
         if enabled and self.startup_table.selectedItems():
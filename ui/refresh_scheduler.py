@@ -0,0 +1,123 @@
+import time
+from typing import List, Dict, Callable, Optional
+
+from PyQt5.QtCore import QObject, QTimer
+
+class RefreshScheduler(QObject):
+    
+    def __init__(self, tick_ms: int = 1000, unfocused_factor: float = 3.0, battery_factor: float = 2.0,
+                 parent=None):
+        super().__init__(parent)
+        self.unfocused_factor = unfocused_factor
+        self.battery_factor = battery_factor
+        
+        self.sources = {}
+        self.views = {}
+        self.background = []
+        self.current_view = None
+        self.minimized = False
+        self.active = True
+        self.on_battery = False
+        
+        self.timer = QTimer(self)
+        self.timer.setInterval(tick_ms)
+        self.timer.timeout.connect(self.tick)
+    
+    def register_source(self, name: str, interval: float, min_interval: Optional[float] = None,
+                        max_interval: Optional[float] = None):
+        self.sources[name] = {
+            'base': interval,
+            'interval': interval,
+            'min': min_interval or interval,
+            'max': max_interval or interval,
+            'last': 0.0
+        }
+    
+    def register_view(self, view, sources: List[str], refresh: Callable[[], None]):
+        self.views.setdefault(view, []).append({'sources': sources, 'refresh': refresh})
+    
+    def register_background(self, sources: List[str], refresh: Callable[[], None]):
+        self.background.append({'sources': sources, 'refresh': refresh})
+    
+    def set_current_view(self, view):
+        self.current_view = view
+        self.tick()
+    
+    def set_window_state(self, minimized: bool, active: bool):
+        was_polling = self.is_polling()
+        self.minimized = minimized
+        self.active = active
+        
+        if not self.is_polling():
+            self.timer.stop()
+        elif not self.timer.isActive():
+            self.timer.start()
+            if not was_polling:
+                self.tick()
+    
+    def set_on_battery(self, on_battery: bool):
+        self.on_battery = on_battery
+    
+    def report(self, source: str, change: float, quiet: float = 0.01, busy: float = 0.1):
+        state = self.sources.get(source)
+        if state is None:
+            return
+        
+        if change <= quiet:
+            state['interval'] = min(state['max'], state['interval'] * 1.5)
+        elif change >= busy:
+            state['interval'] = max(state['min'], state['interval'] / 2)
+        elif state['interval'] > state['base']:
+            state['interval'] = max(state['base'], state['interval'] / 1.5)
+        else:
+            state['interval'] = min(state['base'], state['interval'] * 1.5)
+    
+    def invalidate(self, *sources: str):
+        for source in sources:
+            if source in self.sources:
+                self.sources[source]['last'] = 0.0
+        self.tick()
+    
+    def is_polling(self) -> bool:
+        return not self.minimized
+    
+    def start(self):
+        if self.is_polling():
+            self.timer.start()
+    
+    def stop(self):
+        self.timer.stop()
+    
+    def interval(self, source: str) -> float:
+        interval = self.sources[source]['interval']
+        if not self.active:
+            interval *= self.unfocused_factor
+        if self.on_battery:
+            interval *= self.battery_factor
+        return interval
+    
+    def intervals(self) -> Dict[str, float]:
+        return {source: self.interval(source) for source in self.sources}
+    
+    def refresh_now(self, view=None):
+        view = view or self.current_view
+        now = time.monotonic()
+        for entry in self.views.get(view, []):
+            self._refresh(entry, now)
+    
+    def tick(self):
+        if not self.is_polling():
+            return
+        
+        now = time.monotonic()
+        entries = self.background + self.views.get(self.current_view, [])
+        
+        for entry in entries:
+            if entry['sources'] and any(now - self.sources[source]['last'] >= self.interval(source)
+                                        for source in entry['sources']):
+                self._refresh(entry, now)
+    
+    def _refresh(self, entry: Dict, now: float):
+        for source in entry['sources']:
+            self.sources[source]['last'] = now
+        entry['refresh']()
\ No newline at end of file